@@ -0,0 +1,57 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: bench_cache.py
+# Project: benchmarks
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 10:02:37 am
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 10:02:37 am
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+import os
+import tempfile
+import timeit
+
+from boolean_parser.parsers import SQLAParser
+
+
+# This benchmark compares cold (uncached) and warm (cached) parse latency of the
+# SQLAParser, and the latency of parses found in the disk cache, as seen by a newly
+# started process.  With boolean_parser installed, run it from the top-level repo
+# directory with python benchmarks/bench_cache.py
+
+expressions = [
+    'modela.x > 5',
+    'modela.x > 5 and modela.y < 2',
+    'modela.x > 5 and (modela.y < 2 or not modela.name == foo)',
+    'modela.x between 1 and 5 or modela.y >= 3 and modela.z != 7',
+]
+
+
+def run(number=2000):
+    path = os.path.join(tempfile.mkdtemp(), 'cache.db')
+    for value in expressions:
+        SQLAParser.disable_cache()
+        cold = timeit.timeit(lambda: SQLAParser(value), number=number) / number
+
+        SQLAParser.enable_disk_cache(path)
+        SQLAParser(value)
+        disk = timeit.timeit(lambda: SQLAParser(value), number=number) / number
+        SQLAParser.disable_disk_cache()
+
+        SQLAParser.enable_cache(maxsize=1024)
+        SQLAParser(value)
+        warm = timeit.timeit(lambda: SQLAParser(value), number=number) / number
+
+        print(f'{value!r:70} cold: {cold * 1e6:9.1f} us  disk: {disk * 1e6:7.1f} us  '
+              f'warm: {warm * 1e6:7.1f} us  speedup: {cold / warm:6.1f}x')
+    print(SQLAParser.cache_info())
+    SQLAParser.disable_cache()
+
+
+if __name__ == '__main__':
+    run()
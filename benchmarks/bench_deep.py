@@ -0,0 +1,73 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: bench_deep.py
+# Project: benchmarks
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 9:48:20 pm
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 9:48:20 pm
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+import time
+
+from sqlalchemy import BigInteger, Column, Integer
+from sqlalchemy.orm import declarative_base
+
+from boolean_parser.parsers import SQLAParser
+
+
+# This benchmark times the built-in walks over a 10k-deep and a 100k-wide parsed expression:
+# params, repr, freeze, normalize and SQLAlchemy filter generation.  Each walk uses an
+# explicit stack, so none of them hit the Python recursion limit.  With boolean_parser
+# installed, run it from the top-level repo directory with python benchmarks/bench_deep.py
+
+Base = declarative_base()
+
+
+class Table(Base):
+    __tablename__ = 'table'
+    pk = Column(BigInteger, primary_key=True)
+    x = Column(Integer)
+    y = Column(Integer)
+
+
+def deep(size):
+    return ''.join(f'table.x > {i} and (table.y < {i} or ' for i in range(size)) + \
+        'table.x == 1' + ')' * size
+
+
+def wide(size):
+    return ' or '.join(f'table.x > {i}' for i in range(size))
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    try:
+        func()
+        result = f'{(time.perf_counter() - start) * 1e3:9.1f} ms'
+    except RecursionError:
+        result = '   RecursionError'
+    print(f'  {label:10} {result}')
+
+
+def run():
+    parser = SQLAParser(engine='fast')
+    for label, builder, size in [('deep', deep, 10000), ('wide', wide, 100000)]:
+        value = builder(size)
+        print(f'{label} {size}, {len(value)} characters')
+        start = time.perf_counter()
+        expr = parser.parse(value)
+        print(f'  {"parse":10} {(time.perf_counter() - start) * 1e3:9.1f} ms')
+        timed('params', lambda: expr.params)
+        timed('repr', lambda: repr(expr))
+        timed('normalize', expr.normalize)
+        timed('filter', lambda: expr.filter(Table))
+        timed('freeze', expr.freeze)
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,60 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: bench_engines.py
+# Project: benchmarks
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 12:20:14 pm
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 12:20:14 pm
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+import timeit
+
+from boolean_parser.parsers import SQLAParser
+
+
+# This benchmark compares the pyparsing and fast parsing engines over deeply nested
+# and very wide expressions.  With boolean_parser installed, run it from the top-level
+# repo directory with python benchmarks/bench_engines.py
+
+
+def deep(depth):
+    ''' an expression nested within ``depth`` levels of parantheses '''
+    value = 'modela.x > 0'
+    for i in range(depth):
+        value = f'(modela.y < {i} and {value})'
+    return value
+
+
+def wide(width):
+    ''' an expression of ``width`` conditions joined by alternating ands and ors '''
+    ops = [' and ', ' or ']
+    terms = [f'modela.x > {i}' for i in range(width)]
+    value = terms[0]
+    for i, term in enumerate(terms[1:]):
+        value += ops[i % 2] + term
+    return value
+
+
+def time_engine(value, engine, number):
+    return timeit.timeit(lambda: SQLAParser(value, engine=engine), number=number) / number
+
+
+def run():
+    cases = [('deep', deep, [1, 2, 3, 4, 5]), ('wide', wide, [2, 10, 50, 200])]
+    for label, builder, sizes in cases:
+        for size in sizes:
+            value = builder(size)
+            number = 3 if label == 'deep' and size > 3 else 20
+            slow = time_engine(value, 'pyparsing', number)
+            fast = time_engine(value, 'fast', number)
+            print(f'{label:5} {size:4d}  pyparsing: {slow * 1e3:10.3f} ms  '
+                  f'fast: {fast * 1e3:8.3f} ms  speedup: {slow / fast:8.1f}x')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,79 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: bench_filter.py
+# Project: benchmarks
+# Author: Brian Cherinka
+# Created: Sunday, 18th October 2026 2:03:48 am
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Sunday, 18th October 2026 2:03:48 am
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+import time
+
+from sqlalchemy import BigInteger, Column, Integer, String, create_engine, select
+from sqlalchemy.orm import Session, declarative_base
+
+from boolean_parser.parsers import SQLAParser
+from boolean_parser.parsers.sqla import SQLBoolBase
+
+
+# This benchmark filters the same parsed expressions many times, with the filter clauses
+# rebuilt on every call or remembered by the expression, and times building the filter
+# alone, building the statement and its SQLAlchemy cache key, and running the query.
+# With boolean_parser installed, run it from the top-level repo directory with
+# python benchmarks/bench_filter.py
+
+Base = declarative_base()
+
+
+class Table(Base):
+    __tablename__ = 'table'
+    pk = Column(BigInteger, primary_key=True)
+    x = Column(Integer)
+    y = Column(Integer)
+    name = Column(String)
+
+
+expressions = {
+    'small': 'table.x > 5 and table.y < 2',
+    'medium': ' or '.join(f'(table.x > {i} and table.y between 1 and {i} and '
+                          f'table.name = "n{i}")' for i in range(20)),
+}
+
+
+def timed(func, number):
+    start = time.perf_counter()
+    for __ in range(number):
+        func()
+    return (time.perf_counter() - start) / number * 1e3
+
+
+def run(number=300):
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    session.add_all(Table(pk=i, x=i % 20, y=i % 7, name=f'n{i % 30}') for i in range(1000))
+    session.commit()
+
+    for label, value in expressions.items():
+        expr = SQLAParser(value, engine='fast').parse()
+        print(f'{label}, {len(expr.leaves)} conditions')
+        for size in (0, SQLBoolBase.filter_cache_size):
+            SQLBoolBase.filter_cache_size = size
+            mode = 'remembered' if size else 'rebuilt'
+            ms = timed(lambda: expr.filter(Table), number)
+            print(f'  {mode:10} filter    {ms:8.3f} ms')
+            ms = timed(lambda: select(Table).where(expr.filter(Table))._generate_cache_key(),
+                       number)
+            print(f'  {mode:10} cache key {ms:8.3f} ms')
+            ms = timed(lambda: session.execute(select(Table.pk).where(expr.filter(Table))).all(),
+                       number)
+            print(f'  {mode:10} query     {ms:8.3f} ms')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,63 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: bench_import.py
+# Project: benchmarks
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 2:32:09 pm
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 2:32:09 pm
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+import subprocess
+import sys
+
+
+# This benchmark tracks the cold start cost of boolean_parser, i.e. the time to import the
+# package and the time of the first parse, which now includes building the grammar.  Each
+# measurement runs in a fresh interpreter using python -X importtime.  With boolean_parser
+# installed, run it from the top-level repo directory with python benchmarks/bench_import.py
+
+first_parse = '''
+import time
+t0 = time.perf_counter()
+from boolean_parser import parse
+parse('x > 1', base='base')
+print((time.perf_counter() - t0) * 1e6)
+'''
+
+
+def import_times(module='boolean_parser'):
+    ''' return the self and cumulative import times, in microseconds, of each package module '''
+    proc = subprocess.run([sys.executable, '-W', 'ignore', '-X', 'importtime', '-c',
+                           f'import {module}'], capture_output=True, text=True, check=True)
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line or 'self' in line:
+            continue
+        selftime, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(selftime), int(cumulative))
+    return times
+
+
+def run(repeat=5):
+    totals, parses = [], []
+    for __ in range(repeat):
+        times = import_times()
+        totals.append(times['boolean_parser'][1])
+        proc = subprocess.run([sys.executable, '-W', 'ignore', '-c', first_parse],
+                              capture_output=True, text=True, check=True)
+        parses.append(float(proc.stdout))
+
+    for name, (selftime, cumulative) in sorted(times.items()):
+        if name.startswith('boolean_parser'):
+            print(f'{name:40} self: {selftime:8d} us  cumulative: {cumulative:8d} us')
+    print(f'best import of boolean_parser: {min(totals) / 1e3:8.2f} ms')
+    print(f'best import + first parse:     {min(parses) / 1e3:8.2f} ms')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,73 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: bench_in.py
+# Project: benchmarks
+# Author: Brian Cherinka
+# Created: Sunday, 18th October 2026 5:40:12 am
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Sunday, 18th October 2026 5:40:12 am
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+import time
+
+from sqlalchemy import BigInteger, Column, Integer, create_engine, select
+from sqlalchemy.orm import declarative_base
+
+from boolean_parser.mixins.sqla import SQLAMixin
+from boolean_parser.parsers import SQLAParser
+
+
+# This benchmark times matching a field against lists of values, written as a long "or" of
+# equalities, and as an "in" list, both with one bind parameter per value and bound as a
+# single array, from parsing the string to fetching the rows of the query.  With
+# boolean_parser installed, run it from the top-level repo directory with
+# python benchmarks/bench_in.py
+
+Base = declarative_base()
+
+
+class Table(Base):
+    __tablename__ = 'table'
+    pk = Column(BigInteger, primary_key=True)
+    x = Column(Integer)
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1e3
+
+
+def run(rows=200000):
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    with engine.connect() as conn:
+        conn.execute(Table.__table__.insert(), [{'pk': i, 'x': i} for i in range(rows)])
+
+        for size in (100, 1000, 10000, 100000):
+            values = range(0, 2 * size, 2)
+            cases = [('in list', 'table.x in (' + ', '.join(map(str, values)) + ')', None),
+                     ('in array', 'table.x in (' + ', '.join(map(str, values)) + ')', 0)]
+            # SQLite rejects an "or" of 1000 or more terms as too deeply nested
+            if size < 1000:
+                cases.insert(0, ('or chain', ' or '.join(f'table.x == {i}' for i in values),
+                                 None))
+            print(f'{size} values')
+            for label, value, threshold in cases:
+                SQLAMixin.in_list_threshold = threshold
+                expr, parse_ms = timed(lambda: SQLAParser(engine='fast').parse(value))
+                clause, filter_ms = timed(lambda: expr.filter(Table))
+                stmt = select(Table.pk).where(clause)
+                found, query_ms = timed(lambda: conn.execute(stmt).all())
+                total = parse_ms + filter_ms + query_ms
+                print(f'  {label:9} parse {parse_ms:8.1f} ms, filter {filter_ms:8.1f} ms, '
+                      f'query {query_ms:8.1f} ms, total {total:8.1f} ms, {len(found)} rows')
+    SQLAMixin.in_list_threshold = 500
+
+
+if __name__ == '__main__':
+    run()
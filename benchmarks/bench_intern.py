@@ -0,0 +1,59 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: bench_intern.py
+# Project: benchmarks
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 5:31:52 pm
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 5:31:52 pm
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+import gc
+import random
+import time
+import tracemalloc
+
+from boolean_parser.parsers import Parser
+
+
+# This benchmark measures the memory held by, and the time to parse, many filters that
+# share conditions from a small pool, with and without interning.  With boolean_parser
+# installed, run it from the top-level repo directory with python benchmarks/bench_intern.py
+
+rng = random.Random(42)
+pool = [f'modela.x{i} > {i}' for i in range(50)]
+values = [f'{rng.choice(pool)} and ({rng.choice(pool)} or not {rng.choice(pool)})'
+          for i in range(20000)]
+
+
+def measure(intern):
+    if intern:
+        Parser.enable_interning()
+    parser = Parser(engine='fast')
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    trees = [parser.parse(value) for value in values]
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    info = Parser.intern_info()
+    Parser.disable_interning()
+    del trees
+    return size, elapsed, info
+
+
+def run():
+    for intern in (False, True):
+        size, elapsed, info = measure(intern)
+        print(f'interning: {intern!s:5}  {size / len(values):7.0f} bytes/filter  '
+              f'{elapsed / len(values) * 1e6:6.1f} us/parse  {info or ""}')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,60 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: bench_memory.py
+# Project: benchmarks
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 4:40:02 pm
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 4:40:02 pm
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+import gc
+import tracemalloc
+
+from boolean_parser.parsers import Parser
+
+
+# This benchmark measures the memory held by parsed expression trees with tracemalloc,
+# reported as bytes per node, for compact nodes and for nodes that keep the raw
+# pyparsing results.  With boolean_parser installed, run it from the top-level repo
+# directory with python benchmarks/bench_memory.py
+
+
+class KeepParser(Parser):
+    ''' a parser whose nodes keep the raw pyparsing results '''
+
+
+KeepParser.build_parser(keep_parse_results=True)
+
+# each expression has 3 conditions, 1 word, and 3 boolean nodes
+values = [f'a{i} > {i} and (b{i} between 1 and {i} or not stuff) and c == "{i}"'
+          for i in range(1000)]
+nodes_per_value = 7
+
+
+def measure(parser_class, engine):
+    parser = parser_class(engine=engine)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    trees = [parser.parse(value) for value in values]
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del trees
+    return size / (len(values) * nodes_per_value)
+
+
+def run():
+    for label, parser_class, engine in [('compact, fast', Parser, 'fast'),
+                                        ('compact, pyparsing', Parser, 'pyparsing'),
+                                        ('keep_parse_results', KeepParser, 'pyparsing')]:
+        print(f'{label:20} {measure(parser_class, engine):8.0f} bytes/node')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,79 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: bench_optimize.py
+# Project: benchmarks
+# Author: Brian Cherinka
+# Created: Sunday, 18th October 2026 4:20:44 am
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Sunday, 18th October 2026 4:20:44 am
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+import time
+
+from sqlalchemy import BigInteger, Column, Integer, create_engine, select
+from sqlalchemy.orm import Session, declarative_base
+
+from boolean_parser.parsers import SQLAParser
+
+
+# This benchmark builds the SQLAlchemy filters of machine-built expressions, a long "or" of
+# equalities on one field and many overlapping ranges, with and without optimizing them,
+# and times building the filter, compiling the statement and running the query, with
+# the statement cache disabled so each query is compiled.  With boolean_parser installed,
+# run it from the top-level repo directory with python benchmarks/bench_optimize.py
+
+Base = declarative_base()
+
+
+class Table(Base):
+    __tablename__ = 'table'
+    pk = Column(BigInteger, primary_key=True)
+    x = Column(Integer)
+    y = Column(Integer)
+
+
+expressions = {
+    'equalities': ' or '.join(f'table.x == {i}' for i in range(500)),
+    'ranges': ' or '.join(f'(table.x between {i} and {i + 20} and table.y > {i % 5} '
+                          f'and table.y >= 1)' for i in range(0, 1000, 10)) +
+              ' or ' + ' or '.join(f'table.x between {i} and {i + 15}'
+                                   for i in range(1000, 2000, 10)),
+}
+
+
+def timed(func, number):
+    start = time.perf_counter()
+    for __ in range(number):
+        func()
+    return (time.perf_counter() - start) / number * 1e3
+
+
+def run(number=50):
+    engine = create_engine('sqlite://', query_cache_size=0)
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    session.add_all(Table(pk=i, x=i % 2000, y=i % 7) for i in range(20000))
+    session.commit()
+
+    for label, value in expressions.items():
+        expr = SQLAParser(value, engine='fast').parse()
+        print(f'{label}, {len(expr.leaves)} conditions')
+        for optimize in (False, True):
+            mode = 'optimized' if optimize else 'plain'
+            expr.clear_filters()
+            ms = timed(lambda: expr._build_filter(Table, optimize=optimize), number)
+            print(f'  {mode:9} filter  {ms:8.3f} ms')
+            stmt = select(Table.pk).where(expr.filter(Table, optimize=optimize))
+            ms = timed(lambda: stmt.compile(engine), number)
+            sql = str(stmt.compile(engine))
+            print(f'  {mode:9} compile {ms:8.3f} ms, {len(sql)} characters')
+            ms = timed(lambda: session.execute(stmt).all(), number)
+            print(f'  {mode:9} query   {ms:8.3f} ms')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,58 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: bench_packrat.py
+# Project: benchmarks
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 1:15:40 pm
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 1:15:40 pm
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+import timeit
+
+from boolean_parser.clauses import between_cond, condition
+from boolean_parser.parsers.sqla import SQLACondition, SQLAParser
+
+
+# This benchmark prints the curve of parse time against parenthesis nesting depth, with
+# and without packrat memoization.  With boolean_parser installed, run it from the
+# top-level repo directory with python benchmarks/bench_packrat.py.  Without packrat, each
+# extra level multiplies the parse time; beyond ~15 levels the pyparsing grammar exceeds
+# the default Python recursion limit either way.
+
+
+class PackratParser(SQLAParser):
+    ''' the SQLAParser grammar with packrat memoization '''
+
+
+PackratParser.build_parser(clauses=[condition, between_cond],
+                           actions=[SQLACondition, SQLACondition], packrat=4096)
+
+
+def deep(depth):
+    ''' an expression nested within ``depth`` levels of parantheses '''
+    value = 'modela.x > 0'
+    for i in range(depth):
+        value = f'(modela.y < {i} and not {value})'
+    return value
+
+
+def run(max_depth=4, max_packrat_depth=15):
+    print(f'{"depth":>5} {"default (ms)":>14} {"packrat (ms)":>14}')
+    for depth in range(1, max_packrat_depth + 1):
+        value = deep(depth)
+        number = 3
+        default = ''
+        if depth <= max_depth:
+            default = timeit.timeit(lambda: SQLAParser(value), number=number) / number
+            default = f'{default * 1e3:14.2f}'
+        memo = timeit.timeit(lambda: PackratParser(value), number=number) / number
+        print(f'{depth:5d} {default:>14} {memo * 1e3:14.2f}')
+
+
+if __name__ == '__main__':
+    run()
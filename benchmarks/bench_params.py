@@ -0,0 +1,50 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: bench_params.py
+# Project: benchmarks
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 5:58:13 pm
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 5:58:13 pm
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+import time
+
+from boolean_parser.parsers import Parser
+
+
+# This benchmark times the first, and repeated, reads of the params of large parsed
+# expressions.  With boolean_parser installed, run it from the top-level repo directory
+# with python benchmarks/bench_params.py
+
+def wide(size):
+    return ' or '.join(f'(x{i % 100} > {i} and not y{i % 37} < 2)' for i in range(size))
+
+
+def deep(size):
+    return ''.join(f'x{i % 100} > {i} and (y{i % 37} < 2 or ' for i in range(size)) + \
+        'z == 1' + ')' * size
+
+
+def run(reads=100):
+    parser = Parser(engine='fast')
+    for label, builder, size in [('wide', wide, 10000), ('deep', deep, 5000)]:
+        expr = parser.parse(builder(size))
+        start = time.perf_counter()
+        params = expr.params
+        first = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for __ in range(reads):
+            expr.params
+        repeat = (time.perf_counter() - start) / reads
+        print(f'{label:5} {size:6d}  params: {len(params):4d}  '
+              f'first read: {first * 1e3:8.3f} ms  repeated read: {repeat * 1e6:8.2f} us')
+
+
+if __name__ == '__main__':
+    run()
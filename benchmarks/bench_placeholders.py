@@ -0,0 +1,63 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: bench_placeholders.py
+# Project: benchmarks
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 11:52:32 pm
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 11:52:32 pm
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+import time
+
+from sqlalchemy import BigInteger, Column, Integer, create_engine
+from sqlalchemy.orm import Session, declarative_base
+
+from boolean_parser.parsers import SQLAParser
+
+
+# This benchmark compares running a filter with many different values, written either as
+# literals, parsed and turned into SQL for each value, or as placeholders, parsed and turned
+# into SQL once.  With boolean_parser installed, run it from the top-level repo directory
+# with python benchmarks/bench_placeholders.py
+
+Base = declarative_base()
+
+
+class Table(Base):
+    __tablename__ = 'table'
+    pk = Column(BigInteger, primary_key=True)
+    x = Column(Integer)
+    y = Column(Integer)
+
+
+def run(number=500):
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    session.add_all(Table(pk=i, x=i % 20, y=i % 7) for i in range(1000))
+    session.commit()
+
+    start = time.perf_counter()
+    for i in range(number):
+        expr = SQLAParser(f'table.x > {i % 20} and table.y between 1 and {i % 7}').parse()
+        session.query(Table).filter(expr.filter(Table)).count()
+    literal = (time.perf_counter() - start) / number
+
+    start = time.perf_counter()
+    expr = SQLAParser('table.x > :xmin and table.y between 1 and :ymax').parse()
+    query = session.query(Table).filter(expr.filter(Table))
+    for i in range(number):
+        query.params(xmin=i % 20, ymax=i % 7).count()
+    placeholder = (time.perf_counter() - start) / number
+
+    print(f'literals:     {literal * 1e3:7.3f} ms per query')
+    print(f'placeholders: {placeholder * 1e3:7.3f} ms per query')
+
+
+if __name__ == '__main__':
+    run()
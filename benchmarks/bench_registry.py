@@ -0,0 +1,67 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: bench_registry.py
+# Project: benchmarks
+# Author: Brian Cherinka
+# Created: Sunday, 18th October 2026 1:22:07 am
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Sunday, 18th October 2026 1:22:07 am
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+import time
+import types
+
+from sqlalchemy import BigInteger, Column, Float, Integer, String
+from sqlalchemy.orm import declarative_base
+
+from boolean_parser.mixins.sqla import FieldRegistry
+from boolean_parser.parsers import SQLAParser
+
+
+# This benchmark builds the SQLAlchemy filter of a parsed expression against a module of
+# 200 models, passing either the module, a list of the models, or a prebuilt field
+# registry.  It also prints the time to build the registry.  With boolean_parser
+# installed, run it from the top-level repo directory with
+# python benchmarks/bench_registry.py
+
+nmodels = 200
+
+Base = declarative_base()
+models = types.ModuleType('models')
+for idx in range(nmodels):
+    columns = {f'c{col}': Column(Integer) for col in range(8)}
+    model = type(f'Model{idx}', (Base,), dict(columns, __tablename__=f'table{idx}',
+                                              pk=Column(BigInteger, primary_key=True),
+                                              name=Column(String), z=Column(Float)))
+    setattr(models, model.__name__, model)
+
+# conditions on models spread through the module, with and without table names
+value = ' and '.join(f'table{i}.c{i % 8} > {i}' for i in range(0, nmodels, 10))
+value += ' or (c3 < 2 and name = jane and z between 1 and 2)'
+
+
+def timed(func, number):
+    start = time.perf_counter()
+    for __ in range(number):
+        func()
+    return (time.perf_counter() - start) / number * 1e3
+
+
+def run(number=100):
+    expr = SQLAParser(value, engine='fast').parse()
+    print(f'{nmodels} models, {len(expr.leaves)} conditions')
+    ms = timed(lambda: FieldRegistry(models), 10)
+    print(f'  build registry    {ms:8.3f} ms')
+    registry = FieldRegistry(models)
+    modellist = list(registry.models)
+    for label, arg in (('module', models), ('list', modellist), ('registry', registry)):
+        ms = timed(lambda: expr.filter(arg), number)
+        print(f'  filter {label:10} {ms:8.3f} ms')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,73 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: bench_schema.py
+# Project: benchmarks
+# Author: Brian Cherinka
+# Created: Sunday, 18th October 2026 12:41:19 am
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Sunday, 18th October 2026 12:41:19 am
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+import time
+
+from sqlalchemy import BigInteger, Column, Date, DateTime, Float, Integer
+from sqlalchemy.orm import declarative_base
+
+from boolean_parser.parsers import SQLAParser
+from boolean_parser.schema import Schema
+
+
+# This benchmark compares building the SQLAlchemy filter of a parsed expression many times,
+# with the values cast on every call to filter, and with the values typed once at parse
+# time by a grammar schema.  It also prints the extra time the schema adds to each parse.
+# With boolean_parser installed, run it from the top-level repo directory with
+# python benchmarks/bench_schema.py
+
+Base = declarative_base()
+
+
+class Table(Base):
+    __tablename__ = 'table'
+    pk = Column(BigInteger, primary_key=True)
+    x = Column(Integer)
+    z = Column(Float)
+    day = Column(Date)
+    seen = Column(DateTime)
+
+
+class TypedParser(SQLAParser):
+    pass
+
+
+TypedParser.build_parser(engine='fast', schema=Schema.from_models(Table))
+
+value = ' or '.join(f'(table.x > {i} and table.z < {i}.5 and table.day between 2020-01-{i:02} '
+                    f'and 2020-02-{i:02} and table.seen >= "2020-01-01T{i:02}:30")'
+                    for i in range(1, 21))
+
+
+def timed(func, number):
+    start = time.perf_counter()
+    for __ in range(number):
+        func()
+    return (time.perf_counter() - start) / number * 1e3
+
+
+def run(number=200):
+    untyped = SQLAParser(engine='fast')
+    typed = TypedParser()
+    for label, parser in (('untyped', untyped), ('typed', typed)):
+        ms = timed(lambda: parser.grammar.parse(value, engine='fast'), number)
+        print(f'{label:8} parse  {ms:8.3f} ms')
+    for label, parser in (('untyped', untyped), ('typed', typed)):
+        expr = parser.parse(value)
+        ms = timed(lambda: expr.filter(Table), number)
+        print(f'{label:8} filter {ms:8.3f} ms')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,68 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: bench_serialize.py
+# Project: benchmarks
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 10:44:02 pm
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 10:44:02 pm
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+import pickle
+import time
+
+from boolean_parser.parsers import SQLAParser
+from boolean_parser.serialize import dumps, loads
+
+
+# This benchmark compares rebuilding parsed expressions from the JSON and binary
+# serializations, and from pickle, against parsing the original strings again with each
+# parsing engine.  It prints the time per expression and the size of each form.  With
+# boolean_parser installed, run it from the top-level repo directory with
+# python benchmarks/bench_serialize.py
+
+expressions = {
+    'small': 'modela.x > 5 and modela.y < 2',
+    'medium': 'modela.x > 5 and (modela.y < 2 or not modela.z == 1) and '
+              'modela.name == "Jane Doe" or modela.w between 1 and 3',
+    'wide': ' or '.join(f'modela.x > {i % 50}' for i in range(500)),
+}
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for __ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e3
+
+
+def run():
+    for label, value in expressions.items():
+        repeat = 20 if label == 'wide' else 500
+        expr = SQLAParser(value, engine='fast').parse()
+        forms = {
+            'json': dumps(expr),
+            'binary': dumps(expr, binary=True),
+            'pickle': pickle.dumps(expr),
+        }
+        print(f'{label}, {len(value)} characters')
+        for engine in ('pyparsing', 'fast'):
+            # no parse cache, so each parse runs the engine
+            parser = SQLAParser(engine=engine)
+            ms = timed(lambda: parser.grammar.parse(value, engine=engine), repeat)
+            print(f'  parse {engine:10} {ms:8.3f} ms {len(value):8} bytes')
+        for form, data in forms.items():
+            load = pickle.loads if form == 'pickle' else loads
+            ms = timed(lambda: load(data), repeat)
+            print(f'  load  {form:10} {ms:8.3f} ms {len(data):8} bytes')
+        for form in ('json', 'binary'):
+            ms = timed(lambda: dumps(expr, binary=form == 'binary'), repeat)
+            print(f'  dump  {form:10} {ms:8.3f} ms')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,43 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: bench_threads.py
+# Project: benchmarks
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 2:41:09 pm
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 2:41:09 pm
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from boolean_parser.parsers import Parser
+
+
+# This benchmark parses the same batch of expressions with a single Parser shared
+# between an increasing number of threads, and checks every thread gets the same
+# results as a serial parse.  With boolean_parser installed, run it from the
+# top-level repo directory with python benchmarks/bench_threads.py
+
+values = [f'a{i} > {i} and (b{i} < 3 or not c{i} == {i % 7})' for i in range(2000)]
+
+
+def run(threads=(1, 2, 4, 8)):
+    for engine in ('pyparsing', 'fast'):
+        parser = Parser(engine=engine)
+        expected = [repr(parser.parse(value)) for value in values]
+        for nthreads in threads:
+            with ThreadPoolExecutor(max_workers=nthreads) as pool:
+                start = time.perf_counter()
+                results = list(pool.map(parser.parse, values))
+                elapsed = time.perf_counter() - start
+            assert [repr(r) for r in results] == expected, 'threaded results differ'
+            print(f'{engine:10} threads: {nthreads:2}  {len(values) / elapsed:10.0f} parses/s')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,74 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: bench_typeahead.py
+# Project: benchmarks
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 8:40:26 pm
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 8:40:26 pm
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+import time
+
+from boolean_parser.parsers import Parser
+from boolean_parser.typeahead import Typeahead
+
+
+# This benchmark types a ~1 KB expression one character at a time, and times each keystroke
+# with a Typeahead, a Typeahead without reuse of the previous input, and a full parse.
+# With boolean_parser installed, run it from the top-level repo directory with
+# python benchmarks/bench_typeahead.py
+
+def expression(size=1024):
+    clauses = []
+    i = 0
+    while len(' and '.join(clauses)) < size:
+        clauses.append(f'(x{i % 10} > {i} or y{i % 7} between {i} and {i + 5})')
+        i += 1
+    return ' and '.join(clauses)
+
+
+def keystrokes(value):
+    return [value[:i] for i in range(1, len(value) + 1)]
+
+
+def run():
+    value = expression()
+    inputs = keystrokes(value)
+
+    typeahead = Typeahead()
+    start = time.perf_counter()
+    worst = 0
+    for text in inputs:
+        tick = time.perf_counter()
+        typeahead.update(text)
+        worst = max(worst, time.perf_counter() - tick)
+    incremental = (time.perf_counter() - start) / len(inputs)
+
+    start = time.perf_counter()
+    for text in inputs:
+        Typeahead().update(text)
+    fresh = (time.perf_counter() - start) / len(inputs)
+
+    parser = Parser()
+    start = time.perf_counter()
+    for text in inputs[::10]:
+        try:
+            parser.parse(text)
+        except Exception:
+            pass
+    full = (time.perf_counter() - start) / len(inputs[::10])
+
+    print(f'{len(value)} character input, {len(inputs)} keystrokes')
+    print(f'typeahead:            {incremental * 1e3:8.3f} ms per keystroke '
+          f'(worst {worst * 1e3:.3f} ms)')
+    print(f'typeahead, no reuse:  {fresh * 1e3:8.3f} ms per keystroke')
+    print(f'Parser.parse:         {full * 1e3:8.3f} ms per keystroke')
+
+
+if __name__ == '__main__':
+    run()
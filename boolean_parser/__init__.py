@@ -14,12 +14,19 @@
 from __future__ import print_function, division, absolute_import
 
 from boolean_parser.parsers import Parser
-from boolean_parser.parsers import SQLAParser
 
 
 __version__ = '0.1.5-alpha'
 
 
+def __getattr__(name):
+    # import the SQLAlchemy parser, and sqlalchemy itself, only when first accessed
+    if name == 'SQLAParser':
+        from boolean_parser.parsers.sqla import SQLAParser
+        return SQLAParser
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
 def parse(value, base='sqla'):
     ''' Convenience function to returned a parsed expression
 
@@ -27,6 +34,7 @@ def parse(value, base='sqla'):
     in `boolean_parser`.  The ``base`` keyword argument can be used
     to select which ``Parser`` to use.  The availble bases are: "base",
     "sqla".  The default base is "sqla" which uses the :py:class:`boolean_parser.parsers.sqla.SQLAParser`.
+    ``sqlalchemy`` is only imported when the "sqla" base is first used.
 
     Parameters:
         value: str
@@ -40,6 +48,7 @@ def parse(value, base='sqla'):
     if base == 'base':
         return Parser(value).parse()
     elif base == 'sqla':
+        from boolean_parser.parsers.sqla import SQLAParser
         return SQLAParser(value).parse()
     else:
         return Parser(value).parse()
@@ -0,0 +1,99 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: base.py
+# Project: actions
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 4:12:40 pm
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 4:12:40 pm
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+
+
+class Node(object):
+    ''' Base class for the objects of a parsed expression tree
+
+    Nodes are compact ``__slots__`` objects.  Subclasses list their attributes in
+    ``__slots__``, and can be frozen, after which their attributes can no longer be set.
+    Nodes pickle all of their slots, and any instance dictionary of subclasses that
+    do not define ``__slots__``.  Nodes can be weakly referenced, e.g. by an
+    :py:class:`~boolean_parser.intern.InternTable`.
+
+    Nodes compare equal, and hash equally, when their canonical forms are equal, see
+    :py:func:`~boolean_parser.canonical.canonical`.  They compare by the remembered
+    :py:func:`~boolean_parser.canonical.digest` of that form.  The hash of a node changes
+    if it is modified, so freeze nodes before using them as dictionary keys.
+    '''
+    __slots__ = ('_frozen', '_digest', '__weakref__')
+
+    def __setattr__(self, name, value):
+        if getattr(self, '_frozen', False):
+            raise AttributeError(f'cannot modify a frozen {self.__class__.__name__}')
+        super(Node, self).__setattr__(name, value)
+        object.__setattr__(self, '_digest', None)
+
+    def __getstate__(self):
+        state = getattr(self, '__dict__', {}).copy()
+        for cls in type(self).__mro__:
+            for name in getattr(cls, '__slots__', ()):
+                if not name.startswith('__') and hasattr(self, name):
+                    state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+    def __eq__(self, other):
+        # interned nodes are equal exactly when they are the same object
+        if self is other:
+            return True
+        if not isinstance(other, Node):
+            return NotImplemented
+        return self.digest() == other.digest()
+
+    def __hash__(self):
+        return hash(self.digest())
+
+    def canonical(self):
+        ''' Return the canonical string form of the expression
+
+        See :py:func:`boolean_parser.canonical.canonical`.
+        '''
+        from boolean_parser.canonical import canonical
+        return canonical(self)
+
+    def digest(self):
+        ''' Return the structural digest of the expression
+
+        See :py:func:`boolean_parser.canonical.digest`.
+        '''
+        value = getattr(self, '_digest', None)
+        if value is None:
+            from boolean_parser.canonical import digest
+            value = digest(self)
+        return value
+
+    def fingerprint(self):
+        ''' Return a stable structural hash of the expression
+
+        See :py:func:`boolean_parser.canonical.fingerprint`.
+        '''
+        from boolean_parser.canonical import fingerprint
+        return fingerprint(self)
+
+    def normalize(self):
+        ''' Return a normalized, equivalent copy of the expression
+
+        See :py:func:`boolean_parser.normalize.normalize`.
+        '''
+        from boolean_parser.normalize import normalize
+        return normalize(self)
+
+    def _intern_key(self):
+        ''' Return a hashable key identifying equal nodes, for interning '''
+        return (type(self), id(self))
@@ -13,12 +13,14 @@
 
 from __future__ import print_function, division, absolute_import
 
+from boolean_parser.actions.base import Node
+
 #
 # Boolean Precedent Actions
 #
 
 
-class BaseBool(object):
+class BaseBool(Node):
     ''' Base class for handling conditions joined by boolean logic operators
 
     This class handles the parsing of boolean logic within strings. The boolean
@@ -29,21 +31,52 @@ class BaseBool(object):
     During parsing, the class extracts all conditions and parameters joined by the boolean logic
     and makes them accessible as attributes.
 
+    Boolean clauses are compact ``__slots__`` objects holding their conditions as a tuple.
+
+    The ``params``, ``leaves`` and digest of a boolean clause are computed on
+    first access and then remembered.  They are reset when the ``conditions`` of the
+    clause are replaced, but not when a nested condition is modified in place, so freeze
+    an expression before sharing it if its conditions may still change.
+
     Attributes:
         params: list
-            A list of extracted parameters from all conditions
-        conditions: list
-            A list of conditions contained within the boolean clause
+            A list of extracted parameters from all conditions, in order of first appearance
+        leaves: tuple
+            All of the leaf conditions within the boolean clause and its nested clauses,
+            from left to right
+        conditions: tuple
+            The conditions contained within the boolean clause
         logicop: str
             The boolean logic operator used to join the conditions
     '''
+    __slots__ = ('conditions', '_leaves', '_params')
     logicop = None
 
     def __init__(self, data):
+        object.__setattr__(self, '_frozen', False)
         self._get_conditions(data[0])
 
+    def __setattr__(self, name, value):
+        super(BaseBool, self).__setattr__(name, value)
+        if name == 'conditions':
+            self._reset()
+
+    def _reset(self):
+        ''' Forget the remembered params, leaves and digest '''
+        object.__setattr__(self, '_leaves', None)
+        object.__setattr__(self, '_params', None)
+        object.__setattr__(self, '_digest', None)
+
+    def _replace_conditions(self, conditions):
+        ''' Replace the conditions with equal ones, even when frozen '''
+        digest = self._digest
+        object.__setattr__(self, 'conditions', conditions)
+        self._reset()
+        # equal conditions have the same digests
+        object.__setattr__(self, '_digest', digest)
+
     def _get_conditions(self, data):
-        ''' Builds the list of conditions
+        ''' Builds the tuple of conditions
 
         Iterators over the input parsed conditions and extracts
         pyparsed clauses from boolean logic joins. Extracts pyparsed
@@ -53,38 +86,152 @@ class BaseBool(object):
             data: list
                 A list of underlying conditions
         '''
-        self.conditions = []
-        for condition in data:
-            # append to list if condition is not a Bool class
-            if condition and condition != self.logicop:
-                self.conditions.append(condition)
+        # keep conditions, skipping the Bool logic operators
+        self.conditions = tuple(condition for condition in data
+                                if condition and condition != self.logicop)
+
+    def freeze(self):
+        ''' Make the boolean clause and all of its conditions immutable
+
+        Freezes every nested condition that supports it.  Frozen clauses are safe
+        to share between callers, e.g. when returned from a parse cache.
+
+        Returns:
+            The frozen boolean clause itself
+        '''
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node._frozen:
+                continue
+            for condition in node.conditions:
+                if isinstance(condition, BaseBool):
+                    stack.append(condition)
+                elif hasattr(condition, 'freeze'):
+                    condition.freeze()
+            object.__setattr__(node, '_frozen', True)
+        return self
+
+    def _intern_key(self):
+        ''' Return a hashable key identifying equal nodes, for interning
+
+        Conditions are compared by identity, so must already be interned.
+        '''
+        return (type(self), tuple(id(condition) for condition in self.conditions))
+
+    @property
+    def leaves(self):
+        ''' All leaf conditions, from left to right '''
+        if self._leaves is None:
+            # iterative walk, reusing the leaves already found for any nested clause
+            leaves = []
+            stack = [self]
+            while stack:
+                node = stack.pop()
+                if not isinstance(node, BaseBool):
+                    leaves.append(node)
+                elif node is not self and node._leaves is not None:
+                    leaves.extend(node._leaves)
+                else:
+                    stack.extend(reversed(node.conditions))
+            object.__setattr__(self, '_leaves', tuple(leaves))
+        return self._leaves
+
+    def iter_leaves(self):
+        ''' Iterate over all leaf conditions, from left to right
+
+        Returns:
+            An iterator of leaf conditions
+        '''
+        return iter(self.leaves)
 
     @property
     def params(self):
-        ''' The extracted parameters from a parsed condition '''
-        params = []
-        for condition in self.conditions:
-            if isinstance(condition, BaseBool):
-                params.extend(condition.params)
+        ''' The extracted parameters from a parsed condition, in order of first appearance '''
+        if self._params is None:
+            params = dict.fromkeys(leaf.fullname for leaf in self.leaves)
+            object.__setattr__(self, '_params', tuple(params))
+        return list(self._params)
+
+    @property
+    def placeholders(self):
+        ''' The names of all placeholder values in the conditions, in order of first appearance '''
+        names = dict.fromkeys(name for leaf in self.leaves
+                              for name in getattr(leaf, 'placeholders', ()))
+        return list(names)
+
+    def _fold(self, leaf, combine):
+        ''' Evaluate the expression bottom-up, with an explicit stack
+
+        Walks the boolean clause and its nested clauses without recursion, so very deep
+        expressions are supported.  Clauses shared by several parents are evaluated once.
+
+        Parameters:
+            leaf: callable
+                Called with each leaf condition, returning its value
+            combine: callable
+                Called with each boolean clause and the list of values of its conditions,
+                returning the value of the clause
+
+        Returns:
+            The value of the boolean clause
+        '''
+        results = {}
+        stack = [(self, iter(self.conditions), [])]
+        while stack:
+            node, conditions, values = stack[-1]
+            for condition in conditions:
+                if not isinstance(condition, BaseBool):
+                    values.append(leaf(condition))
+                elif id(condition) in results:
+                    values.append(results[id(condition)])
+                else:
+                    stack.append((condition, iter(condition.conditions), []))
+                    break
             else:
-                params.append(condition.fullname)
-        return list(set(params))
+                stack.pop()
+                results[id(node)] = value = combine(node, values)
+                if stack:
+                    stack[-1][2].append(value)
+        return results[id(self)]
 
     def __repr__(self):
-        strcond = ', '.join([repr(c) for c in self.conditions])
-        return f'{self.logicop}_({strcond})'
+        # emit the pieces in order with an explicit stack, rather than joining the string of
+        # each nested clause, which would copy deep expressions once per level
+        pieces = [f'{self.logicop}_(']
+        stack = [iter(self.conditions)]
+        first = True
+        while stack:
+            for condition in stack[-1]:
+                if not first:
+                    pieces.append(', ')
+                if isinstance(condition, BaseBool):
+                    pieces.append(f'{condition.logicop}_(')
+                    stack.append(iter(condition.conditions))
+                    first = True
+                    break
+                pieces.append(repr(condition))
+                first = False
+            else:
+                pieces.append(')')
+                stack.pop()
+                first = False
+        return ''.join(pieces)
 
 
 class BoolNot(BaseBool):
     ''' Class for boolean Not logic '''
+    __slots__ = ()
     logicop = 'not'
 
 
 class BoolAnd(BaseBool):
     ''' Class for boolean And logic '''
+    __slots__ = ()
     logicop = 'and'
 
 
 class BoolOr(BaseBool):
     ''' Class for boolean Or logic '''
+    __slots__ = ()
     logicop = 'or'
@@ -12,13 +12,24 @@
 
 
 from __future__ import print_function, division, absolute_import
+import re
+from types import MappingProxyType
+
+from boolean_parser.actions.base import Node
+
+
+# a named placeholder value, e.g. ":xmin", whose value is bound when a filter is executed
+placeholder_re = re.compile(r':([A-Za-z_][A-Za-z0-9_]*)\Z')
+
+# the operators of conditions on a list of values
+in_operators = ('in', 'not in')
 
 #
 # Parsing Action classses
 #
 
 
-class BaseAction(object):
+class BaseAction(Node):
     ''' Base object representing a clause action
 
     An action to perform after parsing a string clause.  If set, actions run
@@ -28,6 +39,17 @@ class BaseAction(object):
     be attached by passing a list of functions or classes.  This class extracts the parsed data
     from the ``pyparsing`` element and makes it accessible as a variety of named attributes.
 
+    Actions are compact ``__slots__`` objects.  The extracted parameters are stored only
+    as attributes, and the original ``pyparsing.ParseResults`` are dropped after parsing
+    unless ``keep_parse_results`` is True.  See the ``keep_parse_results`` option of
+    ``Parser.build_parser``.
+
+    Parameters:
+        data: :py:class:`pyparsing.ParseResults` | dict
+            The pyparsed results, or a dictionary of already extracted parameters
+        keep_parse_results: bool
+            If True, keeps the pyparsed results as the ``parsed_clause`` attribute
+
     Attributes:
         name: str
             The name of the extracted parameter
@@ -36,23 +58,34 @@ class BaseAction(object):
         fullname: str
             The full name of the extracted parameter as base + name
         data: dict
-            The extracted parsed parameters from the pyparse clause
+            The extracted parsed parameters from the pyparse clause.  The dictionary is
+            rebuilt from the attributes on each access, so changes to it are not kept.
         parsed_clause: :py:class:`pyparsing.ParseResults`
-            The original pyparsed results object
+            The original pyparsed results object, if kept, otherwise None
         input_clause: str
             The original input clause element
     '''
+    __slots__ = ('base', 'name', 'parsed_clause', '_extra')
+
+    # the parsed parameters that are rebuilt from attributes rather than stored
+    _data_keys = ('parameter',)
 
-    def __init__(self, data):
-        self.parsed_clause = data
-        self.data = data[0].asDict()
+    def __init__(self, data, *, keep_parse_results=False):
+        object.__setattr__(self, '_frozen', False)
+        if isinstance(data, dict):
+            # already extracted parameters, e.g. from the fast parsing engine
+            self.parsed_clause = None
+        else:
+            self.parsed_clause = data if keep_parse_results else None
+            data = data[0].asDict()
 
-        # parse the basic parameter name
-        self._parse_parameter_name()
+        # parse the basic parameter name and any clause specific parameters
+        self._parse_parameter_name(data.get('parameter', None))
+        self._extract_data(data)
+        self._extra = self._extra_data(data) or None
 
-    def _parse_parameter_name(self):
+    def _parse_parameter_name(self, name):
         ''' parse the parameter name into a base + name '''
-        name = self.data.get('parameter', None)
         assert name.count(
             '.') <= 1, f'parameter {name} cannot have more than one . '
         if '.' in name:
@@ -61,6 +94,44 @@ class BaseAction(object):
             self.base = None
             self.name = name
 
+    def _extract_data(self, data):
+        ''' Extract clause specific parameters from the parsed data into attributes '''
+        pass
+
+    def _extra_data(self, data):
+        ''' Return the parsed parameters that cannot be rebuilt from the attributes '''
+        return {key: val for key, val in data.items() if key not in self._data_keys}
+
+    def _data_items(self):
+        ''' Rebuild the parsed parameters from the attributes '''
+        return {'parameter': self.fullname}
+
+    def _intern_key(self):
+        ''' Return a hashable key identifying equal nodes, for interning '''
+        extra = tuple(sorted(self._extra.items())) if self._extra else None
+        return (type(self), self.base, self.name, extra)
+
+    @property
+    def data(self):
+        ''' The extracted parsed parameters, rebuilt from the attributes '''
+        data = self._data_items()
+        if self._extra:
+            data.update(self._extra)
+        return MappingProxyType(data) if self._frozen else data
+
+    def freeze(self):
+        ''' Make the action immutable
+
+        Once frozen, attributes can no longer be set and the ``data`` dictionary
+        becomes a read-only mapping.  Frozen actions are safe to share between
+        callers, e.g. when returned from a parse cache.
+
+        Returns:
+            The frozen action itself
+        '''
+        object.__setattr__(self, '_frozen', True)
+        return self
+
     @property
     def fullname(self):
         ''' The full parameter name, including any base '''
@@ -75,9 +146,7 @@ class Word(BaseAction):
     "alpha" or "alpha and beta or not charlie".
 
     '''
-
-    def __init__(self, data):
-        super(Word, self).__init__(data)
+    __slots__ = ()
 
     def __repr__(self):
         return f'{self.name}'
@@ -98,11 +167,22 @@ class Condition(BaseAction):
     ``value`` attribute, respectively.  Example conditional clauses:
     "x > 5" or "x > 5 and y < 3".  When using a "between" condition, e.g.
     "x between 3 and 5", an additional ``value2`` attribute is assigned the second
-    parameter value.  For bitwise operands of '&' and '|', the value can also accept a negation
+    parameter value.  When using an "in" or "not in" condition, e.g. "x in (1, 2, 3)", the
+    list of values is assigned as the ``values`` attribute, and ``value`` is None.  For
+    bitwise operands of '&' and '|', the value can also accept a negation
     prefix, e.g. "x & ~256", which evaluates to "x & -257".
 
+    A value can also be a named placeholder, e.g. "x > :xmin", so one parsed expression can
+    be used with many values.  The names are given by ``placeholders``, and
+    ``SQLAParser`` filters bind them as SQLAlchemy bind parameters of the same name.  Any
+    value of this form is a placeholder, whether or not it is quoted.
+
+    Values are kept as strings.  When the grammar has a
+    :py:class:`~boolean_parser.schema.Schema`, they are also cast to the type of the
+    parameter at parse time, and available as ``typed_value`` and ``typed_value2``.
+
     Allowed operands for conditionals are:
-        '>', '>=, '<', '<=', '==', '=', '!=', '&', '|'
+        '>', '>=, '<', '<=', '==', '=', '!=', '&', '|', 'in', 'not in'
 
     In addition to the Base Attributes, the ``Condition`` action provides
     additional attributes containing the parsed condition parameters.
@@ -111,41 +191,114 @@ class Condition(BaseAction):
         operator: str
             The operand used in the condition
         value: str
-            The parameter value in the condition
+            The parameter value in the condition, or None for "in" conditions
         value2: str
-            Optional second value, assigned when a "between" condition is used.
+            Optional second value, assigned when a "between" condition is used, otherwise None.
+        values: tuple
+            The list of values, assigned when an "in" or "not in" condition is used,
+            otherwise None.
 
     '''
-
-    def __init__(self, data):
-        super(Condition, self).__init__(data)
-
-        # extract the conditional operator and value
-        self.operator = self.data.get('operator', None)
-        self._extract_values()
+    __slots__ = ('operator', 'value', 'value2', 'values', '_typed')
+    _data_keys = ('parameter', 'operator', 'value', 'value1', 'value2', 'values')
 
     def __repr__(self):
-        more = 'and' + self.value2 if hasattr(self, 'value2') else ''
+        if self.values is not None:
+            return f'{self.name} {self.operator} ({", ".join(self.values)})'
+        more = 'and' + self.value2 if self.value2 is not None else ''
         return self.name + self.operator + self.value + more
 
+    @property
+    def placeholders(self):
+        ''' The names of any placeholder values, e.g. ('xmin',) for "x > :xmin" '''
+        return tuple(mm.group(1) for mm in map(placeholder_re.match, self._values()) if mm)
+
+    def _values(self):
+        ''' All the values of the condition '''
+        if self.values is not None:
+            return self.values
+        return (self.value,) if self.value2 is None else (self.value, self.value2)
+
+    @property
+    def value_type(self):
+        ''' The python type of the values given by the grammar schema, or None if untyped '''
+        return self._typed[0] if self._typed else None
+
+    @property
+    def typed_value(self):
+        ''' The value cast to the type of the parameter, or the string value if untyped '''
+        return self._typed[1] if self._typed else self.value
+
+    @property
+    def typed_value2(self):
+        ''' The second value cast to the type of the parameter, or the string value if untyped '''
+        return self._typed[2] if self._typed and self.value2 is not None else self.value2
+
+    @property
+    def typed_values(self):
+        ''' The list of values cast to the type of the parameter, or the string values if untyped
+        '''
+        return self._typed[1:] if self._typed and self.values is not None else self.values
+
     @property
     def input_clause(self):
         ''' Original input clause as a string '''
         if self.operator == 'between':
             return f'{self.fullname} {self.operator} {self.value} and {self.value2}'
+        elif self.values is not None:
+            return f'{self.fullname} {self.operator} ({", ".join(self.values)})'
         else:
             return f'{self.fullname} {self.operator} {self.value}'
 
-    def _extract_values(self):
+    def _extract_data(self, data):
+        ''' Extract the conditional operator and value '''
+        self.operator = data.get('operator', None)
+        self.value2 = None
+        self.values = None
+        self._typed = None
+        self._extract_values(data)
+
+    def _extract_values(self, data):
         ''' Extract the value or values from the condition '''
-        self.value = self.data.get('value', None)
-        if not self.value:
+        if self.operator in in_operators:
+            check = self._check_bitwise_value
+            self.values = tuple(check(v) if '~' in v else v for v in data.get('values'))
+            self.value = None
+            return
+
+        value = data.get('value', None)
+        if not value:
             if self.operator == 'between':
-                self.value = self._check_bitwise_value(self.data.get('value1'))
-                self.value2 = self._check_bitwise_value(
-                    self.data.get('value2'))
+                value = self._check_bitwise_value(data.get('value1'))
+                self.value2 = self._check_bitwise_value(data.get('value2'))
+
+        self.value = self._check_bitwise_value(value)
+
+    def _extra_data(self, data):
+        ''' Return the parsed parameters that cannot be rebuilt from the attributes '''
+        extra = super(Condition, self)._extra_data(data)
+        # raw bitwise values, e.g. "~256", are converted on extraction
+        for key in ('value', 'value1', 'value2'):
+            if '~' in (data.get(key) or ''):
+                extra[key] = data[key]
+        return extra
+
+    def _data_items(self):
+        ''' Rebuild the parsed parameters from the attributes '''
+        data = {'parameter': self.fullname, 'operator': self.operator}
+        if self.values is not None:
+            data['values'] = list(self.values)
+        elif self.value2 is not None:
+            data['value1'] = self.value
+            data['value2'] = self.value2
+        else:
+            data['value'] = self.value
+        return data
 
-        self.value = self._check_bitwise_value(self.value)
+    def _intern_key(self):
+        ''' Return a hashable key identifying equal nodes, for interning '''
+        return super(Condition, self)._intern_key() + (self.operator, self.value, self.value2,
+                                                       self.values, self._typed)
 
     def _check_bitwise_value(self, value):
         ''' Check if value has a bitwise ~ in it
@@ -168,4 +321,3 @@ class Condition(BaseAction):
                 value = str(-1 * (int(value)) - 1)
 
         return value
-
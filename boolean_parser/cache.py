@@ -0,0 +1,317 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: cache.py
+# Project: boolean_parser
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 9:12:04 am
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 9:12:04 am
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+import os
+import sqlite3
+import threading
+from collections import OrderedDict, namedtuple
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+DiskCacheInfo = namedtuple('DiskCacheInfo', ['hits', 'misses', 'evictions', 'max_bytes',
+                                             'currsize', 'nbytes'])
+
+
+class ParseCache(object):
+    ''' A thread-safe, size-bounded LRU cache of parsed expressions
+
+    Stores parsed expressions keyed by the parser grammar and the exact input
+    string.  When the cache is full, the least recently used entry is evicted.
+    All access is guarded by a lock so a single cache can be shared by every
+    thread using a parser class.
+
+    Parameters:
+        maxsize: int
+            The maximum number of entries to hold.  Default is 1024.
+
+    Attributes:
+        hits: int
+            The number of successful lookups
+        misses: int
+            The number of failed lookups
+        evictions: int
+            The number of entries dropped to make room for new ones
+    '''
+
+    def __init__(self, maxsize=1024):
+        assert isinstance(maxsize, int) and maxsize > 0, 'maxsize must be a positive integer'
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __repr__(self):
+        return f'<ParseCache(maxsize={self.maxsize}, currsize={len(self)})>'
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        ''' Look up a cached entry and mark it as recently used
+
+        Parameters:
+            key: tuple
+                The cache key
+            default: object
+                The value to return on a cache miss
+
+        Returns:
+            The cached value, or ``default`` if the key is not in the cache
+        '''
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        ''' Add an entry to the cache, evicting the oldest entry if needed
+
+        Parameters:
+            key: tuple
+                The cache key
+            value: object
+                The value to store
+        '''
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        ''' Remove all entries and reset the counters '''
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        ''' Return the cache statistics as a ``CacheInfo`` named tuple '''
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._data))
+
+
+# the version of the on-disk cache tables; a database with another version is emptied
+_schema_version = 1
+
+_schema = [
+    '''CREATE TABLE IF NOT EXISTS expressions (
+           parser TEXT NOT NULL, grammar TEXT NOT NULL, input TEXT NOT NULL,
+           data BLOB NOT NULL, size INTEGER NOT NULL, PRIMARY KEY (parser, grammar, input))''',
+    '''CREATE TABLE IF NOT EXISTS totals (id INTEGER PRIMARY KEY, nbytes INTEGER NOT NULL)''',
+    '''INSERT OR IGNORE INTO totals VALUES (0, 0)''',
+    # keep the total size up to date in the same transaction as each change
+    '''CREATE TRIGGER IF NOT EXISTS expressions_insert AFTER INSERT ON expressions BEGIN
+           UPDATE totals SET nbytes = nbytes + NEW.size WHERE id = 0; END''',
+    '''CREATE TRIGGER IF NOT EXISTS expressions_delete AFTER DELETE ON expressions BEGIN
+           UPDATE totals SET nbytes = nbytes - OLD.size WHERE id = 0; END''',
+]
+
+
+class DiskCache(object):
+    ''' A persistent, size-bounded cache of serialized expressions shared between processes
+
+    Stores serialized parsed expressions in a SQLite database, keyed by the parser class,
+    the grammar version and the exact input string, so any number of processes, e.g. web
+    server workers, can share expressions parsed by any one of them, and keep them across
+    restarts.  The database uses write-ahead logging, so readers never block each other
+    or a writer, and is read through a memory map.  Each thread and process opens its own
+    connection, so a cache created before a process forks is safe to use in the children.
+
+    When the stored data grows beyond ``max_bytes``, the oldest entries are evicted until
+    it is under 90% of the limit.  The first time a process stores an expression for a
+    parser class with a new grammar version, e.g. after its clauses or actions change,
+    the entries for every other grammar version of that class are removed.
+
+    The cache only stores bytes.  Errors from the database, e.g. when it stays locked
+    for longer than ``timeout``, are treated as cache misses, so the cache never causes
+    a parse to fail.
+
+    Parameters:
+        path: str
+            The path to the SQLite database file, which is created if needed
+        max_bytes: int
+            The maximum total size of the stored data.  Default is 256 MB.
+        timeout: float
+            The number of seconds to wait for a locked database.  Default is 5.
+
+    Attributes:
+        hits: int
+            The number of successful lookups in this process
+        misses: int
+            The number of failed lookups in this process
+        evictions: int
+            The number of entries evicted by this process
+    '''
+
+    def __init__(self, path, max_bytes=2 ** 28, timeout=5.0):
+        assert isinstance(max_bytes, int) and max_bytes > 0, \
+            'max_bytes must be a positive integer'
+        self.path = os.fspath(path)
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._current = set()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._create()
+
+    def __repr__(self):
+        return f'<DiskCache(path={self.path!r}, max_bytes={self.max_bytes})>'
+
+    def _connect(self):
+        ''' Return the database connection of this thread and process '''
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            # map enough of the file for the data, its indexes and free pages
+            conn.execute(f'PRAGMA mmap_size={self.max_bytes * 2}')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _create(self):
+        ''' Create the cache tables, emptying a database of another schema version '''
+        conn = self._connect()
+        with _transaction(conn):
+            if conn.execute('PRAGMA user_version').fetchone()[0] != _schema_version:
+                for table in ('expressions', 'totals'):
+                    conn.execute(f'DROP TABLE IF EXISTS {table}')
+                conn.execute(f'PRAGMA user_version={_schema_version}')
+            for statement in _schema:
+                conn.execute(statement)
+
+    def get(self, parser, grammar, value):
+        ''' Look up the stored data for an input string
+
+        Parameters:
+            parser: str
+                The name of the parser class
+            grammar: str
+                The version of the parser grammar
+            value: str
+                The input string
+
+        Returns:
+            The stored bytes, or None if the input is not in the cache
+        '''
+        try:
+            row = self._connect().execute(
+                'SELECT data FROM expressions WHERE parser = ? AND grammar = ? AND input = ?',
+                (parser, grammar, value)).fetchone()
+        except sqlite3.Error:
+            row = None
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return row[0]
+
+    def set(self, parser, grammar, value, data):
+        ''' Store the data for an input string, evicting the oldest entries if needed
+
+        Parameters:
+            parser: str
+                The name of the parser class
+            grammar: str
+                The version of the parser grammar
+            value: str
+                The input string
+            data: bytes
+                The data to store
+        '''
+        size = len(data) + len(value.encode('utf-8'))
+        evicted = 0
+        try:
+            conn = self._connect()
+            with _transaction(conn):
+                if (parser, grammar) not in self._current:
+                    conn.execute('DELETE FROM expressions WHERE parser = ? AND grammar != ?',
+                                 (parser, grammar))
+                conn.execute('INSERT OR IGNORE INTO expressions VALUES (?, ?, ?, ?, ?)',
+                             (parser, grammar, value, data, size))
+                nbytes = conn.execute('SELECT nbytes FROM totals').fetchone()[0]
+                if nbytes > self.max_bytes:
+                    evicted = self._evict(conn, nbytes - self.max_bytes * 9 // 10)
+        except sqlite3.Error:
+            return
+        with self._lock:
+            self._current.add((parser, grammar))
+            self.evictions += evicted
+
+    def _evict(self, conn, nbytes):
+        ''' Delete the oldest entries holding at least nbytes, returning the number deleted '''
+        total = count = 0
+        rowid = None
+        for rowid, size in conn.execute('SELECT rowid, size FROM expressions ORDER BY rowid'):
+            total += size
+            count += 1
+            if total >= nbytes:
+                break
+        if rowid is not None:
+            conn.execute('DELETE FROM expressions WHERE rowid <= ?', (rowid,))
+        return count
+
+    def clear(self):
+        ''' Remove all entries and reset the counters '''
+        try:
+            with _transaction(self._connect()) as conn:
+                conn.execute('DELETE FROM expressions')
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._current.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        ''' Return the cache statistics as a ``DiskCacheInfo`` named tuple
+
+        The hits, misses and evictions are counted in this process, while the number of
+        entries and their total size in bytes are shared by all processes.
+        '''
+        conn = self._connect()
+        currsize = conn.execute('SELECT count(*) FROM expressions').fetchone()[0]
+        nbytes = conn.execute('SELECT nbytes FROM totals').fetchone()[0]
+        with self._lock:
+            return DiskCacheInfo(self.hits, self.misses, self.evictions, self.max_bytes,
+                                 currsize, nbytes)
+
+
+class _transaction(object):
+    ''' Run statements in a single write transaction, rolling back on errors '''
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute('BEGIN IMMEDIATE')
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute('ROLLBACK' if exc_type else 'COMMIT')
@@ -0,0 +1,204 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: canonical.py
+# Project: boolean_parser
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 7:05:12 pm
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 7:05:12 pm
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+import hashlib
+import re
+
+from boolean_parser.actions.base import Node
+from boolean_parser.actions.boolean import BaseBool
+from boolean_parser.actions.clause import BaseAction, Condition
+
+
+# values that can be written without quotes, as accepted by the condition value clause,
+# including named placeholders
+_bare_re = re.compile(r'(?:[\w\-.*+]+|:[A-Za-z_][A-Za-z0-9_]*)\Z')
+
+
+def canonical(expression):
+    ''' Return the canonical string form of a parsed expression
+
+    The canonical form only depends on the meaning of the expression, not on how it
+    was written.  Whitespace, the case of the "and", "or", "not", "between" and "in"
+    keywords, the order of the conditions within an "and" or "or" clause, and the order of
+    the values of an "in" list do not change it.  Nested boolean clauses are wrapped in
+    parentheses, and values that are not a single word are double-quoted, so the canonical
+    form can itself be parsed.
+
+    Conditions are not otherwise rewritten, so e.g. "a and (b and c)" and
+    "(a and b) and c" have different canonical forms.  Use
+    :py:func:`~boolean_parser.normalize.normalize` first to also remove such
+    differences.  The walk is iterative, so very deep expressions are supported, and the
+    canonical string is built on each call without being stored on the nested clauses.
+
+    Parameters:
+        expression: object
+            A parsed expression
+
+    Returns:
+        The canonical string
+
+    Example:
+        >>> from boolean_parser.parsers import Parser
+        >>> from boolean_parser.canonical import canonical
+        >>> canonical(Parser('y<2 AND x > 1').parse())
+        'x > 1 and y < 2'
+    '''
+    if not isinstance(expression, BaseBool):
+        return _leaf_text(expression)
+
+    # count the uses of each clause, so the text of a clause shared by several parents,
+    # e.g. an interned one, is only kept until its last parent is built
+    uses = {id(expression): 1}
+    stack = [expression]
+    while stack:
+        node = stack.pop()
+        for condition in node.conditions:
+            if isinstance(condition, BaseBool):
+                if id(condition) not in uses:
+                    uses[id(condition)] = 0
+                    stack.append(condition)
+                uses[id(condition)] += 1
+
+    texts = {}
+    stack = [(expression, False)]
+    while stack:
+        node, visited = stack.pop()
+        if not visited:
+            if id(node) not in texts:
+                stack.append((node, True))
+                stack.extend((c, False) for c in node.conditions if isinstance(c, BaseBool))
+            continue
+        if id(node) in texts:
+            continue
+        children = [_child_text(c, texts, uses) for c in node.conditions]
+        if node.logicop == 'not':
+            texts[id(node)] = f'not {children[0]}'
+        else:
+            texts[id(node)] = f' {node.logicop} '.join(sorted(children))
+    return texts[id(expression)]
+
+
+def digest(expression):
+    ''' Return a structural digest of a parsed expression
+
+    Two expressions have the same digest when they have the same
+    :py:func:`canonical` form.  The digest of a boolean clause is built from the sorted
+    digests of its conditions, rather than from its canonical string, and is remembered
+    on every node of the expression, so parsed expressions hash and compare with it
+    without building their canonical strings.  It is reset when a node is modified,
+    but not when a nested condition is modified in place.
+
+    Parameters:
+        expression: object
+            A parsed expression
+
+    Returns:
+        The 16-byte digest
+    '''
+    if not isinstance(expression, BaseBool):
+        return _condition_digest(expression)
+
+    # iterative post-order walk, reusing the digests remembered on nested clauses
+    stack = [expression]
+    while stack:
+        node = stack[-1]
+        if getattr(node, '_digest', None) is not None:
+            stack.pop()
+            continue
+        pending = [c for c in node.conditions
+                   if isinstance(c, BaseBool) and getattr(c, '_digest', None) is None]
+        if pending:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        digests = [_condition_digest(c) for c in node.conditions]
+        value = hashlib.blake2b(node.logicop.encode('utf-8'), digest_size=16,
+                                person=b'bool')
+        for child in (digests if node.logicop == 'not' else sorted(digests)):
+            value.update(child)
+        _remember(node, value.digest())
+    return _condition_digest(expression)
+
+
+def fingerprint(expression):
+    ''' Return a stable structural hash of a parsed expression
+
+    The fingerprint is the SHA-256 hex digest of the :py:func:`canonical` form, so
+    equal expressions have equal fingerprints in every process and Python version,
+    unlike the built-in ``hash``.  Use it to key persistent caches or to deduplicate
+    expressions by meaning.
+
+    Parameters:
+        expression: object
+            A parsed expression
+
+    Returns:
+        The hex digest string
+    '''
+    return hashlib.sha256(canonical(expression).encode('utf-8')).hexdigest()
+
+
+def _child_text(node, texts, uses):
+    ''' The canonical form of a condition within a boolean clause '''
+    if not isinstance(node, BaseBool):
+        return _leaf_text(node)
+    text = texts[id(node)]
+    uses[id(node)] -= 1
+    if not uses[id(node)]:
+        del texts[id(node)]
+    # a "not" binds tighter than any other clause
+    return text if node.logicop == 'not' else f'({text})'
+
+
+def _remember(node, value):
+    ''' Remember the digest of a node, if it can hold it '''
+    if isinstance(node, Node):
+        object.__setattr__(node, '_digest', value)
+
+
+def _condition_digest(node):
+    ''' The remembered digest of a node, computing and remembering that of a leaf '''
+    value = getattr(node, '_digest', None)
+    if value is None:
+        value = _leaf_digest(node)
+        _remember(node, value)
+    return value
+
+
+def _leaf_digest(node):
+    ''' The digest of the canonical form of a leaf condition '''
+    return hashlib.blake2b(_leaf_text(node).encode('utf-8'), digest_size=16,
+                           person=b'leaf').digest()
+
+
+def _quote(value):
+    ''' Quote a value, unless it is a single word '''
+    return value if _bare_re.match(value) else f'"{value}"'
+
+
+def _leaf_text(node):
+    ''' The canonical form of a leaf condition '''
+    if isinstance(node, Condition):
+        operator = node.operator.lower()
+        if node.values is not None:
+            # the order of, and duplicates in, a list do not change its meaning
+            values = ', '.join(_quote(v) for v in sorted(set(node.values)))
+            return f'{node.fullname} {operator} ({values})'
+        text = f'{node.fullname} {operator} {_quote(node.value)}'
+        if node.value2 is not None:
+            text += f' and {_quote(node.value2)}'
+        return text
+    if isinstance(node, BaseAction):
+        return node.input_clause if hasattr(node, 'input_clause') else node.fullname
+    return str(node)
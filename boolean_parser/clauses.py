@@ -12,6 +12,8 @@
 
 
 from __future__ import print_function, division, absolute_import
+import re
+
 import pyparsing as pp
 
 # ------
@@ -26,7 +28,9 @@ name = pp.Word(pp.alphas + '._', pp.alphanums +
                '._').setResultsName('parameter')
 operator = pp.oneOf(['==', '<=', '<', '>', '>=', '=', '!=',
                      '&', '|']).setResultsName('operator')
-value = (pp.Word(pp.alphanums + '-_.*') | pp.QuotedString('"')
+# named placeholders, e.g. ":xmin", are bound when a filter is executed
+placeholder = pp.Regex(r':[A-Za-z_][A-Za-z0-9_]*')
+value = (placeholder | pp.Word(pp.alphanums + '-_.*') | pp.QuotedString('"')
          | number).setResultsName('value')
 condition = pp.Group(name + operator + value).setResultsName('condition')
 
@@ -36,6 +40,30 @@ between_cond = pp.Group(name + pp.CaselessLiteral('between').setResultsName('ope
                         value.setResultsName('value1') + pp.CaselessLiteral('and') +
                         value.setResultsName('value2')).setResultsName('between_condition')
 
+# ------
+# define base parser for "in" and "not in" list expressions
+# a list value: a quoted string, a placeholder, or a word or number, as for condition values
+_list_value = r'"[^"\n\r]*"|:[A-Za-z_][A-Za-z0-9_]*|[+~]?[A-Za-z0-9_.*-]+'
+# a whole parenthesized list is matched, and split, with single regular expressions, so long
+# lists are parsed quickly
+list_re = re.compile(rf'\(\s*(?:{_list_value})(?:\s*,\s*(?:{_list_value}))*\s*\)')
+_list_value_re = re.compile(_list_value)
+
+
+def list_values(text):
+    ''' Split a parenthesized list, e.g. '(1, 2, "a b")', into its values, e.g. ['1', '2', 'a b']
+
+    Quotes around values are removed.
+    '''
+    return [v[1:-1] if v[0] == '"' else v for v in _list_value_re.findall(text)]
+
+
+in_operator = pp.Regex(r'(?i)(not\s+)?in\b').setParseAction(
+    lambda t: 'not in' if t[0][0] in 'nN' else 'in').setName('in').setResultsName('operator')
+value_list = pp.Regex(list_re).setParseAction(lambda t: [list_values(t[0])]).setName('list')
+in_cond = pp.Group(name + in_operator + value_list.setResultsName('values')
+                   ).setResultsName('in_condition')
+
 # -------
 # define base parser for functions
 ppc = pp.pyparsing_common
@@ -75,4 +103,4 @@ fxn_expr = pp.Group(function_call + operator + value).setResultsName('function_e
 
 
 # create a list of usable constructed clauses
-available_clauses = [words, condition, between_cond, fxn, fxn_cond, fxn_expr]
+available_clauses = [words, condition, between_cond, in_cond, fxn, fxn_cond, fxn_expr]
@@ -0,0 +1,134 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: intern.py
+# Project: boolean_parser
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 5:02:26 pm
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 5:02:26 pm
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+import threading
+import weakref
+from collections import namedtuple
+
+from boolean_parser.actions.base import Node
+from boolean_parser.actions.boolean import BaseBool
+
+
+InternInfo = namedtuple('InternInfo', ['hits', 'misses', 'currsize'])
+
+
+class InternTable(object):
+    ''' A thread-safe table of shared, immutable expression nodes
+
+    Interning replaces each node of a parsed expression with an existing, equal node
+    from the table, if there is one, so equal conditions and equal subtrees from any
+    number of parses are a single shared object.  Leaf conditions are equal when
+    they have the same class, parameter name, operator and values.  Boolean clauses are
+    equal when they have the same class and the same interned conditions, in the same
+    order.  Interned nodes are frozen, and two interned nodes from the same table have
+    the same structure exactly when they are the same object, so they can be compared
+    by identity.  This is stricter than ``==``, which ignores the order of conditions.
+    Interned nodes remember their digest, so they hash in constant time, and compare
+    equal without any walk when they are the same object.
+
+    The table only holds weak references, so nodes are dropped from it once no
+    parsed expression uses them anymore.  Nodes that are not derived from
+    :py:class:`~boolean_parser.actions.base.Node`, or that hold unhashable parsed
+    parameters, are left as they are.
+
+    Attributes:
+        hits: int
+            The number of nodes replaced by an existing node
+        misses: int
+            The number of nodes added to the table
+
+    Example:
+        >>> from boolean_parser.intern import InternTable
+        >>> from boolean_parser.parsers import Parser
+        >>> table = InternTable()
+        >>> a = table.intern(Parser('x > 5 and y < 2').parse())
+        >>> b = table.intern(Parser('x > 5 or z == 1').parse())
+        >>> a.conditions[0] is b.conditions[0]
+        True
+    '''
+
+    def __init__(self):
+        self._nodes = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return f'<InternTable(currsize={len(self)})>'
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def intern(self, expression):
+        ''' Intern every node of a parsed expression
+
+        Parameters:
+            expression: object
+                A parsed expression
+
+        Returns:
+            The shared, frozen expression equal to the input
+        '''
+        with self._lock:
+            # iterative post-order walk, so conditions are interned before their boolean clause
+            interned = {}
+            stack = [(expression, False)]
+            while stack:
+                node, visited = stack.pop()
+                if isinstance(node, BaseBool) and not visited:
+                    stack.append((node, True))
+                    stack.extend((condition, False) for condition in node.conditions)
+                    continue
+                interned[id(node)] = self._intern_node(node, interned)
+            return interned[id(expression)]
+
+    def _intern_node(self, node, interned):
+        ''' Intern a single node whose conditions, if any, are already interned '''
+        if not isinstance(node, Node):
+            return node
+
+        if isinstance(node, BaseBool):
+            conditions = tuple(interned.get(id(c), c) for c in node.conditions)
+            if any(new is not old for new, old in zip(conditions, node.conditions)):
+                # equal replacements, so this is safe even on an already frozen node
+                node._replace_conditions(conditions)
+
+        key = node._intern_key()
+        try:
+            existing = self._nodes.get(key)
+        except TypeError:
+            # unhashable parsed parameters
+            return node
+
+        if existing is not None:
+            self.hits += 1
+            return existing
+
+        self.misses += 1
+        # the digest of a boolean clause is built from those of its already interned
+        # conditions, so interned nodes hash without walking the expression again
+        node.freeze().digest()
+        self._nodes[key] = node
+        return node
+
+    def clear(self):
+        ''' Remove all nodes and reset the counters '''
+        with self._lock:
+            self._nodes.clear()
+            self.hits = self.misses = 0
+
+    def info(self):
+        ''' Return the table statistics as an ``InternInfo`` named tuple '''
+        with self._lock:
+            return InternInfo(self.hits, self.misses, len(self._nodes))
@@ -1 +1 @@
-from boolean_parser.mixins.sqla import SQLAMixin
+from boolean_parser.mixins.sqla import FieldRegistry, SQLAMixin
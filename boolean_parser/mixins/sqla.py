@@ -15,104 +15,489 @@ from __future__ import absolute_import, division, print_function
 
 import decimal
 import inspect
+import json
+import threading
+from collections import OrderedDict, namedtuple
 from datetime import date, datetime
 from operator import eq, ge, gt, le, lt, ne
 
 from sqlalchemy import bindparam, func
+from sqlalchemy import inspect as sqla_inspect
 from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import DeclarativeMeta
 from sqlalchemy.orm.util import AliasedClass
-from sqlalchemy.sql import between, sqltypes
+from sqlalchemy.sql import and_, between, or_, sqltypes
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.visitors import InternalTraversal
+from sqlalchemy.types import TypeDecorator
 
+from boolean_parser.actions.clause import placeholder_re
+from boolean_parser.optimize import check_optimize
 from boolean_parser.parsers.base import BooleanParserException
+from boolean_parser.schema import cast_type, cast_value, to_bool, to_date, to_datetime
 
 
 opdict = {'<=': le, '>=': ge, '>': gt, '<': lt, '!=': ne, '==': eq, '=': eq}
 
-class SQLAMixin(object):
-    ''' A Mixin class to apply SQLAlchemy filter parsing
+# python field types whose values are cast, and whose fields are not lowercased
+ftypes = [float, bool, int, decimal.Decimal, date, datetime]
 
-    This mixin adds a ``filter`` method to the parsed result which converts
-    the parsed string object into an appropriate SQLAlchemy filter condition to be used
-    in SQLAlchemy queries.
+# how string fields are compared, see SQLAMixin
+string_matches = ('ilike', 'exact', 'lower', 'prefix', 'collate')
+
+# guards the remembered filter clauses of expressions shared between threads
+_filters_lock = threading.Lock()
+
+# the class defaults a filter clause is built with, e.g. SQLAMixin.string_match
+_filter_settings = ('string_match', 'in_list_threshold', 'optimize')
+
+
+def check_models(classes):
+    ''' Check the input modelclass format
+
+    Checks if input classes is a module of modelclasses, a list of modelclasses
+    or a single ModelClass and returns a list of ModelClass objects.
+
+    Parameters:
+        classes (object):
+            A ModelClass module, list of models, or single ModelClass
 
+    Returns:
+        A list of ModelClasses
     '''
 
-    def _check_models(self, classes):
-        ''' Check the input modelclass format
+    # an entire module of classes
+    if inspect.ismodule(classes):
+        # an entire module of classes
+        models = [i[1] for i in inspect.getmembers(
+            classes, inspect.isclass) if hasattr(i[1], '__tablename__')]
+    elif isinstance(classes, (list, tuple)):
+        # a list of ModelClasses
+        models = classes
+    else:
+        # assume a single ModelClass
+        models = [classes]
+
+    # check for proper modelclasses
+    allmeta = all([isinstance(m, DeclarativeMeta) or isinstance(m, AliasedClass) for m in models])
+    assert allmeta is True, 'All input classes must be of type SQLAlchemy ModelClasses'
+
+    return models
+
+
+def get_field(modelclass, field_name, base_name=None):
+    ''' Return a SQLAlchemy attribute from a field name.
+
+    Checks that a given model contains the named field.
+
+    Parameters:
+        modelclass (ModelClass):
+            A SQLAlchemy ModelClass
+        field_name (str):
+            The database field name
+        base_name (str):
+            The database table name
+
+    Returns:
+        An SQLA instrumented attribute object
+    '''
+
+    field = None
+    # Handle hierarchical field names such as 'parent.name'
+    if base_name:
+        # Match alias name
+        if isinstance(modelclass, AliasedClass) and \
+                base_name == modelclass._aliased_insp.name.lower():
+            field = getattr(modelclass, field_name, None)
+
+        # Match table name
+        if not field and base_name in modelclass.__tablename__:
+            field = getattr(modelclass, field_name, None)
+    else:
+        # Handle flat field names such as 'name'
+        field = getattr(modelclass, field_name, None)
+
+    return field
+
+
+RegistryField = namedtuple('RegistryField', ['model', 'field', 'python_type'])
+
+
+class FieldRegistry(object):
+    ''' A precomputed lookup of the model fields that filter conditions refer to
+
+    Filters look up the field of each condition, e.g. "modela.x" or "x", in a set of
+    models.  Passing the models themselves to ``filter`` checks them, and searches them
+    for the field, for every filter built.  A registry checks the models once, and
+    remembers the model, instrumented attribute and python type found for each name,
+    so it can be built once, e.g. at application start, and passed to ``filter`` in
+    place of the models.
+
+    Names are matched against the models in order, exactly as ``filter`` does with the
+    models: a name with a base matches a model whose alias name is the base, or whose
+    table name contains it, and a bare name matches the first model with the field.  All
+    column names, with and without the table or alias name, are looked up when the
+    registry is built.  Other names are looked up on first use.
+
+    Parameters:
+        models: object
+            A module of SQLAlchemy models, a list of models or aliases, or a single model
+        prefill: bool
+            If True, looks up all column names when the registry is built.  Default is True.
+
+    Example:
+        >>> from boolean_parser.parsers import SQLAParser
+        >>> from boolean_parser.mixins.sqla import FieldRegistry
+        >>> import database.models
+        >>> registry = FieldRegistry(database.models)
+        >>> SQLAParser('table.x > 5 and table.y < 2').parse().filter(registry)
+    '''
+
+    def __init__(self, models, prefill=True):
+        self.models = tuple(check_models(models))
+        self._fields = {}
+        if prefill:
+            for model in self.models:
+                info = sqla_inspect(model)
+                base = info.name.lower() if isinstance(model, AliasedClass) else \
+                    model.__tablename__
+                for prop in info.mapper.column_attrs:
+                    self.lookup(prop.key, base)
+                    self.lookup(prop.key)
+
+    @classmethod
+    def of(cls, models):
+        ''' Return a registry for the models, or the models if already a registry
+
+        A new registry only looks up names on first use, so is cheap to build for a
+        single filter.
+        '''
+        return models if isinstance(models, cls) else cls(models, prefill=False)
+
+    def __repr__(self):
+        return f'<FieldRegistry(models={len(self.models)}, fields={len(self)})>'
 
-        Checks if input classes is a module of modelclasses, a list of modelclasses
-        or a single ModelClass and returns a list of ModelClass objects.
+    def __len__(self):
+        return sum(1 for entry in self._fields.values() if entry is not None)
+
+    def lookup(self, name, base=None):
+        ''' Find the model field for a parameter name
 
         Parameters:
-            classes (object):
-                A ModelClass module, list of models, or single ModelClass
+            name: str
+                The parameter name
+            base: str
+                The base name of the parameter, i.e. the table or alias name, if any
 
         Returns:
-            A list of ModelClasses
+            A ``RegistryField`` of the model, instrumented attribute and python type, or
+            None if no model has the field
         '''
+        key = (base, name)
+        try:
+            return self._fields[key]
+        except KeyError:
+            pass
+
+        entry = None
+        for model in self.models:
+            field = get_field(model, name, base_name=base)
+            # if there is an attribute then use that model
+            if field and hasattr(field, 'type') and hasattr(field, 'ilike'):
+                try:
+                    python_type = field.type.python_type
+                except NotImplementedError:
+                    python_type = None
+                entry = RegistryField(model, field, python_type)
+                break
+        self._fields[key] = entry
+        return entry
 
-        # an entire module of classes
-        if inspect.ismodule(classes):
-            # an entire module of classes
-            models = [i[1] for i in inspect.getmembers(
-                classes, inspect.isclass) if hasattr(i[1], '__tablename__')]
-        elif isinstance(classes, (list, tuple)):
-            # a list of ModelClasses
-            models = classes
-        else:
-            # assume a single ModelClass
-            models = [classes]
 
-        # check for proper modelclasses
-        allmeta = all([isinstance(m, DeclarativeMeta) or isinstance(m, AliasedClass) for m in models])
-        assert allmeta is True, 'All input classes must be of type SQLAlchemy ModelClasses'
+def _check_string_match(string_match):
+    ''' Check a string match strategy, returning its name and collation, if any '''
+    match, sep, collation = string_match.partition(':')
+    assert match in string_matches and (not sep or (match == 'collate' and collation)), \
+        f'string_match must be one of {string_matches}, or "collate:<collation name>"'
+    return match, collation or None
+
+
+def _models_key(models):
+    ''' Return a key identifying a set of models, and the objects the key refers to '''
+    if isinstance(models, (list, tuple)):
+        return tuple(id(model) for model in models), tuple(models)
+    return id(models), models
+
 
-        return models
+class _ValueArray(TypeDecorator):
+    ''' The type of a list of values bound as a single parameter
 
-    def _get_field(self, modelclass, field_name, base_name=None):
-        ''' Return a SQLAlchemy attribute from a field name.
+    A PostgreSQL array of the field type, or elsewhere a JSON string of the values, each
+    converted as the field type would bind it.
+    '''
+    impl = sqltypes.String
+    cache_ok = True
+
+    def __init__(self, item_type):
+        super(_ValueArray, self).__init__()
+        self.item_type = item_type
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'postgresql':
+            return dialect.type_descriptor(postgresql.ARRAY(self.item_type))
+        return dialect.type_descriptor(sqltypes.String())
+
+    def process_bind_param(self, value, dialect):
+        if dialect.name == 'postgresql':
+            return list(value)
+        process = self.item_type.dialect_impl(dialect).bind_processor(dialect)
+        values = [process(v) for v in value] if process else list(value)
+        return json.dumps(values, default=float)
+
+
+class InArray(ColumnElement):
+    ''' A comparison of a field with a list of values bound as a single array parameter
+
+    A long IN list has a bind parameter per value, so the size of the SQL, and the time to
+    compile and execute it, grows with the list, and may exceed the number of parameters
+    the database allows.  This comparison binds the whole list as one parameter, so the SQL
+    is the same for lists of any size, and its compiled form is cached.  It renders as
+    "field = ANY(:values)", or "field != ALL(:values)" when negated, on PostgreSQL, and as
+    "field IN (SELECT value FROM json_each(:values))" on SQLite.  Other databases get a
+    plain "field IN (...)", with a bind parameter per value.
+
+    Parameters:
+        field: object
+            The SQLAlchemy field, or field expression, to compare
+        values: list
+            The python values to compare with, of the field type
+        negate: bool
+            If True, the field must not equal any of the values
+        key: str
+            The name of the bind parameter
+        item_type: object
+            The SQLAlchemy type of the values.  Defaults to the type of the field.
+    '''
+    __visit_name__ = 'in_array'
+    inherit_cache = True
+    type = sqltypes.BOOLEANTYPE
+    _traverse_internals = [('field', InternalTraversal.dp_clauseelement),
+                           ('values', InternalTraversal.dp_clauseelement),
+                           ('items', InternalTraversal.dp_clauseelement),
+                           ('negate', InternalTraversal.dp_boolean)]
+
+    def __init__(self, field, values, negate=False, key=None, item_type=None):
+        item_type = item_type or field.type
+        self.field = field
+        self.values = bindparam(key, values, type_=_ValueArray(item_type), unique=True)
+        # the same values, for the IN clause of other databases.  Both are part of the
+        # statement, so new values are bound when a cached compiled statement is reused.
+        self.items = bindparam(key, values, type_=item_type, expanding=True, unique=True)
+        self.negate = negate
+
+
+@compiles(InArray, 'postgresql')
+def _compile_in_array_postgresql(element, compiler, **kw):
+    op = '!= ALL' if element.negate else '= ANY'
+    values = compiler.process(element.values, **kw)
+    return f'{compiler.process(element.field, **kw)} {op} ({values})'
+
+
+@compiles(InArray)
+def _compile_in_array(element, compiler, **kw):
+    # the generic string form, e.g. of str(clause), is written as for PostgreSQL
+    if compiler.dialect.name == 'default':
+        return _compile_in_array_postgresql(element, compiler, **kw)
+    field = element.field
+    clause = field.not_in(element.items) if element.negate else field.in_(element.items)
+    return compiler.process(clause, **kw)
+
+
+@compiles(InArray, 'sqlite')
+def _compile_in_array_sqlite(element, compiler, **kw):
+    op = 'NOT IN' if element.negate else 'IN'
+    values = compiler.process(element.values, **kw)
+    return f'{compiler.process(element.field, **kw)} {op} (SELECT value FROM json_each({values}))'
+
+
+class FilterCacheMixin(object):
+    ''' A Mixin class that remembers the SQLAlchemy filter clause built for each set of models
+
+    Building the filter of an expression creates a new SQLAlchemy clause, with its bind
+    parameters, functions and boolean joins, on every call.  This mixin remembers the
+    clause built for each of the last ``filter_cache_size`` sets of models an expression
+    is filtered with, keyed by the identity of the models, or of the model list items, so
+    calling ``filter`` again returns the same clause.  Reusing the clause also makes the
+    SQLAlchemy compiled statement cache key cheaper to compute.  Only the clause of the
+    expression ``filter`` is called on is remembered, not those of its conditions.
+
+    A remembered clause is rebuilt when the expression itself is modified, or when a class
+    default it was built with changes, e.g. ``SQLAMixin.string_match`` or
+    ``SQLBoolBase.optimize``, and all are dropped with :py:meth:`clear_filters`, but not
+    when a nested condition is modified in place, so freeze expressions before filtering
+    them repeatedly.  They are not pickled.  Classes using this mixin must have a
+    ``_filters`` slot, and implement ``_build_filter`` and ``_filter_state``.
+
+    Attributes:
+        filter_cache_size: int
+            The number of model sets to remember clauses for, per expression.  Set to 0
+            to never remember clauses.  Default is 8.
+    '''
+    __slots__ = ()
+    filter_cache_size = 8
+
+    def __getstate__(self):
+        state = super(FilterCacheMixin, self).__getstate__()
+        state.pop('_filters', None)
+        return state
+
+    def filter(self, modelclass, string_match=None, optimize=None):
+        ''' Return the expression as an SQLAlchemy query filter condition
 
-        Checks that a given model contains the named field.
+        Returns the clause already built for the same models, string match strategy and
+        optimize option, if any.  See :py:meth:`_build_filter`.
 
         Parameters:
-            modelclass (ModelClass):
-                A SQLAlchemy ModelClass
-            field_name (str):
-                The database field name
-            base_name (str):
-                The database table name
+            modelclass (objects):
+                A set of ModelClasses, or a ``FieldRegistry``, to use in the filter condition
+            string_match (str):
+                How string fields are compared.  Defaults to the ``string_match`` of each
+                condition class.  See :py:class:`SQLAMixin`.
+            optimize (bool|str):
+                Whether to collapse equalities into IN clauses and merge ranges in boolean
+                clauses.  Defaults to the ``optimize`` of the class.  See
+                :py:func:`~boolean_parser.optimize.optimize`.
 
         Returns:
-            An SQLA instrumented attribute object
+            A SQL query filter condition
         '''
+        assert modelclass is not None, 'No input found'
+        if string_match is not None:
+            _check_string_match(string_match)
+        check_optimize(optimize)
+        if self.filter_cache_size <= 0:
+            return self._build_filter(modelclass, string_match=string_match, optimize=optimize)
+
+        key, models = _models_key(modelclass)
+        key = (key, string_match, optimize)
+        state = self._filter_state()
+        filters = getattr(self, '_filters', None)
+        with _filters_lock:
+            entry = filters.get(key) if filters else None
+            if entry is not None and (entry[1] is state or entry[1] == state) and \
+                    _settings(entry[2]) == entry[3]:
+                filters.move_to_end(key)
+                return entry[4]
+
+        classes = self._filter_classes()
+        settings = _settings(classes)
+        clause = self._build_filter(modelclass, string_match=string_match, optimize=optimize)
+        with _filters_lock:
+            filters = getattr(self, '_filters', None)
+            if filters is None:
+                filters = OrderedDict()
+                try:
+                    # remembering a clause is allowed on frozen expressions
+                    object.__setattr__(self, '_filters', filters)
+                except AttributeError:
+                    # a subclass without the _filters slot
+                    return clause
+            # the models are kept with the clause, so their ids cannot be reused
+            filters[key] = (models, state, classes, settings, clause)
+            while len(filters) > self.filter_cache_size:
+                filters.popitem(last=False)
+        return clause
+
+    def _filter_state(self):
+        ''' Return the attributes the filter clause is built from, to detect modifications '''
+        raise NotImplementedError
+
+    def _filter_classes(self):
+        ''' Return the classes whose defaults the filter clause is built with '''
+        return (type(self),)
+
+    def clear_filters(self):
+        ''' Forget the remembered filter clauses of this expression '''
+        if getattr(self, '_filters', None):
+            with _filters_lock:
+                object.__setattr__(self, '_filters', None)
+
+
+def _settings(classes):
+    ''' Return the current class defaults a filter clause is built with '''
+    return tuple(tuple(getattr(cls, name, None) for name in _filter_settings)
+                 for cls in classes)
+
+
+class SQLAMixin(FilterCacheMixin):
+    ''' A Mixin class to apply SQLAlchemy filter parsing
 
-        field = None
-        # Handle hierarchical field names such as 'parent.name'
-        if base_name:
-            # Match alias name
-            if isinstance(modelclass, AliasedClass) and \
-                    base_name == modelclass._aliased_insp.name.lower():
-                field = getattr(modelclass, field_name, None)
-
-            # Match table name
-            if not field and base_name in modelclass.__tablename__:
-                field = getattr(modelclass, field_name, None)
-        else:
-            # Handle flat field names such as 'name'
-            field = getattr(modelclass, field_name, None)
+    This mixin adds a ``filter`` method to the parsed result which converts
+    the parsed string object into an appropriate SQLAlchemy filter condition to be used
+    in SQLAlchemy queries.  The clause built for each set of models is remembered, see
+    :py:class:`FilterCacheMixin`.
+
+    How string fields are compared is set by the ``string_match`` strategy, either for each
+    call to ``filter``, or as the default of a condition class with its ``string_match``
+    class attribute.  Only some strategies let the database use an index on the field:
+
+        - "ilike": the default.  Fields and values are compared case-insensitively with
+          ``lower()`` on both sides, and "=" is an ``ILIKE`` match anywhere in the field.
+          Indexes are only used for "==" and ranges, and only functional ``lower()`` indexes.
+        - "exact": fields are compared as they are, case-sensitively, and "=" is a ``LIKE``
+          match anywhere in the field.  Plain indexes are used for all but "=".
+        - "lower": ``lower(field)`` is compared with the value lowercased in Python, so a
+          functional index on ``lower(field)`` is used for all but "=".
+        - "collate" or "collate:<name>": fields are compared as they are, with an optional
+          ``COLLATE`` clause, leaving case-insensitivity to a ``citext`` column type or a
+          case-insensitive collation, whose indexes are used for all but "=".
+        - "prefix": as "exact", but "=" matches the start of the field, ``LIKE 'value%'``,
+          which can use a plain index, e.g. a PostgreSQL index with ``text_pattern_ops``.
+
+    Values with a "*" wildcard are always matched with the given pattern, and a leading
+    wildcard can never use an index.
+
+    The values of "in" and "not in" lists are compared with the same strategy, with "="
+    and "==" both an equality.  Lists of up to ``in_list_threshold`` values become an
+    ``IN`` clause, and longer lists an :py:class:`InArray` comparison, which binds all the
+    values as one array parameter on PostgreSQL and SQLite, and is a plain ``IN`` clause on
+    other databases.
+
+    Attributes:
+        string_match (str):
+            The default string match strategy of the class.  Default is "ilike".
+        in_list_threshold (int):
+            The largest list of values compared with an ``IN`` clause, or None to always
+            use one.  Default is 500.
+    '''
+    __slots__ = ()
+    string_match = 'ilike'
+    in_list_threshold = 500
 
-        return field
+    # the model lookups are shared with FieldRegistry
+    _check_models = staticmethod(check_models)
+    _get_field = staticmethod(get_field)
 
-    def filter(self, modelclass):
+    def _filter_state(self):
+        ''' Return the attributes the filter clause is built from, to detect modifications '''
+        return (self.base, self.name, self.operator, self.value, self.value2,
+                getattr(self, 'values', None), getattr(self, '_typed', None))
+
+    def _build_filter(self, modelclass, string_match=None, optimize=None):
         ''' Return the condition as an SQLalchemy query filter condition
 
         Loops over all models and creates a filter condition for that model
-        given the input filter parameters.
+        given the input filter parameters.  Pass a :py:class:`FieldRegistry` instead of
+        the models to skip checking and searching them on every call.
 
         Parameters:
             modelclass (objects):
-                A set of ModelClasses to use in the filter condition
+                A set of ModelClasses, or a ``FieldRegistry``, to use in the filter condition
+            string_match (str):
+                How string fields are compared.  Defaults to the class ``string_match``.
+            optimize (bool|str):
+                Ignored, a single condition has nothing to optimize
 
         Returns:
             A SQL query filter condition
@@ -120,27 +505,20 @@ class SQLAMixin(object):
 
         assert modelclass is not None, 'No input found'
 
-        condition = None
-        models = self._check_models(modelclass)
-
-        for model in models:
-            # get the SQLA instrumented attribute
-            field = self._get_field(model, self.name, base_name=self.base)
-
-            # if there is an attribute then break and use that model
-            if field and hasattr(field, 'type') and hasattr(field, 'ilike'):
-                break
+        # get the model and SQLA instrumented attribute
+        registry = FieldRegistry.of(modelclass)
+        entry = registry.lookup(self.name, base=self.base)
 
         # raise if no attribute found
-        if not field:
+        if entry is None:
+            model = registry.models[-1]
             raise BooleanParserException(f'Table {model.__tablename__} does not have field {self.name}')
 
         # produce the SQLA filter condition
-        condition = self._filter_one(model, field=field, condition=condition)
-
-        return condition
+        return self._filter_one(entry.model, field=entry.field, fieldtype=entry.python_type,
+                                string_match=string_match)
 
-    def _filter_one(self, model, field=None, condition=None):
+    def _filter_one(self, model, field=None, condition=None, fieldtype=None, string_match=None):
         ''' Create a single SQLAlchemy filter condition '''
 
         # if no field present return the original condition
@@ -148,11 +526,23 @@ class SQLAMixin(object):
             return condition
 
         # Prepare field and value
-        lower_field, lower_value, lower_value_2 = self._bind_and_lower_value(field)
+        fieldtype = fieldtype or field.type.python_type
+        match, collation = _check_string_match(string_match or self.string_match)
+        if getattr(self, 'values', None) is not None:
+            return self._filter_in(field, fieldtype, match, collation)
+        if match != 'ilike' and fieldtype not in ftypes and \
+                not isinstance(field.type, postgresql.ARRAY):
+            lower_field, lower_value, lower_value_2 = self._match_operands(field, match,
+                                                                           collation)
+        else:
+            lower_field, lower_value, lower_value_2 = self._bind_and_lower_value(field,
+                                                                                 fieldtype)
 
         # Handle postgresql arrays if any
         if isinstance(field.type, postgresql.ARRAY):
-            condition = field.any(self.value, operator=opdict[self.operator])
+            placeholder = placeholder_re.match(self.value)
+            value = bindparam(placeholder.group(1)) if placeholder else self.value
+            condition = field.any(value, operator=opdict[self.operator])
             return condition
 
         # Handle scalar values
@@ -193,6 +583,12 @@ class SQLAMixin(object):
                 # if operator is straing equals, check accordingly
                 elif self.operator == '==':
                     condition = lower_field.__eq__(lower_value)
+                # LIKE matches without lower() or ILIKE, so indexes can be used
+                elif match != 'ilike':
+                    condition = self._match_like(lower_field, lower_value, match)
+                # a placeholder is matched anywhere within the value, like a plain value
+                elif placeholder_re.match(value):
+                    condition = lower_field.contains(lower_value)
                 # otherwise, this operator maps to LIKE
                 # x=5   ->  x LIKE '%5%' (x contains 5)
                 # x=5*  ->  x LIKE '5%'  (x starts with 5)
@@ -223,29 +619,199 @@ class SQLAMixin(object):
         return condition
 
 
-    def _bind_and_lower_value(self, field):
+    def _filter_in(self, field, fieldtype, match, collation=None):
+        ''' Create the filter condition of an "in" or "not in" list of values
+
+        Values are cast to the field type, or taken as typed by the grammar schema, and
+        duplicates dropped.  Placeholders are compared one by one, and a "null" value
+        matches, or for "not in" excludes, NULL fields.
+
+        Parameters:
+            field (SQLA attribute):
+                SQLA instrumented attribute
+            fieldtype (object):
+                The python field type
+            match (str):
+                The string match strategy
+            collation (str):
+                The collation to compare string fields with, if any
+
+        Returns:
+            A SQL query filter condition
+        '''
+        if isinstance(field.type, postgresql.ARRAY):
+            raise BooleanParserException(f'Field {self.name} is an array, which does not '
+                                         f'support "{self.operator}" lists')
+
+        # the compared field, and values, for the string match strategy
+        lower = False
+        if fieldtype in ftypes:
+            lhs = field
+        elif collation:
+            lhs = field.collate(collation)
+        elif match in ('ilike', 'lower'):
+            lhs, lower = func.lower(field), True
+        else:
+            lhs = field
+
+        # nulls and placeholders are rare, so are looked for first
+        values = self.values
+        special = [v for v in values if v[:1] == ':' or (len(v) == 4 and v.lower() == 'null')]
+        null = False
+        binds = []
+        skip = set()
+        for value in special:
+            placeholder = placeholder_re.match(value)
+            if placeholder:
+                bound = bindparam(placeholder.group(1), type_=field.type)
+                binds.append(func.lower(bound) if lower else bound)
+                skip.add(value)
+            elif value.lower() == 'null':
+                null = True
+                skip.add(value)
+
+        # values typed by the grammar schema are used as is when they match the field type
+        datatype = cast_type(fieldtype)
+        typed = getattr(self, '_typed', None)
+        if typed is not None and typed[0] is datatype:
+            items = [t for v, t in zip(values, typed[1:]) if v not in skip] if skip else \
+                list(typed[1:])
+        else:
+            items = [v for v in values if v not in skip] if skip else list(values)
+            items = self._cast_values(items, datatype)
+        if lower:
+            items = [v.lower() for v in items]
+        items = list(dict.fromkeys(items))
+
+        negate = self.operator == 'not in'
+        terms = []
+        if items:
+            threshold = self.in_list_threshold
+            if threshold is not None and len(items) > threshold:
+                terms.append(InArray(lhs, items, negate=negate, key=self.fullname,
+                                     item_type=field.type))
+            else:
+                terms.append(lhs.not_in(items) if negate else lhs.in_(items))
+        terms.extend(lhs != bound if negate else lhs == bound for bound in binds)
+        if null:
+            terms.append(field.isnot(None) if negate else field.is_(None))
+        if len(terms) == 1:
+            return terms[0]
+        return and_(*terms) if negate else or_(*terms)
+
+    def _cast_values(self, values, datatype):
+        ''' Cast a list of string values to a python type, all at once when possible '''
+        if datatype is str:
+            return values
+        if datatype in (int, float):
+            try:
+                return list(map(datatype, values))
+            except ValueError:
+                # raise the error of the first invalid value
+                pass
+        return [self._cast_value(value, datatype=datatype) for value in values]
+
+    def _match_operands(self, field, match, collation=None):
+        ''' Return the field and bound values to compare for a string match strategy
+
+        Parameters:
+            field (SQLA attribute):
+                SQLA instrumented attribute of a string field
+            match (str):
+                The string match strategy, other than "ilike"
+            collation (str):
+                The collation to compare the field with, if any
+
+        Returns:
+            The field expression and the bound value and second value, if any
+        '''
+        values = []
+        for value in (self.value, self.value2):
+            if value is None:
+                values.append(None)
+                continue
+            placeholder = placeholder_re.match(value)
+            if placeholder:
+                bound = bindparam(placeholder.group(1), type_=field.type)
+                values.append(func.lower(bound) if match == 'lower' else bound)
+            else:
+                value = value.lower() if match == 'lower' else value
+                values.append(bindparam(self.fullname, value, unique=True))
+
+        if collation:
+            field = field.collate(collation)
+        elif match == 'lower':
+            field = func.lower(field)
+        return field, values[0], values[1]
+
+    def _match_like(self, field, bound, match):
+        ''' Return the LIKE condition of the "=" operator for a string match strategy
+
+        x=5   ->  x LIKE '%5%' (x contains 5), or x LIKE '5%' (x starts with 5) for "prefix"
+        x=5*  ->  x LIKE '5%'  (x starts with 5)
+        x=*5  ->  x LIKE '%5'  (x ends with 5)
+        '''
+        value = self.value
+        if placeholder_re.match(value):
+            return field.startswith(bound) if match == 'prefix' else field.contains(bound)
+
+        value = value.lower() if match == 'lower' else value
+        if value.find('*') >= 0:
+            pattern = value.replace('*', '%')
+        elif match == 'prefix':
+            pattern = value + '%'
+        else:
+            pattern = '%' + value + '%'
+        return field.like(bindparam(self.fullname, pattern, unique=True))
+
+    def _bind_and_lower_value(self, field, fieldtype=None):
         ''' Bind and lower the value based on field type'''
 
         lower_value_2 = None
 
         # get python field type
-        ftypes = [float, bool, int, decimal.Decimal, date, datetime]
-        fieldtype = field.type.python_type
+        fieldtype = fieldtype or field.type.python_type
 
-        # format the values
-        value, lower_field = self._format_value(self.value, fieldtype, field)
-        if hasattr(self, 'value2'):
-            value2, lower_field = self._format_value(self.value2, fieldtype, field)
+        # values typed by the grammar schema are used as is when they match the field type
+        typed = getattr(self, '_typed', None)
+        if typed is not None and typed[0] is not cast_type(fieldtype):
+            typed = None
 
-        # bind the parameter value to the parameter name
-        boundvalue = bindparam(self.fullname, value, unique=True)
+        # format and bind the values
+        boundvalue, lower_field = self._bind_value(self.value, fieldtype, field,
+                                                   typed[1] if typed else None)
         lower_value = func.lower(boundvalue) if fieldtype not in ftypes else boundvalue
-        if hasattr(self, 'value2'):
-            boundvalue2 = bindparam(self.fullname, value2, unique=True)
+        if self.value2 is not None:
+            boundvalue2, lower_field = self._bind_value(self.value2, fieldtype, field,
+                                                        typed[2] if typed else None)
             lower_value_2 = func.lower(boundvalue2) if fieldtype not in ftypes else boundvalue2
 
         return lower_field, lower_value, lower_value_2
 
+    def _bind_value(self, value, fieldtype, field, typed=None):
+        ''' Bind a value to the parameter name, or a placeholder to its own name
+
+        Placeholder values, e.g. ":xmin", become a bind parameter named "xmin" with the type
+        of the field, and no value, so the same SQL can be executed with many values, e.g.
+        with ``Query.params(xmin=5)``.  All other values are formatted for the field type,
+        unless already typed by the grammar schema, and bound to a unique parameter named by
+        the condition parameter.
+
+        Returns:
+            The bind parameter and the field, lowercased for string fields
+        '''
+        placeholder = placeholder_re.match(value)
+        if placeholder:
+            lower_field = field if fieldtype in ftypes else func.lower(field)
+            return bindparam(placeholder.group(1), type_=field.type), lower_field
+
+        if typed is not None:
+            lower_field = field if fieldtype in ftypes else func.lower(field)
+            return bindparam(self.fullname, typed, unique=True), lower_field
+
+        value, lower_field = self._format_value(value, fieldtype, field)
+        return bindparam(self.fullname, value, unique=True), lower_field
+
     def _format_value(self, value, fieldtype, field):
         ''' Formats the value based on the fieldtype
 
@@ -282,102 +848,10 @@ class SQLAMixin(object):
         return out_value, lower_field
 
 
-    def _to_bool(self, value):
-        """ Cast value to Boolean.
-
-        Parameters:
-            value (str):
-                The value to format
-
-        Returns:
-            True from inputs:
-              - "true"
-              - "t"
-              - "1"
-              - "yes"
-
-            False from inputs:
-              - "false"
-              - "f"
-              - "0"
-              - "no"
-        """
-        valid = {
-            "true": True,
-            "t": True,
-            "1": True,
-            "yes": True,
-            "false": False,
-            "f": False,
-            "0": False,
-            "no": False,
-        }
-
-        if isinstance(value, bool):
-            return value
-
-        if not isinstance(value, str):
-            raise ValueError("Invalid literal for boolean. Not a string or boolean.")
-
-        lower_value = value.lower()
-        if lower_value in valid:
-            return valid[lower_value]
-
-        else:
-            raise ValueError('Invalid literal for boolean: "%s"' % value)
-
-
-    def _to_date(self, value):
-        """ Cast value to Datetime.
-
-        Parameters:
-            value (str):
-                The value to format. Should be an ISO 8601 date string
-                such as '2011-11-04' or '2011-11-04T00:05:23'
-
-        Returns:
-            The value as an date object
-        """
-
-        if isinstance(value, date):
-            return value
-
-        if not isinstance(value, str):
-            raise ValueError("Invalid literal for date. Not a string or date.")
-
-        try:
-            # When casting to date, we don't care about time, so only take
-            # the first 10 characters of the string
-            dt = date.fromisoformat(value[:10])
-            return dt
-        except ValueError:
-            raise ValueError('Could not parse date from string: "%s"' % value)
-
-
-    def _to_datetime(self, value):
-        """ Cast value to Datetime.
-
-        Parameters:
-            value (str):
-                The value to format. Should be an ISO 8601 date string
-                such as '2011-11-04' or '2011-11-04T00:05:23'
-
-        Returns:
-            The value as a datetime object
-        """
-
-        if isinstance(value, datetime):
-            return value
-
-        if not isinstance(value, str):
-            raise ValueError("Invalid literal for datetime. Not a string or datetime.")
-
-        try:
-            dt = datetime.fromisoformat(value)
-            return dt
-        except ValueError:
-            raise ValueError('Could not parse datetime from string: "%s"' % value)
-
+    # the casts are shared with the grammar schema
+    _to_bool = staticmethod(to_bool)
+    _to_date = staticmethod(to_date)
+    _to_datetime = staticmethod(to_datetime)
 
     def _cast_value(self, value, datatype=float):
         ''' Cast a value to a specific Python type
@@ -391,22 +865,4 @@ class SQLAMixin(object):
         Returns:
             The value explicitly cast to an integer, float, boolean or datetime
         '''
-
-        assert datatype in [float, int, bool, date, datetime], 'datatype must be either float, int or bool'
-        try:
-            if value.lower() == 'null':
-                out = 'null'
-            elif datatype == bool:
-                out = self._to_bool(value)
-            elif datatype == date:
-                out = self._to_date(value)
-            elif datatype == datetime:
-                out = self._to_datetime(value)
-            else:
-                out = datatype(value)
-        except (ValueError, SyntaxError):
-            raise BooleanParserException(f'Field {self.name} expects a {datatype.__name__} value. Received {value} instead.')
-        else:
-            return out
-
-
+        return cast_value(value, datatype, name=self.name)
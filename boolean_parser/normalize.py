@@ -0,0 +1,216 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: normalize.py
+# Project: boolean_parser
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 6:21:37 pm
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 6:21:37 pm
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+import decimal
+import re
+
+from boolean_parser.actions.base import Node
+from boolean_parser.actions.boolean import BaseBool
+from boolean_parser.actions.clause import Condition
+
+
+# plain decimal numbers, as accepted by the condition value clause
+_number_re = re.compile(r'[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?\Z')
+
+# the side of a numeric range each operator bounds
+_range_sides = {'>': 'lower', '>=': 'lower', '<': 'upper', '<=': 'upper'}
+
+# the schema types of parameters whose values compare as numbers
+_numeric_types = (int, float, decimal.Decimal)
+
+
+def normalize(expression):
+    ''' Normalize a parsed expression into a simpler, equivalent expression
+
+    Rewrites a parsed expression, bottom-up, with the following rules:
+
+    - nested boolean clauses with the same operator are flattened, e.g.
+      "a and (b and c)" becomes "a and b and c"
+    - duplicate conditions and subtrees within an "and" or "or" are removed, keeping the first
+    - double negations are removed, e.g. "not (not a)" becomes "a"
+    - numeric bounds on the same parameter within an "and" are merged into the tightest bound,
+      e.g. "x > 1 and x > 3" becomes "x > 3", and within an "or" into the loosest bound,
+      e.g. "x < 1 or x < 3" becomes "x < 3"
+    - boolean clauses left with a single condition are replaced by that condition
+
+    Numeric bounds are only merged for conditions with plain decimal values, which are
+    compared exactly as numbers, as they are for numeric columns.  They are not merged for
+    parameters that the grammar schema types as non-numeric, e.g. strings, whose values
+    compare differently.  The input expression is not modified.  The boolean clauses of the
+    result are new, unfrozen objects of the same classes as in the input, while leaf
+    conditions are shared with the input.  The walk is iterative, so very deep expressions
+    are supported.
+
+    Parameters:
+        expression: object
+            A parsed expression
+
+    Returns:
+        The normalized expression
+
+    Example:
+        >>> from boolean_parser.parsers import Parser
+        >>> from boolean_parser.normalize import normalize
+        >>> normalize(Parser('(a > 1 and (b < 2 and a > 3)) and not not c == 1').parse())
+        and_(a>3, b<2, c==1)
+    '''
+    normalizer = _Normalizer()
+    results = {}
+    stack = [(expression, False)]
+    while stack:
+        node, visited = stack.pop()
+        if isinstance(node, BaseBool) and not visited:
+            stack.append((node, True))
+            stack.extend((condition, False) for condition in node.conditions)
+            continue
+        if id(node) not in results:
+            conditions = [results[id(c)] for c in node.conditions] \
+                if isinstance(node, BaseBool) else None
+            results[id(node)] = normalizer.node(node, conditions)
+    return results[id(expression)]
+
+
+class _Normalizer(object):
+    ''' Normalizes nodes, tracking a small integer key for each structurally distinct node '''
+
+    def __init__(self):
+        self._ids = {}
+        self._node_ids = {}
+
+    def key(self, node):
+        ''' Return the integer key of a normalized node '''
+        node_ids = self._node_ids
+        # find the keys of any nested conditions first, without recursion
+        stack = [node]
+        while stack:
+            current = stack[-1]
+            if id(current) in node_ids:
+                stack.pop()
+                continue
+            if isinstance(current, BaseBool):
+                pending = [c for c in current.conditions if id(c) not in node_ids]
+                if pending:
+                    stack.extend(pending)
+                    continue
+            stack.pop()
+            node_ids[id(current)] = self._new_key(current)
+        return node_ids[id(node)]
+
+    def _new_key(self, node):
+        ''' Assign the integer key of a node, once its conditions have keys '''
+        if isinstance(node, BaseBool):
+            key = (type(node), tuple(self._node_ids[id(c)] for c in node.conditions))
+        elif isinstance(node, Node):
+            key = node._intern_key()
+        else:
+            key = ('id', id(node))
+        try:
+            return self._ids.setdefault(key, len(self._ids))
+        except TypeError:
+            # unhashable parsed parameters
+            return self._ids.setdefault(('id', id(node)), len(self._ids))
+
+    def node(self, node, conditions):
+        ''' Normalize a node, given its already normalized conditions '''
+        if conditions is None:
+            return node
+
+        logicop = node.logicop
+        if logicop == 'not':
+            condition = conditions[0]
+            if isinstance(condition, BaseBool) and condition.logicop == 'not':
+                return condition.conditions[0]
+            return type(node)([['not', condition]])
+
+        if logicop not in ('and', 'or'):
+            return type(node)([_interleave(conditions, logicop)])
+
+        # flatten nested clauses with the same operator
+        flat = []
+        for condition in conditions:
+            if isinstance(condition, BaseBool) and condition.logicop == logicop:
+                flat.extend(condition.conditions)
+            else:
+                flat.append(condition)
+
+        # remove duplicates, keeping the first
+        seen = set()
+        unique = []
+        for condition in flat:
+            key = self.key(condition)
+            if key not in seen:
+                seen.add(key)
+                unique.append(condition)
+
+        merged = _merge_ranges(unique, logicop)
+        if len(merged) == 1:
+            return merged[0]
+        return type(node)([_interleave(merged, logicop)])
+
+
+def _interleave(conditions, logicop):
+    ''' Build the pyparsing-style token list, e.g. [a, 'and', b, 'and', c] '''
+    tokens = [conditions[0]]
+    for condition in conditions[1:]:
+        tokens.extend((logicop, condition))
+    return tokens
+
+
+def _bound(condition):
+    ''' Return the (side, number, strict) numeric bound of a condition, or None '''
+    if not isinstance(condition, Condition) or condition.value2 is not None:
+        return None
+    side = _range_sides.get(condition.operator)
+    if side is None or not _number_re.match(condition.value):
+        return None
+    value_type = condition.value_type
+    if value_type is not None and (value_type is bool or
+                                   not issubclass(value_type, _numeric_types)):
+        return None
+    # compared as decimals, which, unlike floats, are exact for any number of digits
+    return side, decimal.Decimal(condition.value), len(condition.operator) == 1
+
+
+def _tighter(bound, other):
+    ''' Whether a bound is strictly tighter than another bound on the same side '''
+    side, number, strict = bound
+    __, other_number, other_strict = other
+    if number == other_number:
+        return strict and not other_strict
+    return number > other_number if side == 'lower' else number < other_number
+
+
+def _merge_ranges(conditions, logicop):
+    ''' Merge numeric bounds on the same parameter and side '''
+    merged = []
+    kept = {}
+    for condition in conditions:
+        bound = _bound(condition)
+        if bound is None:
+            merged.append(condition)
+            continue
+
+        key = (type(condition), condition.fullname, bound[0])
+        if key not in kept:
+            kept[key] = (len(merged), bound)
+            merged.append(condition)
+            continue
+
+        # "and" keeps the tightest bound, "or" the loosest
+        idx, current = kept[key]
+        replace = _tighter(bound, current) if logicop == 'and' else _tighter(current, bound)
+        if replace:
+            kept[key] = (idx, bound)
+            merged[idx] = condition
+    return merged
@@ -0,0 +1,327 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: optimize.py
+# Project: boolean_parser
+# Author: Brian Cherinka
+# Created: Sunday, 18th October 2026 3:27:10 am
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Sunday, 18th October 2026 3:27:10 am
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+import decimal
+from collections import namedtuple
+from datetime import date, datetime
+
+from sqlalchemy import ARRAY, any_, bindparam
+from sqlalchemy.sql import and_, between, operators, or_
+from sqlalchemy.sql.elements import (BinaryExpression, BindParameter, BooleanClauseList,
+                                     ClauseList, ColumnClause)
+
+
+# the styles equalities on the same field can be collapsed into
+in_styles = ('in', 'any')
+
+# the types of bound values ranges are merged for, which compare the same in python and SQL
+_range_types = (int, float, decimal.Decimal, date, datetime)
+
+# the side and closedness of the bound given by each comparison operator
+_range_ops = {operators.gt: ('lower', False), operators.ge: ('lower', True),
+              operators.lt: ('upper', False), operators.le: ('upper', True)}
+
+# the boolean operators of SQLAlchemy clause lists, and the functions joining them
+_logicops = {operators.and_: 'and', operators.or_: 'or'}
+_joins = {'and': and_, 'or': or_}
+
+# a bound of a range, its bind parameter and whether the bound value is included
+_Bound = namedtuple('_Bound', ['bind', 'closed'])
+
+# an equality, with its bound value and original clause
+_Equal = namedtuple('_Equal', ['bind', 'term'])
+
+
+class _Range(namedtuple('_Range', ['lower', 'upper', 'term'])):
+    ''' A range of values, with a None lower or upper bound when unbounded
+
+    The term is the original clause of the range, or None for a merged range.
+    '''
+    __slots__ = ()
+
+
+def check_optimize(optimize):
+    ''' Check an optimize option, returning the style of its IN clauses, or None when off '''
+    if optimize is None or optimize is False:
+        return None
+    style = 'in' if optimize is True else optimize
+    assert style in in_styles, f'optimize must be True, False or one of {in_styles}'
+    return style
+
+
+def optimize(clause, in_style='in'):
+    ''' Rewrite an SQLAlchemy filter clause into a shorter, equivalent clause
+
+    Walks nested "and" and "or" clauses, bottom-up, and within each one:
+
+    - collapses equalities on the same field within an "or" into a single IN clause, e.g.
+      "x = 1 OR x = 2 OR x = 3" becomes "x IN (1, 2, 3)", or, with the "any" ``in_style``,
+      into "x = ANY(:array)", which binds a single array parameter on PostgreSQL
+    - merges ranges, i.e. <, <=, >, >= and BETWEEN comparisons, on the same field: within an
+      "and" into their intersection, and within an "or" into the union of overlapping
+      ranges, dropping the equalities they contain.  Merged ranges with both bounds
+      included become a single BETWEEN.
+
+    Only comparisons of a field with a bound value, as built by
+    :py:class:`~boolean_parser.mixins.sqla.SQLAMixin`, are rewritten.  Comparisons with
+    placeholders, i.e. named bind parameters without a value, with SQL functions of the
+    value, e.g. the ``lower()`` of case-insensitive string equalities, and with NULL are
+    kept as they are.  Ranges are only merged for numeric, date and datetime values, which
+    compare the same in python as in the database.  The bind parameters of kept
+    comparisons are reused, and the walk is iterative, so very deep clauses are supported.
+
+    Parameters:
+        clause: object
+            An SQLAlchemy filter clause, e.g. from ``SQLAParser(...).parse().filter(...)``
+        in_style: str
+            Either "in", for IN clauses with an expanding bind parameter, or "any", for
+            "= ANY(array)" comparisons, which are only supported by PostgreSQL
+
+    Returns:
+        The optimized clause
+
+    Example:
+        >>> from boolean_parser.parsers import SQLAParser
+        >>> from boolean_parser.optimize import optimize
+        >>> f = SQLAParser('table.x == 1 or table.x == 2 or table.x > 5').parse().filter(Table)
+        >>> print(optimize(f).compile(compile_kwargs={'literal_binds': True}))
+        table.x IN (1, 2) OR table.x > 5
+    '''
+    assert in_style in in_styles, f'in_style must be one of {in_styles}'
+    results = {}
+    stack = [(clause, False)]
+    while stack:
+        node, visited = stack.pop()
+        if isinstance(node, BooleanClauseList) and not visited:
+            stack.append((node, True))
+            stack.extend((term, False) for term in node.clauses)
+            continue
+        if id(node) in results:
+            continue
+        if isinstance(node, BooleanClauseList) and node.operator in _logicops:
+            logicop = _logicops[node.operator]
+            terms = merge_terms([results[id(term)] for term in node.clauses], logicop,
+                                in_style=in_style)
+            results[id(node)] = _joins[logicop](*terms)
+        else:
+            results[id(node)] = node
+    return results[id(clause)]
+
+
+def merge_terms(terms, logicop, in_style='in'):
+    ''' Merge the terms of an "and" or "or" clause, as done by :py:func:`optimize`
+
+    Parameters:
+        terms: list
+            The SQLAlchemy clauses joined by the boolean clause
+        logicop: str
+            The boolean operator, "and" or "or"
+        in_style: str
+            The style of IN clauses, "in" or "any"
+
+    Returns:
+        A list of the merged terms, in the order of the first term of each group
+    '''
+    if logicop not in _joins or len(terms) < 2:
+        return terms
+
+    # group the terms on the same field, keeping the position of the first of each group
+    slots = []
+    groups = {}
+    others = []
+    for term in terms:
+        kind, left, item = _classify(term)
+        if kind is None:
+            slots.append((None, term))
+            continue
+        key = _group_key(left, others)
+        if key not in groups:
+            groups[key] = (left, [], [])
+            slots.append((key, None))
+        groups[key][1 if kind == 'eq' else 2].append(item)
+
+    merged = []
+    for key, term in slots:
+        if key is None:
+            merged.append(term)
+            continue
+        left, equals, ranges = groups[key]
+        if len(equals) + len(ranges) < 2:
+            merged.extend(b.term for b in equals + ranges)
+        elif logicop == 'and':
+            merged.extend(b.term for b in equals)
+            merged.extend(_intersect(left, ranges))
+        else:
+            merged.extend(_union(left, equals, ranges, in_style))
+    return merged
+
+
+def _group_key(left, others):
+    ''' Return the key of the group of a field, comparing non-column fields by structure '''
+    if isinstance(left, ColumnClause):
+        # the same column may be annotated differently by each comparison
+        return ('column', id(left.table), left.key)
+    for idx, other in enumerate(others):
+        if other is left or other.compare(left):
+            return ('expression', idx)
+    others.append(left)
+    return ('expression', len(others) - 1)
+
+
+def _bound_value(bind, ranged=False):
+    ''' Whether a clause is a bind parameter with a value that can be merged '''
+    if not isinstance(bind, BindParameter) or not bind.unique or bind.expanding or \
+            bind.callable is not None or bind.value is None:
+        return False
+    return not ranged or (isinstance(bind.value, _range_types) and
+                          not isinstance(bind.value, bool))
+
+
+def _classify(term):
+    ''' Return the kind of a term, "eq" or "range", its field and its equality or range '''
+    if not isinstance(term, BinaryExpression):
+        return None, None, None
+    op = term.operator
+    if op is operators.eq and _bound_value(term.right):
+        return 'eq', term.left, _Equal(term.right, term)
+    if op in _range_ops and _bound_value(term.right, ranged=True):
+        side, closed = _range_ops[op]
+        bound = _Bound(term.right, closed)
+        rng = _Range(bound, None, term) if side == 'lower' else _Range(None, bound, term)
+        return 'range', term.left, rng
+    if op is operators.between_op and not term.modifiers.get('symmetric') and \
+            isinstance(term.right, ClauseList) and len(term.right.clauses) == 2 and \
+            all(_bound_value(b, ranged=True) for b in term.right.clauses):
+        lower, upper = term.right.clauses
+        return 'range', term.left, _Range(_Bound(lower, True), _Bound(upper, True), term)
+    return None, None, None
+
+
+def _tighter(bound, other, side):
+    ''' Whether a bound excludes more values than another bound on the same side '''
+    value, other_value = bound.bind.value, other.bind.value
+    if value == other_value:
+        return other.closed and not bound.closed
+    return value > other_value if side == 'lower' else value < other_value
+
+
+def _build(left, rng, joined=False):
+    ''' Return the terms of a range, joining them with "and" if asked '''
+    if rng.term is not None:
+        return [rng.term]
+    lower, upper = rng.lower, rng.upper
+    if lower and upper and lower.closed and upper.closed:
+        return [between(left, lower.bind, upper.bind)]
+    terms = []
+    if lower:
+        terms.append(left >= lower.bind if lower.closed else left > lower.bind)
+    if upper:
+        terms.append(left <= upper.bind if upper.closed else left < upper.bind)
+    return [and_(*terms)] if joined and len(terms) > 1 else terms
+
+
+def _intersect(left, ranges):
+    ''' Return the terms of the intersection of ranges on a field '''
+    if len(ranges) < 2:
+        return [rng.term for rng in ranges]
+    lower = upper = None
+    try:
+        for rng in ranges:
+            if rng.lower and (lower is None or _tighter(rng.lower, lower, 'lower')):
+                lower = rng.lower
+            if rng.upper and (upper is None or _tighter(rng.upper, upper, 'upper')):
+                upper = rng.upper
+    except TypeError:
+        # values of types that cannot be compared
+        return [rng.term for rng in ranges]
+    return _build(left, _Range(lower, upper, None))
+
+
+def _overlaps(rng, other):
+    ''' Whether a range overlaps, or touches, another range starting at or after it '''
+    if rng.upper is None or other.lower is None:
+        return True
+    value, other_value = rng.upper.bind.value, other.lower.bind.value
+    if value == other_value:
+        return rng.upper.closed or other.lower.closed
+    return value > other_value
+
+
+def _contains(rng, value):
+    ''' Whether a range contains a value '''
+    lower, upper = rng.lower, rng.upper
+    if lower and (value < lower.bind.value or (value == lower.bind.value and not lower.closed)):
+        return False
+    if upper and (value > upper.bind.value or (value == upper.bind.value and not upper.closed)):
+        return False
+    return True
+
+
+def _union(left, equals, ranges, in_style):
+    ''' Return the terms of the union of equalities and ranges on a field '''
+    try:
+        merged = _merge_ranges(ranges)
+        # a union of all values would drop the NULL check of the original comparisons
+        if not any(rng.lower is None and rng.upper is None for rng in merged):
+            ranges = merged
+        equals = [eq for eq in equals
+                  if not any(_contains(rng, eq.bind.value) for rng in ranges)]
+    except TypeError:
+        # values of types that cannot be compared
+        pass
+
+    terms = []
+    if len(equals) > 1:
+        values = [eq.bind.value for eq in equals]
+        try:
+            values = list(dict.fromkeys(values))
+        except TypeError:
+            pass
+        if in_style == 'any':
+            terms.append(left == any_(bindparam(None, values, type_=ARRAY(left.type))))
+        else:
+            terms.append(left.in_(values))
+    else:
+        terms.extend(eq.term for eq in equals)
+    for rng in ranges:
+        terms.extend(_build(left, rng, joined=True))
+    return terms
+
+
+def _merge_ranges(ranges):
+    ''' Merge overlapping ranges, in order of their lower bounds '''
+    if len(ranges) < 2:
+        return ranges
+
+    def lower_key(rng):
+        # unbounded first, then by value, with included bounds first
+        if rng.lower is None:
+            return (0, 0, 0)
+        return (1, rng.lower.bind.value, not rng.lower.closed)
+
+    ordered = sorted(ranges, key=lower_key)
+    merged = [ordered[0]]
+    for rng in ordered[1:]:
+        current = merged[-1]
+        if not _overlaps(current, rng):
+            merged.append(rng)
+            continue
+        if current.upper is None or rng.upper is None:
+            upper = None
+        else:
+            upper = rng.upper if _tighter(current.upper, rng.upper, 'upper') else current.upper
+        merged[-1] = _Range(current.lower, upper, None)
+
+    # keep the original ranges, in their original order, when none overlap
+    return ranges if len(merged) == len(ranges) else merged
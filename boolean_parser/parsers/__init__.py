@@ -12,6 +12,13 @@
 
 
 from __future__ import print_function, division, absolute_import
-from .base import Parser
-from .sqla import SQLAParser
+from .base import Grammar, Limits, Parser
+
+
+def __getattr__(name):
+    # import the SQLAlchemy parser, and sqlalchemy itself, only when first accessed
+    if name == 'SQLAParser':
+        from .sqla import SQLAParser
+        return SQLAParser
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
@@ -12,31 +12,532 @@
 
 
 from __future__ import print_function, division, absolute_import
-import copy
+import collections
+import contextlib
+import functools
+import hashlib
+import itertools
+import re
+import threading
+import time
 import six
 import pyparsing as pp
 from pyparsing import ParseException
 from boolean_parser.actions.boolean import BoolNot, BoolAnd, BoolOr
-from boolean_parser.clauses import condition, between_cond, words
-from boolean_parser.actions.clause import Condition, Word
+from boolean_parser.clauses import condition, between_cond, in_cond, words
+from boolean_parser.actions.clause import BaseAction, Condition, Word
+from boolean_parser.cache import DiskCache, ParseCache
+from boolean_parser.intern import InternTable
+from boolean_parser.parsers.fast import FastEngine
 
 
 class BooleanParserException(Exception):
     pass
 
 
+class ParseLimitExceeded(BooleanParserException):
+    ''' Raised when an input exceeds the complexity limits or time budget of a grammar '''
+    pass
+
+
+# available parsing engines
+engines = ('pyparsing', 'fast')
+
+# class attributes that define, or stage changes to, a parser grammar
+_default_names = ('_default_clauses', '_default_actions', '_bools')
+_staged_names = ('_clauses', '_clause_actions', '_clause')
+
+# guards building a parser grammar on first use
+_build_lock = threading.RLock()
+
+# packrat memoization is global to pyparsing, so only one parse may toggle it at a time
+_packrat_lock = threading.RLock()
+
+
+@contextlib.contextmanager
+def packrat(cache_size=128):
+    ''' Temporarily enable ``pyparsing`` packrat memoization
+
+    Packrat parsing memoizes the result of each grammar element at each input location,
+    which avoids re-parsing the same operands at every level of the
+    :py:func:`pyparsing.infixNotation` grammar.  ``pyparsing`` only supports packrat parsing
+    globally, so this context manager enables it, and on exit clears the memoization cache
+    and disables it again.  If packrat parsing was already enabled globally, e.g. by the
+    application, it is left untouched.
+
+    Entering the context is serialized with a lock, so only one packrat parse runs at a time.
+    The lock does not cover other parses: while the context is active, every ``pyparsing``
+    parse in the process, including un-memoized boolean_parser grammars and other libraries'
+    grammars running on other threads, is also memoized.  Their results are unchanged, but
+    they share the bounded memoization cache.
+
+    Parameters:
+        cache_size: int
+            The maximum number of memoized results.  Default is 128.
+
+    Example:
+        >>> from boolean_parser.parsers.base import packrat
+        >>> with packrat(cache_size=1024):
+        >>>     Parser.get_grammar().parser.parseString('((x > 1 and y < 2))')
+    '''
+    element = pp.ParserElement
+    with _packrat_lock:
+        if element._packratEnabled:
+            yield
+            return
+
+        element.enablePackrat(cache_size)
+        try:
+            yield
+        finally:
+            element.resetCache()
+            _disable_packrat()
+
+
+def _disable_packrat():
+    ''' Disable pyparsing packrat memoization '''
+    element = pp.ParserElement
+    if hasattr(element, 'disable_memoization'):
+        # pyparsing 3 has a public API to disable memoization
+        element.disable_memoization()
+    else:
+        # pyparsing 2 can only enable it, so undo what enablePackrat sets
+        element._parse = element._parseNoCache
+        element._packratEnabled = False
+
+
+# the tokens that the complexity limits count; quoted strings are matched to skip their contents,
+# and the lookahead quickly skips positions that cannot start a token
+_limit_re = re.compile(r'(?=["()aAoOnNbB])(?:"[^"\n\r]*"|\(|\)|\b(?:and|or|not|between)\b)',
+                       re.IGNORECASE)
+
+
+class Limits(collections.namedtuple('Limits', ['max_length', 'max_depth', 'max_terms',
+                                               'timeout'])):
+    ''' Complexity limits and a time budget for parsing untrusted input
+
+    The length, nesting depth and number of terms of an input are checked with a single
+    cheap scan before parsing, and the time budget is checked while ``pyparsing`` parses,
+    so abusive inputs are rejected before they tie up a worker.  Any limit left as None is
+    not checked.  Exceeded limits raise :py:class:`ParseLimitExceeded`.
+
+    The nesting depth counts each open parenthesis and each "not" applied to the same
+    operand.  The number of terms counts the conditions joined by "and" or "or".  Both
+    are counted without fully tokenizing the input, so keywords within unquoted values or
+    names are also counted.
+
+    Parameters:
+        max_length: int
+            The maximum number of characters in an input
+        max_depth: int
+            The maximum nesting depth of an input
+        max_terms: int
+            The maximum number of conditions in an input
+        timeout: float
+            The maximum time, in seconds, to spend parsing an input with ``pyparsing``
+
+    Example:
+        >>> from boolean_parser.parsers import Parser
+        >>> from boolean_parser.parsers.base import Limits
+        >>> Parser.build_parser(limits=Limits(max_length=1000, max_depth=5, timeout=0.5))
+        >>> Parser('((((((x > 1))))))').parse()
+        ParseLimitExceeded: input nesting depth 6 exceeds the limit of 5
+    '''
+    __slots__ = ()
+
+    def __new__(cls, max_length=None, max_depth=None, max_terms=None, timeout=None):
+        for limit in (max_length, max_depth, max_terms, timeout):
+            assert limit is None or limit > 0, 'limits must be positive numbers or None'
+        return super(Limits, cls).__new__(cls, max_length, max_depth, max_terms, timeout)
+
+    def check(self, value):
+        ''' Check an input against the length, depth and term limits
+
+        Parameters:
+            value: str
+                The string expression to check
+
+        Raises:
+            ParseLimitExceeded: when the input exceeds a limit
+        '''
+        if self.max_length is not None and len(value) > self.max_length:
+            raise ParseLimitExceeded(f'input length {len(value)} exceeds the limit of '
+                                     f'{self.max_length}')
+        if self.max_depth is None and self.max_terms is None:
+            return
+
+        depth = max_depth = parens = nots = 0
+        terms = 1
+        last = 0
+        for mm in _limit_re.finditer(value):
+            token = mm.group().lower()
+            if value[last:mm.start()].strip():
+                # an operand ends any chain of nots
+                nots = 0
+            last = mm.end()
+            if token == '(':
+                parens += 1
+            elif token == ')':
+                parens -= 1
+                nots = 0
+            elif token == 'not':
+                nots += 1
+            elif token in ('and', 'or'):
+                terms += 1
+                nots = 0
+            elif token == 'between':
+                # the "and" of a between condition does not join terms
+                terms -= 1
+            else:
+                nots = 0
+            depth = parens + nots
+            if depth > max_depth:
+                max_depth = depth
+                if self.max_depth is not None and max_depth > self.max_depth:
+                    raise ParseLimitExceeded(f'input nesting depth {max_depth} exceeds the '
+                                             f'limit of {self.max_depth}')
+
+        if self.max_terms is not None and terms > self.max_terms:
+            raise ParseLimitExceeded(f'input has {terms} terms, exceeding the limit of '
+                                     f'{self.max_terms}')
+
+
+class Grammar(object):
+    ''' An immutable, compiled boolean parser grammar
+
+    Compiles a set of clauses, clause actions, and boolean classes into a ``pyparsing``
+    :py:func:`pyparsing.infixNotation` grammar, and a hand-written fast engine when the clauses
+    support it.  The clauses are copied before actions are attached, so the input clause elements
+    are never modified.  Once built, a grammar cannot be modified, and :py:meth:`parse` does not
+    store any state, so a single grammar can be shared by any number of ``Parser`` instances and
+    threads.  Differently configured grammars can also be used side by side with the same
+    ``Parser`` class by passing them to the ``grammar`` keyword argument of ``Parser``.
+
+    Packrat parsing, if enabled, is global to ``pyparsing``, so parses with packrat enabled are
+    serialized with a lock.  See :py:func:`packrat`.
+
+    Inputs are checked against the grammar :py:class:`Limits` before parsing.  Inputs nested
+    too deeply for ``pyparsing`` to parse within the Python recursion limit raise
+    :py:class:`ParseLimitExceeded`, whether or not limits are set.
+
+    With a :py:class:`~boolean_parser.schema.Schema`, the values of each parsed condition are
+    cast to the type of their parameter once, after parsing, and invalid values are rejected.
+
+    Parameters:
+        clauses: list
+            A list of pyparsing clause elements
+        actions: list
+            A list of actions to attach to each clause element.  Use None to leave a clause
+            element unchanged.
+        bools: list
+            A list of Boolean classes to use to handle boolean "not", "and", and "or" logic
+        engine: str
+            The default parsing engine, either "pyparsing" or "fast"
+        packrat: bool|int
+            If True, or a maximum memoization cache size, enables packrat parsing.
+            True uses a cache size of 128.
+        keep_parse_results: bool
+            If True, actions deriving from ``BaseAction`` keep the raw ``pyparsing.ParseResults``
+            as their ``parsed_clause`` attribute.  This uses much more memory, and disables
+            the fast engine, which does not produce them.
+        limits: :py:class:`Limits`
+            The complexity limits and time budget for each parse.  Default is no limits.
+        schema: :py:class:`~boolean_parser.schema.Schema`
+            The types of the parameter values.  Default is to keep all values as strings.
+
+    Attributes:
+        clauses: tuple
+            The copied clause elements, with actions attached
+        actions: tuple
+            The actions attached to each clause element
+        bools: tuple
+            The boolean classes
+        clause: :py:class:`pyparsing.MatchFirst`
+            The single clause element merged from all clauses
+        parser: :py:class:`pyparsing.ParserElement`
+            The compiled ``pyparsing`` boolean expression grammar
+        fast_engine: :py:class:`~boolean_parser.parsers.fast.FastEngine`
+            The hand-written engine for the grammar, or None if not supported
+        engine: str
+            The default parsing engine
+        packrat: int
+            The packrat memoization cache size, or None if disabled
+        keep_parse_results: bool
+            Whether parsed actions keep the raw ``pyparsing`` results
+        limits: :py:class:`Limits`
+            The complexity limits and time budget for each parse
+        schema: :py:class:`~boolean_parser.schema.Schema`
+            The types of the parameter values, or None
+        version: str
+            A hash of the package version, the clauses, actions and boolean classes, and the
+            schema, which is the same in every process, used to key persistent caches
+
+    Example:
+        >>> from boolean_parser.parsers.base import Grammar
+        >>> from boolean_parser.clauses import condition
+        >>> from boolean_parser.actions.clause import Condition
+        >>> grammar = Grammar([condition], actions=[Condition], engine='fast')
+        >>> grammar.parse('x > 1 and y < 2')
+        and_(x>1, y<2)
+    '''
+    _frozen = False
+
+    def __init__(self, clauses, actions=None, bools=None, engine='pyparsing', packrat=False,
+                 keep_parse_results=False, limits=None, schema=None):
+        assert isinstance(clauses, (list, tuple)) and clauses, 'a list of clauses must be provided'
+        actions = list(actions) if actions else [None] * len(clauses)
+        assert len(clauses) == len(actions), 'clauses and actions must be the same length'
+        bools = tuple(bools or (BoolNot, BoolAnd, BoolOr))
+        assert len(bools) == 3, 'there must be a set of "not, and, or" boolean precedent classes'
+        assert engine in engines, f'engine must be one of {engines}'
+        assert packrat is not None and int(packrat) >= 0, 'packrat must be a bool or positive int'
+        limits = limits if limits is not None else Limits()
+        assert isinstance(limits, Limits), 'limits must be a Limits instance'
+        if schema is not None:
+            from boolean_parser.schema import Schema
+            assert isinstance(schema, Schema), 'schema must be a Schema instance'
+            # an empty schema types nothing
+            schema = schema if schema or schema.strict else None
+
+        # copy the clauses and attach the actions to the copies
+        copies = []
+        for idx, (clause, action) in enumerate(zip(clauses, actions)):
+            clause = clause.copy()
+            if action is not None:
+                action = list(action) if isinstance(action, (list, tuple)) else [action]
+                clause.setParseAction(*[_keep_results(a) if keep_parse_results else a
+                                        for a in action])
+                actions[idx] = action
+            copies.append(clause)
+
+        self.clauses = tuple(copies)
+        self.actions = tuple(actions)
+        self.bools = bools
+        self.clause = pp.MatchFirst(copies)
+
+        # assign the combined clause to the recursive token pattern matcher
+        where_exp = pp.Forward()
+        where_exp <<= self.clause
+
+        # every operand is matched through where_exp, so check the time budget there; debug
+        # actions run even during lookahead, unlike parse actions
+        self._deadline = threading.local()
+        if limits.timeout is not None:
+            where_exp.setDebugActions(self._check_deadline, _ignore, _ignore)
+
+        # build the expression parser
+        bnot, band, bor = bools
+        parser = pp.infixNotation(where_exp, [
+            (pp.CaselessLiteral("not"), 1, pp.opAssoc.RIGHT, bnot),
+            (pp.CaselessLiteral("and"), 2, pp.opAssoc.LEFT, band),
+            (pp.CaselessLiteral("or"), 2, pp.opAssoc.LEFT, bor),
+        ])
+        # pyparsing streamlines on the first parse; do it now so parsing never mutates the grammar
+        parser.streamline()
+        self.parser = parser
+
+        # prepare the hand-written engine, if the clauses support it
+        self.fast_engine = None if keep_parse_results else \
+            FastEngine.from_clauses(copies, actions, bools)
+        self.engine = engine
+        self.packrat = 128 if packrat is True else (int(packrat) or None)
+        self.keep_parse_results = bool(keep_parse_results)
+        self.limits = limits
+        self.schema = schema
+        self.version = _grammar_version(copies, actions, bools, schema)
+        self._frozen = True
+
+    def __setattr__(self, name, value):
+        if self._frozen:
+            raise AttributeError('a Grammar cannot be modified once built')
+        super(Grammar, self).__setattr__(name, value)
+
+    def __repr__(self):
+        return (f'<Grammar(clauses={len(self.clauses)}, engine={self.engine!r}, '
+                f'fast={self.fast_engine is not None}, packrat={self.packrat})>')
+
+    def parse(self, value, engine=None):
+        ''' Parse a string expression
+
+        Parses with the hand-written fast engine, if selected and supported, falling back
+        to ``pyparsing``.  This method is re-entrant and thread-safe.
+
+        Parameters:
+            value: str
+                The string expression to parse
+            engine: str
+                The parsing engine to use.  Defaults to the grammar ``engine``.
+
+        Returns:
+            The parsed expression
+
+        Raises:
+            BooleanParserException: when the input has a syntax error, or a value does not
+                match the grammar schema
+            ParseLimitExceeded: when the input exceeds the grammar limits
+        '''
+        self.limits.check(value)
+        expression = self._parse(value, engine or self.engine)
+        if self.schema is not None:
+            self.schema.apply(expression)
+        return expression
+
+    def _parse(self, value, engine):
+        ''' Parse a string expression with an engine, without checking limits or typing values '''
+        if engine == 'fast' and self.fast_engine is not None:
+            expression = self.fast_engine.parse(value)
+            if expression is not None:
+                return expression
+
+        timeout = self.limits.timeout
+        previous = getattr(self._deadline, 'value', None)
+        self._deadline.value = time.perf_counter() + timeout if timeout is not None else None
+        try:
+            if self.packrat:
+                with packrat(self.packrat):
+                    return self.parser.parseString(value)[0]
+            return self.parser.parseString(value)[0]
+        except ParseException as e:
+            raise BooleanParserException("Parsing syntax error ({0}) at line:{1}, "
+                                         "col:{2}".format(e.markInputline(), e.lineno, e.col))
+        except RecursionError:
+            raise ParseLimitExceeded('input is nested too deeply to parse') from None
+        finally:
+            self._deadline.value = previous
+
+    def _check_deadline(self, *args):
+        ''' Abort the current parse once it exceeds the time budget '''
+        deadline = getattr(self._deadline, 'value', None)
+        if deadline is not None and time.perf_counter() > deadline:
+            raise ParseLimitExceeded(f'parsing exceeded the time budget of '
+                                     f'{self.limits.timeout} s')
+
+
+def _ignore(*args):
+    ''' A no-op ``pyparsing`` debug action, replacing the default that prints '''
+    pass
+
+
+def _grammar_version(clauses, actions, bools, schema=None):
+    ''' Hash the package version, the clauses, actions and boolean classes, and the schema '''
+    from boolean_parser import __version__
+
+    parts = [__version__] + [str(clause) for clause in clauses]
+    for action in actions:
+        parts.append(','.join(_qualified_name(a) for a in action or ()))
+    parts.extend(_qualified_name(b) for b in bools)
+    if schema is not None:
+        parts.append(f'strict={schema.strict}')
+        parts.extend(f'{name}={_qualified_name(pytype)}'
+                     for name, pytype in sorted(schema.items()))
+    return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()
+
+
+def _qualified_name(obj):
+    ''' The module and qualified name of a class or function, else its repr '''
+    if hasattr(obj, '__qualname__'):
+        return f'{obj.__module__}:{obj.__qualname__}'
+    return repr(obj)
+
+
+def _keep_results(action):
+    ''' Wrap a BaseAction class so it keeps the raw pyparsed results '''
+    if isinstance(action, type) and issubclass(action, BaseAction):
+        return functools.partial(action, keep_parse_results=True)
+    return action
+
+
+class _GrammarAttribute(object):
+    ''' A Parser class attribute read from the compiled class grammar
+
+    Keeps the ``_parser``, ``_clause``, ``_clauses``, and ``_clause_actions`` class
+    attributes of older versions available, building the grammar on first access.
+    Clauses are returned as copies, so they can be modified and passed to ``build_parser``
+    without changing the compiled grammar.
+    '''
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        value = getattr(owner.get_grammar(), self.name)
+        if self.name == 'clauses':
+            return [clause.copy() for clause in value]
+        return list(value) if isinstance(value, tuple) else value
+
+
+def _parse_chunk(parser_class, values, engine=None):
+    ''' Parse a list of strings, returning the expression or exception for each
+
+    Module-level so it can be sent to worker processes by ``Parser.parse_many``.
+    '''
+    results = []
+    parser = parser_class(engine=engine)
+    for value in values:
+        if not isinstance(value, six.string_types):
+            results.append(_invalid_input(value))
+            continue
+        try:
+            results.append(parser.parse(value))
+        except BooleanParserException as e:
+            results.append(e)
+        except AssertionError as e:
+            # actions reject some parsed clauses, e.g. names with more than one ".", with
+            # assertions, which are reported in place like any other invalid input
+            error = BooleanParserException(f'invalid input {value!r}: {e}')
+            error.__cause__ = e
+            results.append(error)
+    return results
+
+
+def _invalid_input(value):
+    ''' The per-item error for a ``Parser.parse_many`` input that is not a string '''
+    return BooleanParserException(f'input must be a string, not {type(value).__name__}')
+
+
 class Parser(object):
     ''' Core Parser class for parsing strings into objects
 
     A core Parser class that can parse strings into a set of objects
     based on a defined set of string clause elements, and actions to perform
-    for each clause.
+    for each clause.  Each Parser class has a compiled :py:class:`Grammar`, built
+    from the default clauses and actions the first time the class is used to parse,
+    unless it has already been built with ``build_parser``.  Subclasses use the grammar
+    of their parent class, unless they define their own default clauses, actions, or
+    boolean classes, or are built with ``build_parser``.  A different grammar
+    can be used by a single Parser instance with the ``grammar`` keyword argument.
+
+    Parser instances only store the result of parsing their own input.  Calling
+    ``parse`` with a new value returns the result without modifying the instance,
+    so a single Parser can be shared between threads.
+
+    Parameters:
+        value: str
+            The string expression to parse
+        engine: str
+            The parsing engine to use, either "pyparsing" or "fast".  The "fast" engine is a
+            hand-written parser for the built-in ``condition``, ``between_cond``, ``in_cond``,
+            and ``words`` clauses, and falls back to ``pyparsing`` for custom clauses or any
+            input it does not support.  Defaults to the engine of the grammar.
+        grammar: :py:class:`Grammar`
+            A compiled grammar to use instead of the class grammar
     '''
     _bools = [BoolNot, BoolAnd, BoolOr]
-    _clauses = []
-    _clause = None
+    _default_clauses = [condition, between_cond, in_cond, words]
+    _default_actions = [Condition, Condition, Condition, Word]
+    _clauses = _GrammarAttribute('clauses')
+    _clause_actions = _GrammarAttribute('actions')
+    _clause = _GrammarAttribute('clause')
+    _parser = _GrammarAttribute('parser')
+    _cache = None
+    _disk_cache = None
+    _intern_table = None
 
-    def __init__(self, value=None):
+    def __init__(self, value=None, engine=None, grammar=None):
+        assert engine is None or engine in engines, f'engine must be one of {engines}'
+        assert grammar is None or isinstance(grammar, Grammar), 'grammar must be a Grammar'
+        self.grammar = grammar or self.get_grammar()
+        self.engine = engine or self.grammar.engine
         self.original_input = value
         self._expression = None
 
@@ -55,17 +556,19 @@ class Parser(object):
         ''' The extracted conditions from the parsed string '''
         if isinstance(self._expression, Condition):
             return self._expression if self._expression else None
-        return self._expression.conditions if self._expression else None
+        return list(self._expression.conditions) if self._expression else None
 
     def parse(self, value=None):
         ''' Parse a string conditional
 
         Calls ``parseString`` on the ``pyparsing`` clause element to parse the
-        input string into a ``pyparsing.ParseResults`` object.
+        input string into a ``pyparsing.ParseResults`` object.  Without a ``value``,
+        parses the parser's own input and stores the result on the parser.  Otherwise
+        only returns the result for the new value.
 
         Parameters:
             value: str
-                The string expression to parse
+                The string expression to parse.  Defaults to the original input.
 
         Returns:
             A pyparsing.ParseResults object
@@ -77,25 +580,413 @@ class Parser(object):
             >>> x>1
         '''
 
-        value = value or self.original_input
+        own_input = value is None
+        value = self.original_input if own_input else value
         assert value is not None, 'There must be some input to parse'
         assert isinstance(value, six.string_types), 'input must be a string'
 
-        try:
-            expression = self._parser.parseString(value)[0]
-        except ParseException as e:
-            raise BooleanParserException("Parsing syntax error ({0}) at line:{1}, "
-                                         "col:{2}".format(e.markInputline(), e.lineno, e.col))
-        else:
+        expression = self._parse_cached(value)
+        if own_input:
             self._expression = expression
-            self.original_input = value
-            return expression
+        return expression
+
+    def _parse_cached(self, value):
+        ''' Parse a string with the parser grammar, using the class parse cache if enabled '''
+        cache = self._get_cache()
+        if cache is None:
+            return self._parse_stored(value)
+
+        key = (self.grammar, value)
+        expression = cache.get(key)
+        if expression is None:
+            expression = self._parse_stored(value)
+            # cached expressions are shared by all callers so must be immutable
+            if hasattr(expression, 'freeze'):
+                expression.freeze()
+            cache.set(key, expression)
+        return expression
+
+    def _parse_stored(self, value):
+        ''' Parse a string with the parser grammar, using the class disk cache if enabled '''
+        disk = type(self).__dict__.get('_disk_cache')
+        if disk is None or self.grammar.keep_parse_results:
+            return self._intern(self.grammar.parse(value, engine=self.engine))
+
+        from boolean_parser.serialize import dumps, loads
+
+        # stored expressions were checked against the limits of the process that stored them
+        self.grammar.limits.check(value)
+        name = f'{type(self).__module__}.{type(self).__qualname__}'
+        data = disk.get(name, self.grammar.version, value)
+        if data is not None:
+            try:
+                expression = loads(data)
+            except BooleanParserException:
+                # e.g. data written by another serialization version
+                pass
+            else:
+                # typed values are not stored, so are cast again
+                if self.grammar.schema is not None:
+                    self.grammar.schema.apply(expression)
+                return self._intern(expression)
+
+        expression = self._intern(self.grammar.parse(value, engine=self.engine))
+        try:
+            disk.set(name, self.grammar.version, value, dumps(expression, binary=True))
+        except BooleanParserException:
+            # expressions with nodes that cannot be serialized are not stored
+            pass
+        return expression
+
+    @classmethod
+    def _intern(cls, expression):
+        ''' Intern a parsed expression, if interning is enabled on this class '''
+        table = cls.__dict__.get('_intern_table')
+        return table.intern(expression) if table is not None else expression
 
     def __repr__(self):
         return f'<Parser(input="{self.original_input or ""}")>'
 
     @classmethod
-    def build_parser(cls, clauses=None, actions=None, bools=None):
+    def parse_many(cls, values, workers=None, chunksize=100, lazy=False, engine=None):
+        ''' Parse many string expressions, optionally across a pool of processes
+
+        Duplicate input strings are only parsed once, and share the same expression
+        object in the returned results.  Shared expressions are frozen, so they cannot be
+        modified through one position and silently change another.  The unique strings are
+        split into chunks of ``chunksize`` and parsed in ``workers`` processes, using
+        :py:class:`concurrent.futures.ProcessPoolExecutor`, or in the current process if
+        ``workers`` is None or 1.  Results are returned in the same order as the input.  An
+        input that fails to parse, or is not a string, produces a ``BooleanParserException``
+        in place of an expression rather than stopping the batch.
+
+        When ``lazy`` is True, a generator is returned instead of a list.  Inputs are then
+        consumed in batches of ``chunksize * workers`` strings and only de-duplicated within
+        each batch, so memory stays flat for very large, or unbounded, inputs.
+
+        Worker processes build the default class grammar on first use.  When using a custom
+        grammar built at runtime with ``build_parser``, use a "fork" multiprocessing start method
+        so the workers inherit it.
+
+        Parameters:
+            values: iterable
+                The string expressions to parse
+            workers: int
+                The number of worker processes.  Default is to parse in this process.
+            chunksize: int
+                The number of unique strings sent to a worker at a time.  Default is 100.
+            lazy: bool
+                If True, return a generator of results.  Default is False.
+            engine: str
+                The parsing engine to use, either "pyparsing" or "fast"
+
+        Returns:
+            A list, or generator, of parsed expressions or ``BooleanParserException`` objects
+
+        Example:
+            >>> from boolean_parser.parsers import Parser
+            >>> Parser.parse_many(['x > 1', 'y < 2', 'x > 1', '> x'], workers=2)
+            [x>1, y<2, x>1, BooleanParserException('Parsing syntax error ...')]
+        '''
+        assert isinstance(chunksize, int) and chunksize > 0, 'chunksize must be a positive integer'
+        assert workers is None or workers > 0, 'workers must be a positive integer'
+
+        if lazy:
+            return cls._iparse_many(values, workers, chunksize, engine)
+
+        values = list(values)
+        with cls._chunk_pool(workers) as pool:
+            return cls._parse_batch(values, pool, chunksize, engine)
+
+    @classmethod
+    def _iparse_many(cls, values, workers, chunksize, engine):
+        ''' Generator version of ``parse_many``, parsing one batch of inputs at a time '''
+        values = iter(values)
+        batchsize = chunksize * (workers or 1)
+        with cls._chunk_pool(workers) as pool:
+            while True:
+                batch = list(itertools.islice(values, batchsize))
+                if not batch:
+                    return
+                for result in cls._parse_batch(batch, pool, chunksize, engine):
+                    yield result
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _chunk_pool(workers):
+        ''' A process pool for ``workers`` > 1, otherwise None to parse in-process '''
+        if not workers or workers == 1:
+            yield None
+            return
+        # multiprocessing is only imported when needed to keep startup fast
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            yield pool
+
+    @classmethod
+    def _parse_batch(cls, values, pool, chunksize, engine):
+        ''' Parse the unique strings in a list, and map the results back in input order '''
+        counts = collections.Counter(value for value in values
+                                     if isinstance(value, six.string_types))
+        unique = list(counts)
+        chunks = [unique[i:i + chunksize] for i in range(0, len(unique), chunksize)]
+        if pool is None:
+            parsed = [_parse_chunk(cls, chunk, engine) for chunk in chunks]
+        else:
+            parsed = pool.map(_parse_chunk, itertools.repeat(cls), chunks,
+                              itertools.repeat(engine))
+        results = dict(zip(unique, itertools.chain.from_iterable(parsed)))
+
+        # results from worker processes are interned in this process
+        if pool is not None and cls.__dict__.get('_intern_table') is not None:
+            results = {value: result if isinstance(result, Exception) else cls._intern(result)
+                       for value, result in results.items()}
+
+        # expressions shared by duplicate inputs must be immutable
+        for value, count in counts.items():
+            if count > 1 and hasattr(results[value], 'freeze'):
+                results[value].freeze()
+        return [results[value] if isinstance(value, six.string_types) else _invalid_input(value)
+                for value in values]
+
+    @classmethod
+    def typeahead(cls):
+        ''' Return an incremental parser for expressions that are still being typed
+
+        See :py:class:`~boolean_parser.typeahead.Typeahead`.
+
+        Returns:
+            A new ``Typeahead`` using the current grammar of this class
+
+        Example:
+            >>> from boolean_parser.parsers import Parser
+            >>> typeahead = Parser.typeahead()
+            >>> typeahead.update('x > 1 an').prefix
+            'an'
+        '''
+        from boolean_parser.typeahead import Typeahead
+        return Typeahead(cls)
+
+    @classmethod
+    def warm_up(cls, corpus, models=None, progress=None, background=True):
+        ''' Pre-parse a corpus of expressions into the parse caches of this class
+
+        See :py:class:`~boolean_parser.warmup.Warmup`.  A parse cache or disk cache
+        must be enabled on this class.
+
+        Parameters:
+            corpus: str | iterable
+                The path to a file with one expression per line, or an iterable of expressions
+            models: list
+                SQLAlchemy models to build the filter of each expression against, if any
+            progress: callable
+                A function called with a ``WarmupReport`` as the warm-up progresses
+            background: bool
+                If True, warms up in a background thread.  Default is True.
+
+        Returns:
+            The ``Warmup``, whose ``report`` gives the progress and timing
+
+        Example:
+            >>> from boolean_parser.parsers import Parser
+            >>> Parser.enable_cache(maxsize=10000)
+            >>> warmup = Parser.warm_up('popular.txt')
+            >>> warmup.join().parsed
+            250
+        '''
+        from boolean_parser.warmup import Warmup
+        warmup = Warmup(cls, models=models, progress=progress)
+        if background:
+            return warmup.start(corpus)
+        warmup.run(corpus)
+        return warmup
+
+    @classmethod
+    def get_grammar(cls):
+        ''' Return the compiled grammar of this class, building the default grammar if needed
+
+        The grammar is inherited from the nearest parent class that has one, unless a class
+        in between defines its own default clauses, actions, or boolean classes.  In that
+        case, the default grammar is built for that class.
+
+        Returns:
+            The class :py:class:`Grammar`
+        '''
+        grammar, owner = cls._find_grammar()
+        if grammar is None:
+            with _build_lock:
+                grammar, owner = cls._find_grammar()
+                if grammar is None:
+                    owner.build_parser()
+                    grammar = owner.__dict__['_grammar']
+        return grammar
+
+    @classmethod
+    def _find_grammar(cls):
+        ''' Find the nearest built grammar, or else the class that owns the default grammar
+
+        Returns:
+            A tuple of the grammar, or None, and the class it belongs to
+        '''
+        for klass in cls.__mro__:
+            grammar = klass.__dict__.get('_grammar')
+            if grammar is not None:
+                return grammar, klass
+            if any(name in klass.__dict__ for name in _default_names):
+                return None, klass
+        return None, cls
+
+    @classmethod
+    def _get_cache(cls):
+        ''' Return the parse cache enabled on this specific class, if any '''
+        return cls.__dict__.get('_cache')
+
+    @classmethod
+    def enable_cache(cls, maxsize=1024):
+        ''' Enable an LRU cache of parsed expressions on this parser class
+
+        Once enabled, ``parse`` returns a previously parsed expression for any
+        input string it has already seen with the current grammar, skipping the
+        ``pyparsing`` grammar entirely.  Cached expressions are frozen, i.e. made
+        immutable, since they are shared by all callers.  The cache is specific to
+        the class it is enabled on; enabling it on ``Parser`` does not enable it
+        for subclasses such as ``SQLAParser``.  Calling this again replaces the
+        existing cache with an empty one.
+
+        Parameters:
+            maxsize: int
+                The maximum number of parsed expressions to keep.  Default is 1024.
+
+        Example:
+            >>> from boolean_parser.parsers import Parser
+            >>> Parser.enable_cache(maxsize=5000)
+            >>> Parser('x > 1').parse()
+            >>> Parser.cache_info()
+            CacheInfo(hits=1, misses=1, evictions=0, maxsize=5000, currsize=1)
+        '''
+        cls._cache = ParseCache(maxsize=maxsize)
+
+    @classmethod
+    def disable_cache(cls):
+        ''' Disable and discard the parse cache on this parser class '''
+        cls._cache = None
+
+    @classmethod
+    def clear_cache(cls):
+        ''' Remove all cached expressions and reset the cache statistics '''
+        cache = cls._get_cache()
+        if cache is not None:
+            cache.clear()
+
+    @classmethod
+    def cache_info(cls):
+        ''' Return the hits, misses, evictions and size of the parse cache
+
+        Returns:
+            A ``CacheInfo`` named tuple, or None if caching is not enabled
+        '''
+        cache = cls._get_cache()
+        return cache.info() if cache is not None else None
+
+    @classmethod
+    def enable_disk_cache(cls, path, max_bytes=2 ** 28):
+        ''' Enable a persistent cache of parsed expressions on this parser class
+
+        Once enabled, ``parse`` looks up input strings in a
+        :py:class:`~boolean_parser.cache.DiskCache`, a SQLite database that is shared by every
+        process using the same file, e.g. all the workers of a web server, and is kept across
+        restarts.  Expressions are stored with :py:func:`~boolean_parser.serialize.dumps`,
+        keyed by the parser class, the grammar version and the input string, so expressions
+        stored for an old grammar are never used once the clauses or actions change.  Inputs
+        are still checked against the grammar limits.  The disk cache is not used with grammars
+        that keep the raw ``pyparsing`` results.
+
+        The disk cache is looked up after the in-memory parse cache, if that is also enabled.
+        Like the parse cache, the disk cache is specific to the class it is enabled on.
+
+        Parameters:
+            path: str | :py:class:`~boolean_parser.cache.DiskCache`
+                The path to the database file, or an existing disk cache to share
+            max_bytes: int
+                The maximum size of the stored expressions, when a path is given.  Default
+                is 256 MB.
+
+        Example:
+            >>> from boolean_parser.parsers import Parser
+            >>> Parser.enable_disk_cache('/tmp/boolean_parser.db')
+            >>> Parser('x > 1').parse()
+            >>> Parser.disk_cache_info()
+            DiskCacheInfo(hits=1, misses=1, evictions=0, max_bytes=268435456, currsize=1,
+                          nbytes=101)
+        '''
+        cls._disk_cache = path if isinstance(path, DiskCache) else \
+            DiskCache(path, max_bytes=max_bytes)
+
+    @classmethod
+    def disable_disk_cache(cls):
+        ''' Stop using the disk cache on this parser class, keeping the stored expressions '''
+        cls._disk_cache = None
+
+    @classmethod
+    def clear_disk_cache(cls):
+        ''' Remove all stored expressions from the disk cache and reset its statistics '''
+        disk = cls.__dict__.get('_disk_cache')
+        if disk is not None:
+            disk.clear()
+
+    @classmethod
+    def disk_cache_info(cls):
+        ''' Return the hits, misses, evictions and size of the disk cache
+
+        Returns:
+            A ``DiskCacheInfo`` named tuple, or None if the disk cache is not enabled
+        '''
+        disk = cls.__dict__.get('_disk_cache')
+        return disk.info() if disk is not None else None
+
+    @classmethod
+    def enable_interning(cls, table=None):
+        ''' Share equal conditions and subtrees between all expressions parsed by this class
+
+        Once enabled, every parsed expression is interned in an
+        :py:class:`~boolean_parser.intern.InternTable`, so equal conditions and equal
+        subtrees across parses are a single, frozen object, which saves memory when
+        many expressions share conditions.  Like the parse cache, interning is specific
+        to the class it is enabled on.  A table can be shared between several parser
+        classes by passing it in.
+
+        Parameters:
+            table: :py:class:`~boolean_parser.intern.InternTable`
+                The table to intern expressions in.  Default is a new, empty table.
+
+        Example:
+            >>> from boolean_parser.parsers import Parser
+            >>> Parser.enable_interning()
+            >>> a = Parser('x > 5 and y < 2').parse()
+            >>> b = Parser('x > 5 or z == 1').parse()
+            >>> a.conditions[0] is b.conditions[0]
+            True
+        '''
+        cls._intern_table = table if table is not None else InternTable()
+
+    @classmethod
+    def disable_interning(cls):
+        ''' Stop interning parsed expressions on this parser class '''
+        cls._intern_table = None
+
+    @classmethod
+    def intern_info(cls):
+        ''' Return the hits, misses and size of the intern table
+
+        Returns:
+            An ``InternInfo`` named tuple, or None if interning is not enabled
+        '''
+        table = cls.__dict__.get('_intern_table')
+        return table.info() if table is not None else None
+
+    @classmethod
+    def build_parser(cls, clauses=None, actions=None, bools=None, engine=None, packrat=None,
+                     keep_parse_results=None, limits=None, schema=None):
         ''' Builds a new boolean parser
 
         Constructs a new boolean Parser class given a set of clauses, actions,
@@ -110,6 +1001,25 @@ class Parser(object):
         must be a list of length 3 containing classes for boolean "not", "and", and "or" logic
         in that order.
 
+        When the parser is built only from the built-in ``condition``, ``between_cond``,
+        ``in_cond`` and ``words`` clauses, with a single action class for each, a
+        hand-written fast engine is also prepared.  Set ``engine`` to "fast" to make it the
+        default for this parser class.
+
+        Set ``packrat`` to enable ``pyparsing`` packrat memoization while parsing with this
+        parser, which greatly speeds up deeply nested expressions.  Memoization is only
+        enabled for the duration of each parse; see :py:func:`packrat`.
+
+        Parsed actions drop the raw ``pyparsing.ParseResults`` to save memory.  Set
+        ``keep_parse_results`` to keep them as the ``parsed_clause`` attribute of each action.
+
+        Set ``limits`` to reject inputs that are too long, too deeply nested, or have too many
+        terms, and to bound the time spent parsing each input, when parsing untrusted input.
+        See :py:class:`Limits`.
+
+        Set ``schema`` to cast the values of each condition to the type of its parameter, and
+        reject invalid values, once at parse time.  See :py:class:`~boolean_parser.schema.Schema`.
+
         Parameters:
             clauses: list
                 A list of pyparsing clause elements
@@ -117,6 +1027,20 @@ class Parser(object):
                 A list of actions to attach to each clause element
             bools: list
                 A list of Boolean classes to use to handle boolean logic
+            engine: str
+                The default parsing engine, either "pyparsing" or "fast"
+            packrat: bool|int
+                If True, or a maximum memoization cache size, enables packrat parsing.
+                True uses a cache size of 128.  Defaults to the current setting.
+            keep_parse_results: bool
+                If True, parsed actions keep the raw pyparsed results.  Defaults to the
+                current setting.
+            limits: :py:class:`Limits`
+                The complexity limits and time budget for each parse.  Defaults to the
+                current limits.  Use ``Limits()`` to remove them.
+            schema: :py:class:`~boolean_parser.schema.Schema`
+                The types of the parameter values.  Defaults to the current schema.  Use
+                ``Schema()`` to remove it.
 
         Example:
             >>> from boolean_parser.parsers import Parser
@@ -133,36 +1057,51 @@ class Parser(object):
             >>> Parser.build_parser(clauses=clauses, actions=actions)
         '''
 
-        # set clauses and actions
-        clauses = clauses or cls._clauses
-        assert clauses is not None, 'A list of clauses must be provided'
-        cls.set_clauses(clauses)
-        cls.build_clause()
-        assert cls._clause is not None, 'A singular clause must be built from clauses'
-        if actions:
-            cls.set_parse_actions(clauses=clauses, actions=actions)
+        # use any clauses set with set_clauses, else rebuild the current (or inherited)
+        # grammar, else use the class defaults
+        current, __ = cls._find_grammar()
+        staged = cls.__dict__.get('_clauses')
+        if not clauses and isinstance(staged, list):
+            clauses = staged
+            actions = actions or cls.__dict__.get('_clause_actions')
+        elif not clauses and current:
+            clauses = list(current.clauses)
+            actions = actions or list(current.actions)
+        elif not clauses:
+            clauses = cls._default_clauses
+            actions = actions or cls._default_actions
+        assert clauses, 'A list of clauses must be provided'
+        assert isinstance(clauses, list), 'clauses must be a list'
 
-        # assign the combined clause to the recursive token pattern matcher
-        where_exp = pp.Forward()
-        where_exp <<= cls._clause
+        # keep the current engine, boolean classes and other settings unless new ones are given
+        engine = engine or (current.engine if current else 'pyparsing')
+        bools = bools or (current.bools if current else cls._bools)
+        if packrat is None:
+            packrat = (current.packrat or False) if current else False
+        if keep_parse_results is None:
+            keep_parse_results = current.keep_parse_results if current else False
+        if limits is None:
+            limits = current.limits if current else None
+        if schema is None:
+            schema = current.schema if current else None
+        grammar = Grammar(clauses, actions=actions, bools=bools, engine=engine, packrat=packrat,
+                          keep_parse_results=keep_parse_results, limits=limits, schema=schema)
 
-        # extract the Boolean precendent clauses
-        bools = bools or cls._bools
-        assert len(
-            bools) == 3, 'there must be a set of "not, and, or" boolean precedent classes'
-        bnot, band, bor = bools
+        # the grammar is set last, and a new grammar never reuses expressions cached under the old
+        cls._grammar = grammar
 
-        # build the expression parser
-        cls._parser = pp.infixNotation(where_exp, [
-            (pp.CaselessLiteral("not"), 1, pp.opAssoc.RIGHT, bnot),
-            (pp.CaselessLiteral("and"), 2, pp.opAssoc.LEFT, band),
-            (pp.CaselessLiteral("or"), 2, pp.opAssoc.LEFT, bor),
-        ])
+        # the compatibility attributes now read from the new grammar
+        for name in _staged_names:
+            if name in cls.__dict__ and not isinstance(cls.__dict__[name], _GrammarAttribute):
+                delattr(cls, name)
 
     @classmethod
     def set_parse_actions(cls, mapping=None, clauses=None, actions=None):
         ''' Attach actions to a pyparsing clause element
 
+        Actions are attached to the class clauses, and are compiled into the parser
+        grammar the next time ``build_parser`` is called.
+
         ``pyparsing`` clause elements can have optional actions set with the
         ``setParseAction`` which control how each clause is parsed.  This maps a list
         of actions onto a list of clauses.  If ``mapping`` is used, it must be a list
@@ -201,13 +1140,19 @@ class Parser(object):
         assert mapping is not None, 'a mapping between clauses and actions must be provided'
 
         # use reprs for list index check to bypass wonky list/equality clause comparisons
-        clause_reprs = [repr(c) for c in cls._clauses]
+        # work on copies, so the clauses of a compiled grammar are never modified
+        class_clauses = [c.copy() for c in cls._clauses]
+        clause_reprs = [repr(c) for c in class_clauses]
+        clause_actions = list(cls._clause_actions)
         for item in mapping:
             clause, action = item
             assert repr(clause) in clause_reprs, 'clause must be included in list of class clauses'
             idx = clause_reprs.index(repr(clause))
             action = action if isinstance(action, (list, tuple)) else [action]
-            cls._clauses[idx].setParseAction(*action)
+            class_clauses[idx].setParseAction(*action)
+            clause_actions[idx] = action
+        cls._clauses = class_clauses
+        cls._clause_actions = clause_actions
 
     @classmethod
     def build_clause(cls, clauses=None):
@@ -216,7 +1161,8 @@ class Parser(object):
         Merges a list of clauses into a single clause using :py:class:`pyparsing.MatchFirst`.
         This is equivalent to "clause = clause1 | clause2 | clause3`.  The clause precedence
         the Parser uses will be the order they appear in the list.  The default is to use
-        the attached Parser._clauses list.
+        the Parser._clauses list.  The clause is compiled into the parser grammar the
+        next time ``build_parser`` is called.
 
         Parameters:
             clauses: list
@@ -237,10 +1183,5 @@ class Parser(object):
 
         '''
         assert isinstance(clauses, list), 'clauses must be a list'
-        cls._clauses = [copy.copy(c) for c in clauses]
-
-
-# Set parse actions on conditions and build the Parser
-clauses = [condition, between_cond, words]
-actions = [Condition, Condition, Word]
-Parser.build_parser(clauses=clauses, actions=actions)
+        cls._clauses = [c.copy() for c in clauses]
+        cls._clause_actions = [None] * len(clauses)
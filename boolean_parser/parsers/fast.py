@@ -0,0 +1,321 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: fast.py
+# Project: parsers
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 11:05:51 am
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 11:05:51 am
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+import re
+
+from boolean_parser.actions.boolean import BaseBool
+from boolean_parser.actions.clause import BaseAction
+from boolean_parser.clauses import between_cond, condition, in_cond, list_re, list_values, words
+
+
+# single-pass tokenizer for the built-in clauses; mirrors the pyparsing elements in
+# boolean_parser.clauses, i.e. operator, value, quoted strings and signed/bitwise numbers
+_token_re = re.compile(r'''
+    (?P<ws>[ \t\r\n]+)
+  | (?P<lpar>\()
+  | (?P<rpar>\))
+  | (?P<comma>,)
+  | (?P<op>==|<=|>=|!=|<|>|=|&|\|)
+  | (?P<quoted>"[^"\n\r]*")
+  | (?P<placeholder>:[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<atom>[A-Za-z0-9_.*-]+)
+  | (?P<number>[+~]\d+(?::?\.\d*)?(?::?[eE][+-]?\d+)?)
+''', re.VERBOSE)
+
+_name_re = re.compile(r'[A-Za-z._][A-Za-z0-9._]*\Z')
+_word_re = re.compile(r'[A-Za-z]+\Z')
+
+# the built-in clauses the fast engine understands, in the only precedence order it supports
+_builtins = (('condition', condition), ('between', between_cond), ('in_list', in_cond),
+             ('words', words))
+_kinds = [kind for kind, __ in _builtins]
+
+_value_kinds = ('atom', 'quoted', 'number', 'placeholder')
+
+
+class Unsupported(Exception):
+    ''' Raised internally when an input falls outside what the fast engine can parse '''
+    pass
+
+
+def _clause_kind(clause):
+    ''' Identify a built-in clause, or a copy of one, made with ``Parser.set_clauses`` '''
+    for kind, builtin in _builtins:
+        if clause is builtin or getattr(clause, 'expr', None) is builtin.expr:
+            return kind
+    return None
+
+
+class FastEngine(object):
+    ''' A hand-written parser for the built-in boolean_parser grammars
+
+    An alternative to the ``pyparsing`` :py:func:`pyparsing.infixNotation` grammar for parsers
+    built from the ``condition``, ``between_cond``, ``in_cond`` and ``words`` clauses.  The
+    input is split into tokens in a single pass, with the whole value list of an "in"
+    condition read as one token, and then combined with precedence climbing, using an explicit
+    stack for parantheses, into the same action objects, i.e. ``Condition``, ``Word``,
+    ``BoolNot``, ``BoolAnd`` and ``BoolOr``, that the ``pyparsing`` grammar produces.
+
+    ``pyparsing`` matches keywords and values without word boundaries and silently ignores
+    unparsed trailing text, which leads to results like "nothing > 5" parsing as "not_(hing>5)".
+    The fast engine does not replicate these edge cases.  Any input it cannot parse completely and
+    unambiguously makes :py:meth:`parse` return None, so the caller can fall back to ``pyparsing``,
+    which gives the authoritative result or error.
+
+    Parameters:
+        bools: list
+            The boolean classes for "not", "and", and "or" logic, in that order
+        condition: class
+            The action class for "parameter operand value" conditions, if enabled
+        between: class
+            The action class for "between" conditions, if enabled
+        in_list: class
+            The action class for "in" and "not in" conditions, if enabled
+        words: class
+            The action class for word clauses, if enabled
+    '''
+
+    def __init__(self, bools, condition=None, between=None, in_list=None, words=None):
+        self.bnot, self.band, self.bor = bools
+        self.condition = condition
+        self.between = between
+        self.in_list = in_list
+        self.words = words
+
+    def __repr__(self):
+        enabled = [kind for kind in _kinds if getattr(self, kind)]
+        return f'<FastEngine(clauses={enabled})>'
+
+    @classmethod
+    def from_clauses(cls, clauses, actions, bools):
+        ''' Create a fast engine for a set of clauses, if possible
+
+        Parameters:
+            clauses: list
+                The list of pyparsing clause elements used by a Parser
+            actions: list
+                The action set on each clause, in the same order
+            bools: list
+                The boolean classes for "not", "and", and "or" logic
+
+        Returns:
+            A new ``FastEngine``, or None if any clause, action or boolean class is not supported
+        '''
+        handlers = {}
+        for clause, action in zip(clauses, actions):
+            kind = _clause_kind(clause)
+            if isinstance(action, (list, tuple)) and len(action) == 1:
+                action = action[0]
+            if kind is None or not (isinstance(action, type) and issubclass(action, BaseAction)):
+                return None
+            handlers[kind] = action
+
+        # clauses are matched first-to-last, so word clauses would shadow conditions
+        order = [_kinds.index(_clause_kind(c)) for c in clauses]
+        if not handlers or len(handlers) != len(clauses) or order != sorted(order):
+            return None
+
+        if not all(isinstance(b, type) and issubclass(b, BaseBool) for b in bools):
+            return None
+
+        return cls(bools, **handlers)
+
+    def parse(self, value):
+        ''' Parse a string expression
+
+        Parameters:
+            value: str
+                The string expression to parse
+
+        Returns:
+            The parsed expression, or None if the input is not supported by the fast engine
+        '''
+        try:
+            return self._build(self.tokenize(value))
+        except Unsupported:
+            return None
+
+    @staticmethod
+    def tokenize(value):
+        ''' Split a string expression into a list of (kind, text) tokens
+
+        The parenthesized values after an "in" keyword are matched as a single "list" token.
+
+        Parameters:
+            value: str
+                The string expression to tokenize
+
+        Returns:
+            A list of tuples of token kind and token text
+
+        Raises:
+            Unsupported: when a character does not start any known token
+        '''
+        tokens = []
+        pos = 0
+        end = len(value)
+        match = _token_re.match
+        while pos < end:
+            mm = match(value, pos)
+            if not mm:
+                raise Unsupported(f'unknown token at col {pos}')
+            kind = mm.lastgroup
+            if kind == 'lpar' and tokens and tokens[-1][1].lower() == 'in':
+                # read a whole value list at once, so long lists are tokenized quickly
+                mm = list_re.match(value, pos) or mm
+                kind = 'list' if mm.end() > pos + 1 else kind
+            if kind != 'ws':
+                tokens.append((kind, mm.group()))
+            pos = mm.end()
+        return tokens
+
+    def _build(self, tokens):
+        ''' Combine tokens into an expression with precedence climbing
+
+        Precedence is NOTs -> ANDs -> ORs.  Each level of parantheses gets a new frame of
+        pending nots, and-terms and or-terms, saved on an explicit stack when the
+        parantheses open and restored when they close.
+        '''
+        stack = []
+        nots, ands, ors = 0, [], []
+        expect_operand = True
+        idx = 0
+        ntokens = len(tokens)
+
+        while True:
+            if expect_operand:
+                if idx >= ntokens:
+                    raise Unsupported('expected an operand')
+                kind, text = tokens[idx]
+                if kind == 'lpar':
+                    stack.append((nots, ands, ors))
+                    nots, ands, ors = 0, [], []
+                    idx += 1
+                    continue
+                if kind != 'atom':
+                    raise Unsupported(f'unexpected token {text}')
+                low = text.lower()
+                if low.startswith('not'):
+                    # pyparsing also matches "not" as the prefix of a longer word
+                    if low != 'not':
+                        raise Unsupported(f'ambiguous not in {text}')
+                    nots += 1
+                    idx += 1
+                    continue
+                operand, idx = self._clause(tokens, idx)
+            else:
+                if idx >= ntokens:
+                    break
+                kind, text = tokens[idx]
+                idx += 1
+                if kind == 'rpar':
+                    if not stack:
+                        raise Unsupported('unbalanced parantheses')
+                    operand = self._join(ands, ors)
+                    nots, ands, ors = stack.pop()
+                else:
+                    low = text.lower() if kind == 'atom' else None
+                    if low == 'and':
+                        expect_operand = True
+                    elif low == 'or':
+                        ors.append(self._join(ands, []))
+                        ands = []
+                        expect_operand = True
+                    else:
+                        raise Unsupported(f'unexpected token {text}')
+                    continue
+
+            # an operand has been completed; apply any pending nots
+            for __ in range(nots):
+                operand = self.bnot([['not', operand]])
+            nots = 0
+            ands.append(operand)
+            expect_operand = False
+
+        if stack:
+            raise Unsupported('unbalanced parantheses')
+        return self._join(ands, ors)
+
+    def _join(self, ands, ors):
+        ''' Join and-terms and or-terms into boolean objects, as pyparsing groups them '''
+        operand = ands[0] if len(ands) == 1 else self.band(self._interleave(ands, 'and'))
+        if not ors:
+            return operand
+        return self.bor(self._interleave(ors + [operand], 'or'))
+
+    @staticmethod
+    def _interleave(operands, logicop):
+        ''' Build the pyparsing-style token list, e.g. [[a, 'and', b, 'and', c]] '''
+        tokens = [operands[0]]
+        for operand in operands[1:]:
+            tokens.extend((logicop, operand))
+        return [tokens]
+
+    def _clause(self, tokens, idx):
+        ''' Parse a single clause starting at token ``idx``
+
+        Returns:
+            A tuple of the clause action object and the index of the next token
+        '''
+        text = tokens[idx][1]
+        nkind, ntext = tokens[idx + 1] if idx + 1 < len(tokens) else (None, None)
+
+        if nkind == 'op' and self.condition and _name_re.match(text):
+            value = self._value(tokens, idx + 2)
+            data = {'parameter': text, 'operator': ntext, 'value': value}
+            return self.condition(data), idx + 3
+
+        if nkind == 'atom' and ntext.lower().startswith('between') and self.between:
+            if ntext.lower() != 'between' or not _name_re.match(text):
+                raise Unsupported(f'ambiguous between in {ntext}')
+            value1 = self._value(tokens, idx + 2)
+            if idx + 3 >= len(tokens) or tokens[idx + 3][1].lower() != 'and':
+                raise Unsupported('between condition is missing and')
+            value2 = self._value(tokens, idx + 4)
+            data = {'parameter': text, 'operator': 'between', 'value1': value1, 'value2': value2}
+            return self.between(data), idx + 5
+
+        nlow = ntext.lower() if nkind == 'atom' else None
+        if nlow in ('in', 'not') and self.in_list and _name_re.match(text):
+            operator = 'in'
+            if nlow == 'not':
+                if idx + 2 >= len(tokens) or tokens[idx + 2][1].lower() != 'in':
+                    raise Unsupported('not in condition is missing in')
+                operator = 'not in'
+                idx += 1
+            if idx + 2 >= len(tokens) or tokens[idx + 2][0] != 'list':
+                raise Unsupported('expected a list of values')
+            data = {'parameter': text, 'operator': operator,
+                    'values': list_values(tokens[idx + 2][1])}
+            return self.in_list(data), idx + 3
+
+        if self.words and _word_re.match(text):
+            return self.words({'parameter': text}), idx + 1
+
+        raise Unsupported(f'unsupported clause at {text}')
+
+    @staticmethod
+    def _value(tokens, idx):
+        ''' Extract a condition value from token ``idx`` '''
+        if idx >= len(tokens):
+            raise Unsupported('expected a value')
+        kind, text = tokens[idx]
+        if kind not in _value_kinds:
+            raise Unsupported(f'unexpected value {text}')
+        if kind == 'quoted':
+            # pyparsing converts escaped whitespace within quoted strings
+            if '\\' in text:
+                raise Unsupported('escape sequence in quoted string')
+            text = text[1:-1]
+        return text
@@ -14,9 +14,11 @@
 from __future__ import print_function, division, absolute_import
 from boolean_parser.parsers import Parser
 from boolean_parser.mixins import SQLAMixin
+from boolean_parser.mixins.sqla import FieldRegistry, FilterCacheMixin
 from boolean_parser.actions.clause import Condition
 from boolean_parser.actions.boolean import BaseBool, BoolNot, BoolAnd, BoolOr
-from boolean_parser.clauses import condition, between_cond
+from boolean_parser.clauses import condition, between_cond, in_cond
+from boolean_parser.optimize import check_optimize, merge_terms
 from sqlalchemy.sql import or_, and_, not_
 
 
@@ -37,34 +39,85 @@ class SQLACondition(SQLAMixin, Condition):
     "{name: 'x', fullname: 'table.x', base: 'table', operator: '<', value: '4'}"
 
     '''
-    pass
+    __slots__ = ('_filters',)
 
 
-class SQLBoolBase(BaseBool):
-    ''' Class for handling boolean logic joins for SQLALchemy filter expressions '''
+class SQLBoolBase(FilterCacheMixin, BaseBool):
+    ''' Class for handling boolean logic joins for SQLALchemy filter expressions
 
-    def filter(self, models):
+    The clause built for each set of models is remembered, see
+    :py:class:`~boolean_parser.mixins.sqla.FilterCacheMixin`.
+
+    Attributes:
+        optimize: bool|str
+            Whether ``filter`` collapses equalities on the same field into IN clauses and
+            merges ranges, by default.  Can be False, True or "in", or "any" for
+            PostgreSQL "= ANY(array)" comparisons.  See
+            :py:func:`~boolean_parser.optimize.optimize`.  Default is False.
+    '''
+    __slots__ = ('_filters',)
+    optimize = False
+
+    def _filter_state(self):
+        ''' Return the conditions, which are replaced rather than modified in place '''
+        return self.conditions
+
+    def _filter_classes(self):
+        ''' Return the classes of the clause and of all its leaf conditions '''
+        return tuple(dict.fromkeys((type(self),) + tuple(map(type, self.leaves))))
+
+    def _build_filter(self, models, string_match=None, optimize=None):
         ''' Calls the filter method for each condition
 
+        Nested boolean clauses are walked with an explicit stack, so very deep
+        expressions are supported.  The models are checked once, and each field is looked
+        up once, for all the conditions, unless a prebuilt
+        :py:class:`~boolean_parser.mixins.sqla.FieldRegistry` is passed instead.  When
+        optimized, the terms of each boolean clause are merged as they are joined.
+
         Parameters:
             models: list
-                A list of SQLAlchemy ORM models
+                A list of SQLAlchemy ORM models, or a ``FieldRegistry``
+            string_match: str
+                How string fields are compared.  Defaults to the ``string_match`` of each
+                condition class.
+            optimize: bool|str
+                Whether to merge equalities and ranges.  Defaults to the class ``optimize``.
         '''
-        conditions = [condition.filter(models)
-                      for condition in self.conditions]
-        return sqlaop[self.logicop](*conditions)
+        registry = FieldRegistry.of(models)
+        in_style = check_optimize(self.optimize if optimize is None else optimize)
+        if in_style:
+            def combine(node, conditions):
+                return sqlaop[node.logicop](*merge_terms(conditions, node.logicop, in_style))
+        else:
+            def combine(node, conditions):
+                return sqlaop[node.logicop](*conditions)
+        return self._fold(lambda condition: _build_filter(condition, registry, string_match),
+                          combine)
+
+
+def _build_filter(condition, models, string_match=None):
+    ''' Build the filter of a condition within a larger expression, without remembering it '''
+    build = getattr(condition, '_build_filter', None)
+    if build is not None:
+        return build(models, string_match=string_match)
+    return condition.filter(models, string_match=string_match) if string_match else \
+        condition.filter(models)
 
 
 class SQLANot(BoolNot, SQLBoolBase):
     ''' SQLalchemy class for boolean Not '''
+    __slots__ = ()
 
 
 class SQLAAnd(BoolAnd, SQLBoolBase):
     ''' SQLalchemy class for boolean And '''
+    __slots__ = ()
 
 
 class SQLAOr(BoolOr, SQLBoolBase):
     ''' SQLalchemy class for boolean Or '''
+    __slots__ = ()
 
 
 class SQLAParser(Parser):
@@ -93,11 +146,14 @@ class SQLAParser(Parser):
         >>>
         >>> # perform the sqlalchemy query
         >>> session.query(TableModel).filter(ff).all()
+        >>>
+        >>> # compare strings so that an index on table.name can be used
+        >>> ff = res.filter(TableModel, string_match='exact')
+
+    String conditions are compared case-insensitively by default.  See
+    :py:class:`~boolean_parser.mixins.sqla.SQLAMixin` for the ``string_match`` strategies
+    that instead compare in ways database indexes can serve.
     '''
     _bools = [SQLANot, SQLAAnd, SQLAOr]
-
-
-# Set new SQLAlchemy parse actions on conditions and build the Parser
-clauses = [condition, between_cond]
-actions = [SQLACondition, SQLACondition]
-SQLAParser.build_parser(clauses=clauses, actions=actions)
+    _default_clauses = [condition, between_cond, in_cond]
+    _default_actions = [SQLACondition, SQLACondition, SQLACondition]
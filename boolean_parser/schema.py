@@ -0,0 +1,342 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: schema.py
+# Project: boolean_parser
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 11:58:12 pm
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 11:58:12 pm
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+import decimal
+import inspect
+from collections.abc import Mapping
+from datetime import date, datetime
+from types import MappingProxyType
+
+from boolean_parser.actions.boolean import BaseBool
+from boolean_parser.actions.clause import Condition, placeholder_re
+from boolean_parser.parsers.base import BooleanParserException
+
+
+# the python types that values are cast to; any other type keeps the string value
+types = (str, int, float, bool, date, datetime)
+
+
+def cast_type(pytype):
+    ''' Return the type values of a python field type are cast to
+
+    Decimal values are cast to float, and values of types other than ``types``, e.g.
+    of array or JSON fields, are kept as strings.
+
+    Parameters:
+        pytype: type
+            A python field type, e.g. the ``python_type`` of a SQLAlchemy column type
+
+    Returns:
+        One of ``types``
+    '''
+    if pytype is decimal.Decimal:
+        return float
+    return pytype if pytype in types else str
+
+
+def to_bool(value):
+    """ Cast value to Boolean.
+
+    Parameters:
+        value (str):
+            The value to format
+
+    Returns:
+        True from inputs:
+          - "true"
+          - "t"
+          - "1"
+          - "yes"
+
+        False from inputs:
+          - "false"
+          - "f"
+          - "0"
+          - "no"
+    """
+    valid = {
+        "true": True,
+        "t": True,
+        "1": True,
+        "yes": True,
+        "false": False,
+        "f": False,
+        "0": False,
+        "no": False,
+    }
+
+    if isinstance(value, bool):
+        return value
+
+    if not isinstance(value, str):
+        raise ValueError("Invalid literal for boolean. Not a string or boolean.")
+
+    lower_value = value.lower()
+    if lower_value in valid:
+        return valid[lower_value]
+
+    else:
+        raise ValueError('Invalid literal for boolean: "%s"' % value)
+
+
+def to_date(value):
+    """ Cast value to Datetime.
+
+    Parameters:
+        value (str):
+            The value to format. Should be an ISO 8601 date string
+            such as '2011-11-04' or '2011-11-04T00:05:23'
+
+    Returns:
+        The value as an date object
+    """
+
+    if isinstance(value, date):
+        return value
+
+    if not isinstance(value, str):
+        raise ValueError("Invalid literal for date. Not a string or date.")
+
+    try:
+        # When casting to date, we don't care about time, so only take
+        # the first 10 characters of the string
+        dt = date.fromisoformat(value[:10])
+        return dt
+    except ValueError:
+        raise ValueError('Could not parse date from string: "%s"' % value)
+
+
+def to_datetime(value):
+    """ Cast value to Datetime.
+
+    Parameters:
+        value (str):
+            The value to format. Should be an ISO 8601 date string
+            such as '2011-11-04' or '2011-11-04T00:05:23'
+
+    Returns:
+        The value as a datetime object
+    """
+
+    if isinstance(value, datetime):
+        return value
+
+    if not isinstance(value, str):
+        raise ValueError("Invalid literal for datetime. Not a string or datetime.")
+
+    try:
+        dt = datetime.fromisoformat(value)
+        return dt
+    except ValueError:
+        raise ValueError('Could not parse datetime from string: "%s"' % value)
+
+
+def cast_value(value, datatype, name=None):
+    ''' Cast a string value to a python type
+
+    Null values, i.e. "null" in any case, are returned unchanged as "null".
+
+    Parameters:
+        value: str
+            The value to cast
+        datatype: type
+            The type to cast to.  Can be float, int, bool, date or datetime.
+        name: str
+            The name of the parameter, for the error message
+
+    Returns:
+        The value cast to the given type
+
+    Raises:
+        BooleanParserException: when the value is not a valid literal of the type
+    '''
+    assert datatype in [float, int, bool, date, datetime], \
+        'datatype must be either float, int, bool, date or datetime'
+    try:
+        if value.lower() == 'null':
+            return 'null'
+        elif datatype == bool:
+            return to_bool(value)
+        elif datatype == date:
+            return to_date(value)
+        elif datatype == datetime:
+            return to_datetime(value)
+        return datatype(value)
+    except (ValueError, SyntaxError):
+        raise BooleanParserException(f'Field {name} expects a {datatype.__name__} value. '
+                                     f'Received {value} instead.') from None
+
+
+class Schema(Mapping):
+    ''' The python types of the parameters of a grammar
+
+    A schema maps parameter names, e.g. "modela.x", or bare names, e.g. "x", to the python
+    type of their values.  When a schema is passed to a grammar, with
+    ``build_parser(schema=...)``, the values of each parsed condition are cast to the type of
+    its parameter once, at parse time, and kept as the ``typed_value`` and ``typed_value2``,
+    or ``typed_values`` for "in" lists, of the condition.  Values that are not valid
+    literals of their type are rejected with a
+    :py:class:`~boolean_parser.parsers.base.BooleanParserException` before the expression
+    is ever used, and :py:class:`~boolean_parser.mixins.sqla.SQLAMixin` filters bind the
+    typed values instead of casting them again on every call to ``filter``.
+
+    Conditions are looked up by their full parameter name, and then by their bare name.
+    Parameters not in the schema keep their string values, unless the schema is ``strict``,
+    in which case they are rejected.  Null values and placeholders are never cast.  Types
+    other than str, int, float, bool, date and datetime are kept as strings, and Decimal
+    values are cast to float, as done by ``SQLAMixin``.
+
+    Schemas are immutable.  Typed values are not serialized by
+    :py:func:`~boolean_parser.serialize.dumps`, so expressions loaded outside of a parser
+    are untyped, but expressions read from a parser disk cache are typed again.
+
+    Parameters:
+        fields: dict
+            A mapping of parameter names to python types
+        strict: bool
+            If True, parameters that are not in the schema are rejected.  Default is False.
+
+    Example:
+        >>> from datetime import date
+        >>> from boolean_parser.parsers import SQLAParser
+        >>> from boolean_parser.schema import Schema
+        >>> SQLAParser.build_parser(schema=Schema({'modela.x': int, 'modela.dates': date}))
+        >>> SQLAParser('modela.x > 5').parse().typed_value
+        5
+        >>> SQLAParser('modela.x > five').parse()
+        BooleanParserException: Field x expects a int value. Received five instead.
+    '''
+
+    def __init__(self, fields=None, strict=False):
+        fields = dict(fields or {})
+        for name, pytype in fields.items():
+            assert isinstance(name, str), 'schema names must be strings'
+            assert pytype in types or pytype is decimal.Decimal, \
+                f'the type of {name} must be one of {[t.__name__ for t in types]} or Decimal'
+        self._fields = MappingProxyType({name: cast_type(pytype)
+                                         for name, pytype in fields.items()})
+        self.strict = bool(strict)
+
+    @classmethod
+    def from_models(cls, models, strict=False):
+        ''' Build a schema from the columns of SQLAlchemy models
+
+        Each column is added under its full name, "table.column", using the table name, or
+        alias name, of its model, and under its bare name.  When models share a column name,
+        the bare name has the type of the first model, as in ``SQLAMixin.filter``.
+
+        Parameters:
+            models: object
+                A module of SQLAlchemy models, a list of models, or a single model
+            strict: bool
+                If True, parameters that are not in the schema are rejected
+
+        Returns:
+            A new :py:class:`Schema`
+
+        Example:
+            >>> from boolean_parser.schema import Schema
+            >>> Schema.from_models([ModelA, ModelB])
+            <Schema(fields=19, strict=False)>
+        '''
+        # sqlalchemy is only imported when needed
+        from sqlalchemy import inspect as sqla_inspect
+        from sqlalchemy.orm.util import AliasedClass
+
+        if inspect.ismodule(models):
+            models = [m for __, m in inspect.getmembers(models, inspect.isclass)
+                      if hasattr(m, '__tablename__')]
+        elif not isinstance(models, (list, tuple)):
+            models = [models]
+
+        fields = {}
+        bare = {}
+        for model in models:
+            info = sqla_inspect(model)
+            base = info.name.lower() if isinstance(model, AliasedClass) else model.__tablename__
+            for prop in info.mapper.column_attrs:
+                try:
+                    pytype = prop.columns[0].type.python_type
+                except NotImplementedError:
+                    pytype = str
+                fields[f'{base}.{prop.key}'] = cast_type(pytype)
+                bare.setdefault(prop.key, cast_type(pytype))
+        bare.update(fields)
+        return cls(bare, strict=strict)
+
+    def __getitem__(self, name):
+        return self._fields[name]
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __eq__(self, other):
+        if not isinstance(other, Schema):
+            return NotImplemented
+        return self.strict == other.strict and dict(self._fields) == dict(other._fields)
+
+    def __hash__(self):
+        return hash((self.strict, frozenset(self._fields.items())))
+
+    def __repr__(self):
+        return f'<Schema(fields={len(self)}, strict={self.strict})>'
+
+    def type_of(self, leaf):
+        ''' Return the type of a parsed leaf, looked up by full name and then by bare name
+
+        Parameters:
+            leaf: :py:class:`~boolean_parser.actions.clause.BaseAction`
+                A parsed leaf, e.g. a condition
+
+        Returns:
+            The python type, or None if the parameter is not in the schema
+
+        Raises:
+            BooleanParserException: when the schema is strict and the parameter is unknown
+        '''
+        pytype = self._fields.get(leaf.fullname) or self._fields.get(leaf.name)
+        if pytype is None and self.strict:
+            raise BooleanParserException(f'unknown parameter {leaf.fullname}')
+        return pytype
+
+    def apply(self, expression):
+        ''' Type the values of every condition of a parsed expression, in place
+
+        Parameters:
+            expression: object
+                A parsed expression
+
+        Returns:
+            The expression itself
+
+        Raises:
+            BooleanParserException: when a value is not a valid literal of its type, or the
+                schema is strict and a parameter is unknown
+        '''
+        leaves = expression.leaves if isinstance(expression, BaseBool) else (expression,)
+        for leaf in leaves:
+            if not hasattr(leaf, 'fullname'):
+                continue
+            pytype = self.type_of(leaf)
+            if pytype is None or not isinstance(leaf, Condition):
+                continue
+            values = leaf._values()
+            typed = tuple(v if pytype is str or placeholder_re.match(v) else
+                          cast_value(v, pytype, name=leaf.name) for v in values)
+            # typing is part of parsing, so is also done on frozen, e.g. interned, conditions
+            object.__setattr__(leaf, '_typed', (pytype,) + typed)
+        return expression
@@ -0,0 +1,269 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: serialize.py
+# Project: boolean_parser
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 10:12:54 pm
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 10:12:54 pm
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+import importlib
+import json
+import struct
+import sys
+from array import array
+
+from boolean_parser.actions.base import Node
+from boolean_parser.actions.boolean import BaseBool
+from boolean_parser.actions.clause import BaseAction
+from boolean_parser.parsers.base import BooleanParserException
+
+
+# the current serialization format version
+version = 1
+
+# the binary format starts with a magic marker, the version, the array type code of the
+# integers, and the number of classes, strings and integers
+_magic = b'BPX'
+_header = struct.Struct('<3sBcIII')
+
+# the array type codes of the integers, smallest first
+_typecodes = [(code, 1 << (8 * array(code).itemsize)) for code in 'BHI']
+
+
+def dumps(expression, binary=False):
+    ''' Serialize a parsed expression
+
+    Serializes a parsed expression into a compact, versioned form that can be sent to
+    another process and rebuilt with :py:func:`loads`, without parsing the original string
+    again.  Each node is stored once, children first, with the class of each node stored
+    by name in a table, so subtrees shared by several parents, e.g. from an
+    :py:class:`~boolean_parser.intern.InternTable`, stay shared.  Leaf conditions are
+    stored as their ``data`` parameters, so the raw ``pyparsing`` results are never
+    included.
+
+    The JSON form is a string.  The binary form is bytes holding a table of the distinct
+    strings and an array of integer records, which is smaller when parameters and
+    values repeat.  The walk is iterative, so very deep expressions are supported.
+
+    Parameters:
+        expression: object
+            A parsed expression, made of ``BaseBool`` and ``BaseAction`` nodes
+        binary: bool
+            If True, returns the binary form instead of JSON
+
+    Returns:
+        The serialized expression, as a str or bytes
+
+    Raises:
+        BooleanParserException: when the expression has nodes that cannot be serialized
+
+    Example:
+        >>> from boolean_parser.parsers import Parser
+        >>> from boolean_parser.serialize import dumps, loads
+        >>> data = dumps(Parser('x > 1 and y < 2').parse())
+        >>> loads(data)
+        and_(x>1, y<2)
+    '''
+    classes, nodes = _flatten(expression)
+    if binary:
+        return _dump_binary(classes, nodes)
+    return json.dumps({'version': version, 'classes': classes, 'nodes': nodes},
+                      separators=(',', ':'))
+
+
+def loads(data):
+    ''' Rebuild a parsed expression serialized with :py:func:`dumps`
+
+    The nodes are rebuilt with the classes they were serialized with, e.g.
+    ``SQLACondition`` and ``SQLAAnd``, without running ``pyparsing``.  Only
+    classes derived from :py:class:`~boolean_parser.actions.base.Node`, from modules
+    that are already imported or from the ``boolean_parser`` package, are used.
+
+    Parameters:
+        data: str | bytes
+            The serialized expression, in JSON or binary form
+
+    Returns:
+        The parsed expression
+
+    Raises:
+        BooleanParserException: when the data is not a serialized expression, or was
+            written by an unsupported format version
+    '''
+    if isinstance(data, (bytes, bytearray, memoryview)) and bytes(data[:3]) == _magic:
+        classes, nodes = _load_binary(bytes(data))
+    else:
+        try:
+            payload = json.loads(data)
+            data_version = payload['version']
+            classes, nodes = payload['classes'], payload['nodes']
+        except (ValueError, TypeError, KeyError):
+            raise BooleanParserException('data is not a serialized expression') from None
+        _check_version(data_version)
+    return _build(classes, nodes)
+
+
+def _check_version(data_version):
+    ''' Check that serialized data can be read by this version '''
+    if data_version != version:
+        raise BooleanParserException(f'unsupported serialization version {data_version}, '
+                                     f'expected {version}')
+
+
+def _class_name(cls):
+    ''' The name a node class is serialized by '''
+    return f'{cls.__module__}:{cls.__qualname__}'
+
+
+def _flatten(expression):
+    ''' Flatten an expression into a class table and a list of node records, children first
+
+    Records of boolean clauses are a class index and a list of node indices.  Records of
+    leaf conditions are a class index and the dictionary of their parsed parameters.
+    '''
+    classes = {}
+    index = {}
+    nodes = []
+    stack = [(expression, False)]
+    while stack:
+        node, visited = stack.pop()
+        if id(node) in index:
+            continue
+        if isinstance(node, BaseBool):
+            if not visited:
+                stack.append((node, True))
+                stack.extend((c, False) for c in reversed(node.conditions))
+                continue
+            record = [index[id(c)] for c in node.conditions]
+        elif isinstance(node, BaseAction):
+            record = dict(node.data)
+        else:
+            raise BooleanParserException(f'cannot serialize a {type(node).__name__} node')
+        cls = classes.setdefault(_class_name(type(node)), len(classes))
+        index[id(node)] = len(nodes)
+        nodes.append([cls, record])
+    return list(classes), nodes
+
+
+def _find_class(name):
+    ''' Find a node class by its serialized name '''
+    module_name, __, qualname = name.partition(':')
+    module = sys.modules.get(module_name)
+    if module is None and module_name.split('.')[0] == 'boolean_parser':
+        module = importlib.import_module(module_name)
+    cls = module
+    for part in qualname.split('.'):
+        cls = getattr(cls, part, None)
+    if not (isinstance(cls, type) and issubclass(cls, Node)):
+        raise BooleanParserException(f'unknown node class {name}')
+    return cls
+
+
+def _build(classes, nodes):
+    ''' Rebuild the nodes of an expression, children first '''
+    classes = [_find_class(name) for name in classes]
+    built = []
+    try:
+        for cls_idx, record in nodes:
+            cls = classes[cls_idx]
+            if issubclass(cls, BaseBool):
+                conditions = [built[idx] for idx in record]
+                if cls.logicop == 'not' or len(conditions) == 1:
+                    tokens = [cls.logicop] + conditions
+                else:
+                    tokens = [conditions[0]]
+                    for condition in conditions[1:]:
+                        tokens.extend((cls.logicop, condition))
+                built.append(cls([tokens]))
+            else:
+                built.append(cls(dict(record)))
+        return built[-1]
+    except (IndexError, TypeError, ValueError, AttributeError, AssertionError) as e:
+        raise BooleanParserException(f'data is not a valid serialized expression: {e}') from None
+
+
+def _dump_binary(classes, nodes):
+    ''' Encode the class table and node records as a string table and an integer array '''
+    strings = {}
+    ints = []
+
+    def string(value):
+        return strings.setdefault(value, len(strings))
+
+    for name in classes:
+        string(name)
+    for cls_idx, record in nodes:
+        ints.append(cls_idx)
+        ints.append(len(record))
+        if isinstance(record, dict):
+            for key, value in record.items():
+                # the lowest bit of the key marks values that are not strings, stored as JSON
+                if isinstance(value, str):
+                    ints.extend((2 * string(key), string(value)))
+                else:
+                    value = json.dumps(value, separators=(',', ':'))
+                    ints.extend((2 * string(key) + 1, string(value)))
+        else:
+            ints.extend(record)
+
+    encoded = [value.encode('utf-8') for value in strings]
+    ints.extend(len(value) for value in encoded)
+    largest = max(ints, default=0)
+    code = next(code for code, limit in _typecodes if largest < limit)
+    ints = array(code, ints)
+    if sys.byteorder == 'big':
+        ints.byteswap()
+    header = _header.pack(_magic, version, code.encode('ascii'), len(classes), len(encoded),
+                          len(ints))
+    return b''.join([header, ints.tobytes()] + encoded)
+
+
+def _load_binary(data):
+    ''' Decode the class table and node records of the binary form '''
+    try:
+        __, data_version, code, nclasses, nstrings, nints = _header.unpack_from(data)
+    except struct.error:
+        raise BooleanParserException('data is not a serialized expression') from None
+    _check_version(data_version)
+
+    try:
+        ints = array(code.decode('ascii'))
+        offset = _header.size + ints.itemsize * nints
+        ints.frombytes(data[_header.size:offset])
+        if sys.byteorder == 'big':
+            ints.byteswap()
+
+        # the string lengths follow the node records
+        nints -= nstrings
+        strings = []
+        for length in ints[nints:]:
+            strings.append(data[offset:offset + length].decode('utf-8'))
+            offset += length
+
+        classes = strings[:nclasses]
+        leaves = [not issubclass(_find_class(name), BaseBool) for name in classes]
+        nodes = []
+        pos = 0
+        while pos < nints:
+            cls_idx, count = ints[pos], ints[pos + 1]
+            pos += 2
+            if leaves[cls_idx]:
+                record = {}
+                items = ints[pos:pos + 2 * count]
+                for key, value in zip(items[::2], items[1::2]):
+                    value = strings[value]
+                    record[strings[key >> 1]] = json.loads(value) if key & 1 else value
+                pos += 2 * count
+            else:
+                record = ints[pos:pos + count].tolist()
+                pos += count
+            nodes.append([cls_idx, record])
+    except (ValueError, IndexError, UnicodeDecodeError):
+        raise BooleanParserException('data is not a valid serialized expression') from None
+    return classes, nodes
@@ -0,0 +1,432 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: typeahead.py
+# Project: boolean_parser
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 8:02:47 pm
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 8:02:47 pm
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+import bisect
+from collections import namedtuple
+
+from boolean_parser.clauses import _list_value_re
+from boolean_parser.parsers.base import BooleanParserException, Grammar
+from boolean_parser.parsers.fast import Unsupported, _name_re, _token_re, _value_kinds, _word_re
+
+
+TypeaheadResult = namedtuple('TypeaheadResult',
+                             ['expression', 'expected', 'prefix', 'complete', 'error'])
+
+# the operators, for recognizing one that is still being typed, e.g. "!"
+_operators = ('==', '<=', '>=', '!=', '<', '>', '=', '&', '|')
+
+# parser modes, i.e. what the next token has to be
+_OPERAND = 'operand'      # a parameter, "not" or "("
+_NAME = 'name'            # after a parameter: an operator, "between", or else it is a word
+_VALUE = 'value'          # after an operator
+_VALUE1 = 'value1'        # after "between"
+_AND = 'and'              # after the first "between" value
+_VALUE2 = 'value2'        # after the "and" of a "between" condition
+_NOT = 'not'              # after a parameter and "not": "in"
+_LIST = 'list'            # after "in": the "(" of a value list
+_ITEM = 'item'            # after the "(" or a "," of a value list
+_NEXT = 'next'            # after a value of a value list: "," or ")"
+_AFTER = 'after'          # after a complete clause: "and", "or" or ")"
+
+_start = (_OPERAND, None, 0, None, None, None)
+
+
+class _Invalid(Exception):
+    ''' Raised internally when a token is not valid at its position '''
+    pass
+
+
+class Typeahead(object):
+    ''' An incremental parser for expressions that are still being typed
+
+    Parses successive versions of an expression, e.g. the contents of a query box after each
+    keystroke, and returns the expression parsed so far together with the tokens that can
+    come next.  Incomplete input, such as "x > 1 and", is not an error.  The clauses up to the
+    last complete one are returned as a partial expression, with any open parentheses closed
+    and any dangling "and", "or" or "not" dropped.
+
+    The tokens of the previous input, and the parser state after each of them, are remembered.
+    Each call to :py:meth:`update` only tokenizes and parses the input after the prefix it
+    shares with the previous input, so the work per keystroke does not depend on the length
+    of the text before the cursor.  Completed clauses are also shared between the partial
+    expressions of successive updates.
+
+    Typeahead is built on the fast parsing engine, so requires a grammar of the built-in
+    ``condition``, ``between_cond``, ``in_cond`` and ``words`` clauses, as used by ``Parser``
+    and ``SQLAParser``.  Like the fast engine, it does not accept the ambiguous inputs that
+    ``pyparsing`` silently misreads, e.g. "nothing > 5".  A complete expression should
+    still be parsed with the parser itself.  The grammar is read once, so changes made later
+    with ``build_parser`` are not seen by an existing ``Typeahead``.
+
+    Parameters:
+        parser: class | :py:class:`~boolean_parser.parsers.base.Grammar`
+            The parser class, or grammar, to parse with.  Default is ``Parser``.
+
+    Raises:
+        BooleanParserException: when the grammar is not supported by the fast engine
+
+    Example:
+        >>> from boolean_parser.typeahead import Typeahead
+        >>> typeahead = Typeahead()
+        >>> result = typeahead.update('x > 1 and (y < 2 or')
+        >>> result.expression
+        and_(x>1, y<2)
+        >>> sorted(result.expected)
+        ['(', 'not', 'parameter']
+        >>> typeahead.update('x > 1 and (y < 2 or z)').complete
+        True
+    '''
+
+    def __init__(self, parser=None):
+        if parser is None:
+            from boolean_parser.parsers import Parser
+            parser = Parser
+        grammar = parser if isinstance(parser, Grammar) else parser.get_grammar()
+        if grammar.fast_engine is None:
+            raise BooleanParserException('typeahead requires a grammar supported by the fast '
+                                         'engine')
+        self._engine = grammar.fast_engine
+        self.reset()
+
+    def __repr__(self):
+        return f'<Typeahead(value={self._value!r})>'
+
+    def reset(self):
+        ''' Forget the previous input '''
+        self._value = ''
+        # the end offsets of the tokens parsed so far, and the parser state before each token
+        # and after the last one
+        self._ends = []
+        self._states = [_start]
+
+    def update(self, value):
+        ''' Parse the current version of an expression
+
+        Parameters:
+            value: str
+                The expression typed so far
+
+        Returns:
+            A ``TypeaheadResult`` named tuple of the partial ``expression``, or None if no
+            clause is complete yet, the set of ``expected`` next tokens, the unfinished
+            ``prefix`` of a token still being typed, if any, whether the input is a
+            ``complete`` expression, and an ``error`` message if the input cannot be
+            completed into a valid expression.  The expected tokens are any of "parameter",
+            "operator", "value", "between", "in", "and", "or", "not", "(", "," and ")".
+        '''
+        if not isinstance(value, str):
+            raise BooleanParserException(f'input must be a string, not {type(value).__name__}')
+
+        # keep the tokens that end before the first change, and are followed by at least
+        # one unchanged character, so their boundaries are unchanged
+        shared = _shared_prefix(self._value, value)
+        keep = bisect.bisect_left(self._ends, shared - 1)
+        del self._ends[keep:]
+        del self._states[keep + 1:]
+        self._value = value
+
+        state = self._states[-1]
+        pos = self._ends[-1] if self._ends else 0
+        end = len(value)
+        error = prefix = None
+        invalid = None
+        while pos < end:
+            mm = _token_re.match(value, pos)
+            if not mm:
+                rest = value[pos:]
+                if _unfinished(rest):
+                    prefix = rest
+                    invalid = f'unexpected {rest!r}'
+                else:
+                    error = f'unexpected character {value[pos]!r} at col {pos}'
+                break
+            kind = mm.lastgroup
+            if kind == 'ws':
+                pos = mm.end()
+                continue
+            text = mm.group()
+            try:
+                state = self._step(state, kind, text)
+            except _Invalid as exc:
+                if mm.end() == end and kind == 'atom':
+                    # a keyword or name that is still being typed, e.g. "an" for "and"
+                    prefix = text
+                    invalid = str(exc)
+                else:
+                    error = f'{exc} at col {pos}'
+                break
+            pos = mm.end()
+            self._ends.append(pos)
+            self._states.append(state)
+
+        expected = frozenset(self._expected(state))
+        if prefix is not None and not _could_start(prefix, expected):
+            error = f'{invalid} at col {end - len(prefix)}'
+            prefix = None
+        complete = error is None and prefix is None and state[1] is None and \
+            (state[0] == _AFTER or bool(self._pending_operand(state)))
+        return TypeaheadResult(expression=self._partial(state), expected=expected,
+                               prefix=prefix or '', complete=complete, error=error)
+
+    #
+    # parser states are tuples of (mode, stack, nots, ands, ors, pending), where the stack,
+    # and-terms and or-terms are immutable linked lists of (item, rest) pairs, so states can
+    # be remembered after every token without copying
+    #
+
+    def _step(self, state, kind, text):
+        ''' Return the parser state after a token, or raise _Invalid '''
+        mode, stack, nots, ands, ors, pending = state
+        low = text.lower() if kind == 'atom' else None
+
+        if mode == _OPERAND:
+            if kind == 'lpar':
+                return (_OPERAND, ((nots, ands, ors), stack), 0, None, None, None)
+            if kind != 'atom':
+                raise _Invalid(f'expected a parameter, not {text!r}')
+            if low.startswith('not'):
+                if low != 'not':
+                    raise _Invalid(f'ambiguous not in {text!r}')
+                return (_OPERAND, stack, nots + 1, ands, ors, None)
+            if not self._valid_name(text):
+                raise _Invalid(f'invalid parameter {text!r}')
+            return (_NAME, stack, nots, ands, ors, (text,))
+
+        if mode == _NAME:
+            name = pending[0]
+            if kind == 'op' and self._engine.condition and _name_re.match(name):
+                return (_VALUE, stack, nots, ands, ors, (name, text))
+            if low is not None and low.startswith('between') and self._engine.between:
+                if low != 'between' or not _name_re.match(name):
+                    raise _Invalid(f'ambiguous between in {text!r}')
+                return (_VALUE1, stack, nots, ands, ors, (name,))
+            if low in ('in', 'not') and self._engine.in_list and _name_re.match(name):
+                if low == 'not':
+                    return (_NOT, stack, nots, ands, ors, (name,))
+                return (_LIST, stack, nots, ands, ors, (name, 'in', None))
+            word = self._word(name)
+            if word is None:
+                raise _Invalid(f'expected an operator, not {text!r}')
+            return self._step(self._push(stack, nots, ands, ors, word), kind, text)
+
+        if mode in (_VALUE, _VALUE1, _VALUE2):
+            value = self._extract_value(kind, text)
+            if mode == _VALUE1:
+                return (_AND, stack, nots, ands, ors, pending + (value,))
+            if mode == _VALUE:
+                name, operator = pending
+                operand = self._build(self._engine.condition,
+                                      {'parameter': name, 'operator': operator, 'value': value})
+            else:
+                name, value1 = pending
+                operand = self._build(self._engine.between,
+                                      {'parameter': name, 'operator': 'between',
+                                       'value1': value1, 'value2': value})
+            return self._push(stack, nots, ands, ors, operand)
+
+        if mode == _AND:
+            if low != 'and':
+                raise _Invalid(f'expected and, not {text!r}')
+            return (_VALUE2, stack, nots, ands, ors, pending)
+
+        if mode == _NOT:
+            if low != 'in':
+                raise _Invalid(f'expected in, not {text!r}')
+            return (_LIST, stack, nots, ands, ors, pending + ('not in', None))
+
+        if mode == _LIST:
+            if kind != 'lpar':
+                raise _Invalid(f'expected (, not {text!r}')
+            return (_ITEM, stack, nots, ands, ors, pending)
+
+        if mode == _ITEM:
+            if kind not in _value_kinds or not _list_value_re.fullmatch(text):
+                raise _Invalid(f'unexpected value {text!r}')
+            # the values are a linked list, like the and-terms, so are not copied
+            name, operator, values = pending
+            value = text[1:-1] if kind == 'quoted' else text
+            return (_NEXT, stack, nots, ands, ors, (name, operator, (value, values)))
+
+        if mode == _NEXT:
+            if kind == 'comma':
+                return (_ITEM, stack, nots, ands, ors, pending)
+            if kind != 'rpar':
+                raise _Invalid(f'expected , or ), not {text!r}')
+            name, operator, values = pending
+            operand = self._build(self._engine.in_list,
+                                  {'parameter': name, 'operator': operator,
+                                   'values': _unlink(values)})
+            return self._push(stack, nots, ands, ors, operand)
+
+        # after a complete clause
+        if low == 'and':
+            return (_OPERAND, stack, 0, ands, ors, None)
+        if low == 'or':
+            return (_OPERAND, stack, 0, None, (self._join_ands(ands), ors), None)
+        if kind == 'rpar':
+            if stack is None:
+                raise _Invalid('unbalanced parentheses')
+            operand = self._join(ands, ors)
+            (nots, ands, ors), stack = stack
+            return self._push(stack, nots, ands, ors, operand)
+        raise _Invalid(f'expected and or or, not {text!r}')
+
+    def _push(self, stack, nots, ands, ors, operand):
+        ''' Add a complete operand, applying any pending nots '''
+        for __ in range(nots):
+            operand = self._engine.bnot([['not', operand]])
+        return (_AFTER, stack, 0, (operand, ands), ors, None)
+
+    def _build(self, action, data):
+        ''' Build the action of a complete clause, or raise _Invalid if it rejects it '''
+        try:
+            return action(data)
+        except (AssertionError, BooleanParserException) as exc:
+            # e.g. a parameter name with more than one "."
+            raise _Invalid(str(exc).strip())
+
+    def _extract_value(self, kind, text):
+        ''' Extract a condition value from a token '''
+        try:
+            return self._engine._value([(kind, text)], 0)
+        except Unsupported as exc:
+            raise _Invalid(str(exc))
+
+    def _valid_name(self, text):
+        ''' Whether a token can start a clause '''
+        engine = self._engine
+        return bool(((engine.condition or engine.between) and _name_re.match(text)) or
+                    (engine.words and _word_re.match(text)))
+
+    def _word(self, name):
+        ''' Return a word clause for a parameter, or None if it cannot be a word '''
+        if self._engine.words and _word_re.match(name):
+            return self._engine.words({'parameter': name})
+        return None
+
+    def _pending_operand(self, state):
+        ''' The operand of a state that ends on a parameter, None if there is none, or False
+        if the parameter is not a complete clause by itself '''
+        if state[0] != _NAME:
+            return None
+        word = self._word(state[5][0])
+        return False if word is None else word
+
+    def _expected(self, state):
+        ''' The tokens that can follow a state '''
+        mode, stack = state[:2]
+        if mode == _OPERAND:
+            return ('parameter', 'not', '(')
+        if mode in (_VALUE, _VALUE1, _VALUE2, _ITEM):
+            return ('value',)
+        if mode == _AND:
+            return ('and',)
+        if mode == _NOT:
+            return ('in',)
+        if mode == _LIST:
+            return ('(',)
+        if mode == _NEXT:
+            return (',', ')')
+
+        expected = []
+        if mode == _NAME:
+            name = state[5][0]
+            if self._engine.condition and _name_re.match(name):
+                expected.append('operator')
+            if self._engine.between and _name_re.match(name):
+                expected.append('between')
+            if self._engine.in_list and _name_re.match(name):
+                expected.extend(('in', 'not'))
+            if self._word(name) is None:
+                return expected
+        expected.extend(('and', 'or'))
+        if stack is not None:
+            expected.append(')')
+        return expected
+
+    def _partial(self, state):
+        ''' Build the expression parsed so far, closing any open parentheses '''
+        mode, stack, nots, ands, ors, pending = state
+        operand = self._pending_operand(state)
+        if operand:
+            ands = (self._push(stack, nots, ands, ors, operand))[3]
+
+        while True:
+            operand = self._join(ands, ors) if ands is not None or ors is not None else None
+            if stack is None:
+                return operand
+            (nots, ands, ors), stack = stack
+            if operand is not None:
+                ands = self._push(stack, nots, ands, ors, operand)[3]
+
+    def _join_ands(self, ands):
+        ''' Join linked and-terms into a single operand '''
+        terms = _unlink(ands)
+        return terms[0] if len(terms) == 1 else self._engine.band(
+            self._engine._interleave(terms, 'and'))
+
+    def _join(self, ands, ors):
+        ''' Join linked and-terms and or-terms into a single operand '''
+        terms = _unlink(ors)
+        if ands is not None:
+            terms.append(self._join_ands(ands))
+        return terms[0] if len(terms) == 1 else self._engine.bor(
+            self._engine._interleave(terms, 'or'))
+
+
+def _unlink(items):
+    ''' Convert a linked list of (item, rest) pairs, built last first, into a list '''
+    result = []
+    while items is not None:
+        item, items = items
+        result.append(item)
+    result.reverse()
+    return result
+
+
+def _shared_prefix(old, new):
+    ''' The length of the common prefix of two strings '''
+    if new.startswith(old):
+        return len(old)
+    size = min(len(old), len(new))
+    lo, hi = 0, size
+    # binary search on slice comparisons, which run in C
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if old[:mid] == new[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _unfinished(rest):
+    ''' Whether untokenizable trailing text is a token still being typed '''
+    if rest.startswith('"'):
+        return '"' not in rest[1:] and '\n' not in rest and '\r' not in rest
+    if rest == ':':
+        # the start of a placeholder
+        return True
+    return any(op.startswith(rest) and op != rest for op in _operators)
+
+
+def _could_start(prefix, expected):
+    ''' Whether an unfinished token could become one of the expected tokens '''
+    if prefix.startswith(('"', ':')):
+        return 'value' in expected
+    if prefix in _operators or not prefix[0].isalpha():
+        return 'operator' in expected
+    low = prefix.lower()
+    keywords = [word for word in ('and', 'or', 'not', 'between', 'in') if word in expected]
+    return any(word.startswith(low) for word in keywords)
@@ -0,0 +1,250 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: warmup.py
+# Project: boolean_parser
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 11:20:37 pm
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 11:20:37 pm
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+import argparse
+import collections
+import importlib
+import sys
+import threading
+import time
+
+from boolean_parser.parsers import Parser
+from boolean_parser.parsers.base import BooleanParserException
+
+
+WarmupReport = collections.namedtuple('WarmupReport', ['total', 'processed', 'parsed', 'compiled',
+                                                       'failed', 'seconds', 'done'])
+
+
+def read_corpus(corpus):
+    ''' Read the distinct expressions of a corpus, in order
+
+    Parameters:
+        corpus: str | iterable
+            The path to a file with one expression per line, or an iterable of expressions.
+            Blank lines and lines starting with "#" are skipped.
+
+    Returns:
+        A list of the distinct expressions, in order of first appearance
+    '''
+    if isinstance(corpus, str):
+        with open(corpus, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    else:
+        lines = corpus
+    values = (line.strip() for line in lines)
+    return list(dict.fromkeys(v for v in values if v and not v.startswith('#')))
+
+
+class Warmup(object):
+    ''' Pre-parse a corpus of expressions to fill the parse caches of a parser class
+
+    After a process starts, the first parse of each popular expression pays the full
+    parsing cost, and the first SQLAlchemy filter of it pays for building the filter
+    clauses.  A warm-up parses every expression of a corpus once, e.g. at process start,
+    so that cost is paid outside of request paths.  The parsed expressions are kept by
+    the parse caches enabled on the parser class, see ``Parser.enable_cache`` and
+    ``Parser.enable_disk_cache``, so at least one of them must be enabled.  With
+    ``models``, each parsed expression is also passed to
+    :py:meth:`~boolean_parser.mixins.sqla.SQLAMixin.filter`, which remembers the clause built
+    for those models on the cached expression.  Pass the same models, or
+    :py:class:`~boolean_parser.mixins.sqla.FieldRegistry`, that the application filters with.
+
+    Expressions that fail to parse or filter are counted and skipped.  Use
+    :py:meth:`start` to run in a background thread, and :py:attr:`report` to follow the
+    progress.
+
+    Parameters:
+        parser: class
+            The parser class to warm up.  Default is ``Parser``.
+        models: list
+            SQLAlchemy models to build the filter of each expression against, if any
+        progress: callable
+            A function called with a :py:class:`WarmupReport` every ``every`` expressions,
+            and once at the end
+        every: int
+            The number of expressions between progress reports.  Default is 100.
+
+    Raises:
+        BooleanParserException: when no parse cache is enabled on the parser class
+
+    Example:
+        >>> from boolean_parser.parsers import SQLAParser
+        >>> from boolean_parser.warmup import Warmup
+        >>> SQLAParser.enable_cache(maxsize=10000)
+        >>> warmup = Warmup(SQLAParser, models=[ModelA]).start('popular.txt')
+        >>> warmup.join()
+        WarmupReport(total=250, processed=250, parsed=250, compiled=250, failed=0, seconds=0.4,
+                     done=True)
+    '''
+
+    def __init__(self, parser=None, models=None, progress=None, every=100):
+        self.parser = parser or Parser
+        if self.parser.cache_info() is None and self.parser.disk_cache_info() is None:
+            raise BooleanParserException(f'enable a parse cache on {self.parser.__name__} '
+                                         'before warming it up')
+        assert isinstance(every, int) and every > 0, 'every must be a positive integer'
+        self.models = models
+        self.progress = progress
+        self.every = every
+        self.errors = []
+        self._counts = [0, 0, 0, 0, 0]
+        self._start = self._end = None
+        self._thread = None
+
+    def __repr__(self):
+        return f'<Warmup(parser={self.parser.__name__}, report={self.report})>'
+
+    @property
+    def report(self):
+        ''' The progress of the warm-up so far, as a :py:class:`WarmupReport` '''
+        if self._start is None:
+            return WarmupReport(*self._counts, 0.0, False)
+        end = self._end if self._end is not None else time.perf_counter()
+        return WarmupReport(*self._counts, end - self._start, self._end is not None)
+
+    def run(self, corpus):
+        ''' Warm up the parser with a corpus of expressions, in this thread
+
+        Parameters:
+            corpus: str | iterable
+                The path to a file with one expression per line, or an iterable of
+                expressions.  See :py:func:`read_corpus`.
+
+        Returns:
+            The final :py:class:`WarmupReport`
+        '''
+        self._start = time.perf_counter()
+        self._end = None
+        self.errors = []
+        values = read_corpus(corpus)
+        counts = self._counts = [len(values), 0, 0, 0, 0]
+        parser = self.parser()
+        for idx, value in enumerate(values, 1):
+            try:
+                expression = parser.parse(value)
+                counts[2] += 1
+                if self.models is not None:
+                    expression.filter(self.models)
+                    counts[3] += 1
+            except Exception as e:
+                # a warm-up must never fail the process it runs in
+                counts[4] += 1
+                self.errors.append((value, e))
+            counts[1] = idx
+            if self.progress is not None and idx % self.every == 0 and idx < len(values):
+                self.progress(self.report)
+        self._end = time.perf_counter()
+        if self.progress is not None:
+            self.progress(self.report)
+        return self.report
+
+    def start(self, corpus):
+        ''' Warm up the parser with a corpus of expressions, in a background thread
+
+        The thread is a daemon thread, so it does not keep the process alive.
+
+        Parameters:
+            corpus: str | iterable
+                The path to a file with one expression per line, or an iterable of
+                expressions.  See :py:func:`read_corpus`.
+
+        Returns:
+            The warm-up itself
+        '''
+        assert self._thread is None or not self._thread.is_alive(), \
+            'the warm-up is already running'
+        self._thread = threading.Thread(target=self.run, args=(corpus,), daemon=True,
+                                        name='boolean_parser-warmup')
+        self._thread.start()
+        return self
+
+    def join(self, timeout=None):
+        ''' Wait for a background warm-up to finish
+
+        Parameters:
+            timeout: float
+                The maximum number of seconds to wait.  Default is to wait until done.
+
+        Returns:
+            The :py:class:`WarmupReport` so far
+        '''
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.report
+
+
+def _import(path):
+    ''' Import an object from a "module:name" path '''
+    module, __, name = path.partition(':')
+    obj = importlib.import_module(module)
+    for part in name.split('.') if name else ():
+        obj = getattr(obj, part)
+    return obj
+
+
+def main(argv=None):
+    ''' Warm up the disk cache of a parser class from a corpus file
+
+    Parses every expression of a corpus into the
+    :py:class:`~boolean_parser.cache.DiskCache` at the given path, so all processes
+    using that disk cache, e.g. after a deploy, find them already parsed.  Progress and
+    timing are printed to stderr.  Run with ``python -m boolean_parser.warmup --help``.
+
+    The disk cache only stores parsed expressions, not their SQLAlchemy filter clauses, so
+    ``--models`` only checks that the filter of each expression can be built against the
+    given models, and reports those that cannot as failed.  Use :py:class:`Warmup` with
+    ``models`` in the application process itself to also warm up the filter clauses.
+
+    Parameters:
+        argv: list
+            The command line arguments.  Default is ``sys.argv[1:]``.
+
+    Returns:
+        The exit status, 0 unless an expression failed to parse
+    '''
+    parser = argparse.ArgumentParser(prog='boolean_parser_warmup', description=(
+        'Pre-parse a corpus of expressions, one per line, into a boolean_parser disk cache'))
+    parser.add_argument('corpus', help='the corpus file, with one expression per line')
+    parser.add_argument('--cache', required=True, help='the path of the disk cache database')
+    parser.add_argument('--max-bytes', type=int, default=2 ** 28,
+                        help='the maximum size of the disk cache, in bytes')
+    parser.add_argument('--parser', default='boolean_parser.parsers:Parser',
+                        help='the parser class, as "module:Class"')
+    parser.add_argument('--models', nargs='+', metavar='MODEL',
+                        help='SQLAlchemy models to check that filters can be built against, '
+                        'as "module:Class".  Only validates, the filters are not cached')
+    parser.add_argument('--every', type=int, default=100,
+                        help='the number of expressions between progress reports')
+    args = parser.parse_args(argv)
+
+    parser_class = _import(args.parser)
+    parser_class.enable_disk_cache(args.cache, max_bytes=args.max_bytes)
+    models = [_import(model) for model in args.models] if args.models else None
+
+    def progress(report):
+        print(f'warmed up {report.processed}/{report.total} expressions in '
+              f'{report.seconds:.2f} s', file=sys.stderr)
+
+    warmup = Warmup(parser_class, models=models, progress=progress, every=args.every)
+    report = warmup.run(args.corpus)
+    for value, error in warmup.errors:
+        print(f'failed: {value!r}: {error}', file=sys.stderr)
+    print(f'{report.parsed} parsed, {report.compiled} filters checked, {report.failed} failed, '
+          f'{parser_class.disk_cache_info().currsize} cached', file=sys.stderr)
+    return 1 if report.failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
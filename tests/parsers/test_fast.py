@@ -0,0 +1,166 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: test_fast.py
+# Project: parsers
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 11:48:20 am
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 11:48:20 am
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+
+import random
+
+import pytest
+from boolean_parser.actions.boolean import BaseBool
+from boolean_parser.parsers import Parser, SQLAParser
+from boolean_parser.parsers.base import BooleanParserException
+from boolean_parser.parsers.fast import FastEngine
+
+#
+# conformance of the fast engine against the pyparsing grammar
+#
+
+
+def dump(expr):
+    ''' reduce a parsed expression to comparable python structures '''
+    if isinstance(expr, BaseBool):
+        return (type(expr).__name__, expr.logicop, tuple(dump(c) for c in expr.conditions))
+    return (type(expr).__name__, expr.data, expr.base, expr.name,
+            getattr(expr, 'operator', None), getattr(expr, 'value', None),
+            getattr(expr, 'value2', None), getattr(expr, 'values', None))
+
+
+def both(parser, value):
+    ''' parse a value with both engines '''
+    results = []
+    for engine in ('pyparsing', 'fast'):
+        try:
+            results.append(dump(parser(value, engine=engine).parse()))
+        except BooleanParserException as e:
+            results.append(('error', str(e)))
+    return results
+
+
+conditions = ['x > 5', 'a.b <= -3.5', 'modela.x == 1', 'y != null', 'z = some_str*',
+              'x & ~256', 'x | 8', 'n >= +5.5e3', 'name == "a string"', 'x between 1 and 5',
+              'x BETWEEN 1 AND 5', 'q == ""', 'x>5', 'x.y>=-2', 'x > :xmin',
+              'x between :lo and :hi', 'x==:_a1', 'x in (1, 2, 3)', 'a.b NOT IN ("c d", :p, ~2)',
+              'x in(5)', 'x not  in ( a*,b )']
+
+expressions = conditions + [
+    'x > 5 and y < 3',
+    'x > 5 AND y < 3 OR z == 2',
+    'x > 5 or y < 3 and not z == 2',
+    'not not x > 1',
+    'NOT x > 1',
+    '(x > 5)',
+    '((x > 5))',
+    '(a > 1 and b < 2) and c > 3',
+    'a > 1 and (b < 2 and c > 3)',
+    'a > 1 and b < 2 and c > 3 or d > 4',
+    'not (a > 1 or b < 2) and c between 1 and 3',
+    'x between 1 and 5 and y > 2',
+    '(x > 1)and(y < 2)',
+    'not(x > 1)',
+    'and > 5',
+    'x > and',
+]
+
+# inputs where pyparsing has quirks, or errors, that the fast engine defers to pyparsing
+quirks = ['nothing > 5', 'x > 5 orange', 'x > 5 garbage', 'x>5and y<2', 'x > "a\\tb"',
+          'x > 5 and', '(x > 5', 'x > 5)', '', 'x >', 'x betweenish 1 and 2', 'x5 > 3 andy',
+          'x => 5', 'x > 5 ~3', 'nota', 'a-b > 5', 'x > 5 +3', 'x > :', 'x > :5', 'x in ()',
+          'x in (1,)', 'x in 1', 'x not (1)', 'x in (1', 'x in (a b)', 'x into (1)']
+
+words = ['stuff', 'stuff and things', 'not stuff', 'a and (b or c)', 'note', 'x5', 'x.y',
+         'alpha or beta > 3']
+
+
+def random_expression(rng, depth=0):
+    ''' generate a random expression from the built-in clauses '''
+    roll = rng.random()
+    if depth > 3 or roll < 0.4:
+        return rng.choice(conditions)
+    if roll < 0.5:
+        return 'not ' + random_expression(rng, depth + 1)
+    if roll < 0.65:
+        return '(' + random_expression(rng, depth + 1) + ')'
+    op = rng.choice([' and ', ' or ', ' AND ', ' Or '])
+    return random_expression(rng, depth + 1) + op + random_expression(rng, depth + 1)
+
+
+rng = random.Random(1234)
+generated = [random_expression(rng) for __ in range(150)]
+
+
+@pytest.mark.parametrize('parser', [Parser, SQLAParser])
+@pytest.mark.parametrize('value', expressions + quirks)
+def test_conformance(parser, value):
+    pyparse, fast = both(parser, value)
+    assert pyparse == fast
+
+
+@pytest.mark.parametrize('value', words)
+def test_conformance_words(value):
+    pyparse, fast = both(Parser, value)
+    assert pyparse == fast
+
+
+@pytest.mark.parametrize('parser', [Parser, SQLAParser])
+def test_conformance_generated(parser):
+    for value in generated:
+        pyparse, fast = both(parser, value)
+        assert pyparse == fast, value
+
+
+@pytest.mark.parametrize('value', expressions + generated)
+def test_fast_path_used(value):
+    ''' common expressions are handled without falling back '''
+    assert SQLAParser.get_grammar().fast_engine.parse(value) is not None
+
+
+@pytest.mark.parametrize('value', quirks)
+def test_quirks_fall_back(value):
+    assert Parser.get_grammar().fast_engine.parse(value) is None
+
+
+def test_fast_sqla_classes():
+    expr = SQLAParser('a.x > 1 and not a.y < 2', engine='fast').parse()
+    assert type(expr).__name__ == 'SQLAAnd'
+    assert type(expr.conditions[0]).__name__ == 'SQLACondition'
+    assert type(expr.conditions[1]).__name__ == 'SQLANot'
+    assert expr.conditions[0].parsed_clause is None
+
+
+def test_custom_clauses_unsupported():
+    import pyparsing as pp
+    street = pp.Group(pp.Word(pp.nums) + pp.Word(pp.alphas)).setResultsName('street')
+    assert FastEngine.from_clauses([street], [None], Parser._bools) is None
+
+
+def test_words_before_condition_unsupported():
+    from boolean_parser.clauses import condition, words
+    from boolean_parser.actions.clause import Condition, Word
+    assert FastEngine.from_clauses([words, condition], [Word, Condition], Parser._bools) is None
+
+
+def test_tokenize():
+    tokens = FastEngine.tokenize('(a.x>=5 and b == "c d")')
+    assert tokens == [('lpar', '('), ('atom', 'a.x'), ('op', '>='), ('atom', '5'),
+                      ('atom', 'and'), ('atom', 'b'), ('op', '=='), ('quoted', '"c d"'),
+                      ('rpar', ')')]
+    tokens = FastEngine.tokenize('x not in (1, "a b") or (y)')
+    assert tokens == [('atom', 'x'), ('atom', 'not'), ('atom', 'in'), ('list', '(1, "a b")'),
+                      ('atom', 'or'), ('lpar', '('), ('atom', 'y'), ('rpar', ')')]
+
+
+def test_large_list():
+    value = 'x in (' + ', '.join(str(i) for i in range(100000)) + ') and y > 1'
+    expr = Parser(engine='fast').parse(value)
+    assert len(expr.conditions[0].values) == 100000
+    assert expr.conditions[0].values[-1] == '99999'
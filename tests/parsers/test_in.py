@@ -0,0 +1,220 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: test_in.py
+# Project: parsers
+# Author: Brian Cherinka
+# Created: Sunday, 18th October 2026 5:12:36 am
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Sunday, 18th October 2026 5:12:36 am
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+import datetime
+import time
+
+import pytest
+from sqlalchemy import BigInteger, Column, Integer, String, create_engine, select
+from sqlalchemy.dialects import mysql, postgresql
+from sqlalchemy.orm import declarative_base
+
+from boolean_parser.canonical import canonical
+from boolean_parser.mixins.sqla import InArray, SQLAMixin
+from boolean_parser.parsers import Parser, SQLAParser
+from boolean_parser.parsers.base import BooleanParserException
+from boolean_parser.schema import Schema
+from boolean_parser.serialize import dumps, loads
+from tests.models import ModelA
+
+
+def _sql(value, **kwargs):
+    f = SQLAParser(value).parse().filter(ModelA, **kwargs)
+    return str(f.compile(compile_kwargs={'literal_binds': True}))
+
+
+@pytest.mark.parametrize('engine', ['pyparsing', 'fast'])
+def test_parse(engine):
+    expr = Parser('x in (1, 2) and a.b NOT IN ("c d", :p, ~2)', engine=engine).parse()
+    first, second = expr.conditions
+    assert (first.operator, first.values, first.value) == ('in', ('1', '2'), None)
+    assert (second.operator, second.values) == ('not in', ('c d', ':p', '2'))
+    assert second.fullname == 'a.b'
+    assert second.placeholders == ('p',)
+    assert second.input_clause == 'a.b not in (c d, :p, 2)'
+    assert repr(first) == 'x in (1, 2)'
+
+
+def test_serialize_and_canonical():
+    expr = SQLAParser('x in (3, 1, 2, 1) or y not in (b, "a c")').parse()
+    assert loads(dumps(expr)) == expr
+    assert loads(dumps(expr)).conditions[0].values == ('3', '1', '2', '1')
+    assert canonical(expr) == 'x in (1, 2, 3) or y not in ("a c", b)'
+    assert expr == SQLAParser('y NOT IN ("a c", b) or x IN (1, 2, 3)').parse()
+
+
+def test_schema():
+    class TypedParser(SQLAParser):
+        pass
+
+    TypedParser.build_parser(schema=Schema({'x': int, 'dates': datetime.date}))
+    expr = TypedParser('x in (1, :a, null) and dates in (2020-01-02)').parse()
+    assert expr.conditions[0].typed_values == (1, ':a', 'null')
+    assert expr.conditions[1].typed_values == (datetime.date(2020, 1, 2),)
+    with pytest.raises(BooleanParserException, match='expects a int value'):
+        TypedParser('x in (1, b)').parse()
+
+
+@pytest.mark.parametrize('value, exp',
+                         [('modela.x in (1, 2, 2, 3)', 'modela.x IN (1, 2, 3)'),
+                          ('modela.x not in (1, 2)', '(modela.x NOT IN (1, 2))'),
+                          ('modela.x in (1, null)', 'modela.x IN (1) OR modela.x IS NULL'),
+                          ('modela.x not in (1, null)',
+                           '(modela.x NOT IN (1)) AND modela.x IS NOT NULL'),
+                          ('modela.x in (null)', 'modela.x IS NULL'),
+                          ('modela.name in (A, "b c")', "lower(modela.name) IN ('a', 'b c')"),
+                          ('modela.dates in (2020-01-01, 2020-01-02)',
+                           "modela.dates IN ('2020-01-01', '2020-01-02')"),
+                          ('modela.bools in (true)', 'modela.bools IN (true)')],
+                         ids=['in', 'not_in', 'null', 'not_null', 'only_null', 'string', 'dates',
+                              'bools'])
+def test_sql(value, exp):
+    assert _sql(value) == exp
+
+
+@pytest.mark.parametrize('string_match, exp',
+                         [('exact', "modela.name IN ('A', 'b')"),
+                          ('lower', "lower(modela.name) IN ('a', 'b')"),
+                          ('collate:NOCASE', '(modela.name COLLATE "NOCASE") IN (\'A\', \'b\')')])
+def test_string_match(string_match, exp):
+    assert _sql('modela.name in (A, b)', string_match=string_match) == exp
+
+
+def test_placeholders():
+    f = SQLAParser('modela.x in (1, :a, :b)').parse().filter(ModelA)
+    assert str(f.compile()) == 'modela.x IN (__[POSTCOMPILE_x_1]) OR modela.x = :a OR ' \
+        'modela.x = :b'
+    f = SQLAParser('modela.name not in (:a)').parse().filter(ModelA)
+    assert str(f.compile()) == 'lower(modela.name) != lower(:a)'
+
+
+def test_invalid_value():
+    with pytest.raises(BooleanParserException, match='expects a int value'):
+        SQLAParser('modela.x in (1, b)').parse().filter(ModelA)
+
+
+def test_array_field():
+    Base = declarative_base()
+
+    class Arrays(Base):
+        __tablename__ = 'arrays'
+        pk = Column(BigInteger, primary_key=True)
+        values = Column(postgresql.ARRAY(Integer))
+
+    with pytest.raises(BooleanParserException, match='is an array'):
+        SQLAParser('arrays.values in (1, 2)').parse().filter(Arrays)
+
+
+def _large(op='in', size=1000):
+    return f'modela.x {op} (' + ', '.join(str(i) for i in range(size)) + ')'
+
+
+@pytest.mark.parametrize('op', ['in', 'not in'])
+def test_large_list(op):
+    f = SQLAParser(_large(op)).parse().filter(ModelA)
+    assert isinstance(f, InArray)
+    array = '!= ALL' if op == 'not in' else '= ANY'
+    assert str(f.compile()) == f'modela.x {array} (:modela.x_1)'
+
+    compiled = f.compile(dialect=postgresql.dialect())
+    assert str(compiled) == f'modela.x {array} (%(modela.x_1)s::INTEGER[])'
+    assert compiled.params == {'modela.x_1': list(range(1000))}
+
+    compiled = f.compile(create_engine('sqlite://'))
+    assert str(compiled) == f'modela.x {op.upper()} (SELECT value FROM json_each(?))'
+
+    # other databases get a plain IN clause
+    compiled = f.compile(dialect=mysql.dialect())
+    clause = f'modela.x {op.upper()} (__[POSTCOMPILE_modela.x_1])'
+    assert str(compiled) == (f'({clause})' if op == 'not in' else clause)
+    assert compiled.construct_params()['modela.x_1'] == list(range(1000))
+
+
+def test_large_list_cached_values(monkeypatch):
+    # a compiled statement reused from the cache binds the values of each new list
+    monkeypatch.setattr(SQLAMixin, 'in_list_threshold', 2)
+    first = select(ModelA.pk).where(SQLAParser('modela.x in (1, 2, 3)').parse().filter(ModelA))
+    second = select(ModelA.pk).where(SQLAParser('modela.x in (4, 5, 6, 7)').parse().filter(
+        ModelA))
+    key = second._generate_cache_key()
+    assert first._generate_cache_key() == key
+    compiled = first.compile(dialect=mysql.dialect(), cache_key=first._generate_cache_key())
+    params = compiled.construct_params(extracted_parameters=key[1])
+    assert [4, 5, 6, 7] in params.values()
+
+
+def test_threshold(monkeypatch):
+    value = _large(size=10)
+    assert not isinstance(SQLAParser(value).parse().filter(ModelA), InArray)
+    monkeypatch.setattr(SQLAMixin, 'in_list_threshold', 5)
+    assert isinstance(SQLAParser(value).parse().filter(ModelA), InArray)
+    monkeypatch.setattr(SQLAMixin, 'in_list_threshold', None)
+    assert not isinstance(SQLAParser(_large()).parse().filter(ModelA), InArray)
+
+
+@pytest.fixture()
+def batch(model_a_factory):
+    model_a_factory.create_batch(20)
+
+
+@pytest.mark.parametrize('value, plain',
+                         [('modela.x in (1, 2, 7)',
+                           'modela.x == 1 or modela.x == 2 or modela.x == 7'),
+                          ('modela.x not in (1, 2, 7)',
+                           'modela.x != 1 and modela.x != 2 and modela.x != 7'),
+                          ('modela.x in (3, :a) and modela.y not in (:a, 4)',
+                           '(modela.x == 3 or modela.x == :a) and modela.y != :a and '
+                           'modela.y != 4')],
+                         ids=['in', 'not_in', 'placeholders'])
+def test_query(session, batch, value, plain):
+    query = session.query(ModelA.pk).order_by(ModelA.pk).params(a=5)
+    expected = query.filter(SQLAParser(plain).parse().filter(ModelA)).all()
+    assert query.filter(SQLAParser(value).parse().filter(ModelA)).all() == expected
+
+
+@pytest.mark.parametrize('threshold', [None, 5])
+def test_query_large(session, batch, monkeypatch, threshold):
+    monkeypatch.setattr(SQLAMixin, 'in_list_threshold', threshold)
+    query = session.query(ModelA.pk).order_by(ModelA.pk)
+    for op, plain in (('in', 'modela.x <= 9'), ('not in', 'modela.x > 9')):
+        expected = query.filter(SQLAParser(plain).parse().filter(ModelA)).all()
+        value = f'modela.x {op} (' + ', '.join(str(i) for i in range(10)) + ')'
+        assert query.filter(SQLAParser(value).parse().filter(ModelA)).all() == expected
+
+
+Base = declarative_base()
+
+
+class Table(Base):
+    __tablename__ = 'table'
+    pk = Column(BigInteger, primary_key=True)
+    x = Column(Integer)
+    name = Column(String)
+
+
+@pytest.mark.parametrize('field, template', [('x', '{}'), ('name', 'n{}')])
+def test_end_to_end(field, template):
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    with engine.connect() as conn:
+        conn.execute(Table.__table__.insert(),
+                     [{'pk': i, 'x': i, 'name': f'n{i}'} for i in range(20000)])
+        value = f'table.{field} in (' + \
+            ', '.join(template.format(i) for i in range(0, 200000, 2)) + ')'
+        start = time.perf_counter()
+        expr = SQLAParser(engine='fast').parse(value)
+        rows = conn.execute(select(Table.pk).where(expr.filter(Table))).all()
+        elapsed = time.perf_counter() - start
+    assert len(rows) == 10000
+    assert elapsed < 1
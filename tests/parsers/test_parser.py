@@ -13,9 +13,15 @@
 
 from __future__ import print_function, division, absolute_import
 
+from concurrent.futures import ThreadPoolExecutor
+
+import pyparsing as pp
 import pytest
 from boolean_parser.parsers import Parser
-from boolean_parser.actions.clause import Condition
+from boolean_parser.parsers.base import (BooleanParserException, Grammar, Limits,
+                                         ParseLimitExceeded)
+from boolean_parser.actions.clause import Condition, Word
+from boolean_parser.clauses import condition, between_cond, words
 
 
 @pytest.mark.parametrize('value, exp', [('stuff', 'stuff')])
@@ -67,3 +73,225 @@ def test_parser_conditions(value, conditions):
         reps = [repr(c) for c in pp.conditions]
         assert reps == conditions
         assert isinstance(pp.conditions[0], Condition)
+
+
+class PackratParser(Parser):
+    ''' a parser built with packrat memoization enabled '''
+
+
+PackratParser.build_parser(clauses=[condition, between_cond, words],
+                           actions=[Condition, Condition, Word], packrat=1000)
+
+
+@pytest.mark.parametrize('value', ['a > 5', '((a > 5 and (b < 3 or not c == 2)))',
+                                   'stuff and things'])
+def test_packrat_parse(value):
+    assert PackratParser.get_grammar().packrat == 1000
+    assert repr(PackratParser(value).parse()) == repr(Parser(value).parse())
+
+
+def test_packrat_is_scoped():
+    PackratParser('((a > 5))').parse()
+    assert pp.ParserElement._packratEnabled is False
+    assert pp.ParserElement._parse == pp.ParserElement._parseNoCache
+
+
+def test_packrat_context_restores_on_error():
+    with pytest.raises(BooleanParserException):
+        PackratParser('(a > 5').parse()
+    assert pp.ParserElement._packratEnabled is False
+
+
+batch = ['a > 5', 'b < 3', 'a > 5', '> a', 'a > 5 and b < 3', 'a.b.c > 1']
+
+
+def _check_batch(results):
+    assert len(results) == len(batch)
+    assert [repr(r) for i, r in enumerate(results) if i not in (3, 5)] == \
+        ['a>5', 'b<3', 'a>5', 'and_(a>5, b<3)']
+    assert isinstance(results[3], BooleanParserException)
+    assert isinstance(results[5], BooleanParserException)
+    assert 'cannot have more than one' in str(results[5])
+    assert results[0] is results[2]
+    with pytest.raises(AttributeError):
+        results[0].value = '9'
+
+
+@pytest.mark.parametrize('workers', [None, 2])
+def test_parse_many(workers):
+    results = Parser.parse_many(batch, workers=workers, chunksize=2)
+    _check_batch(results)
+
+
+@pytest.mark.parametrize('workers', [None, 2])
+def test_parse_many_invalid_input(workers):
+    results = Parser.parse_many(['a > 5', 5, ['b'], 'b < 3'], workers=workers)
+    assert [repr(r) for r in results[::3]] == ['a>5', 'b<3']
+    assert all(isinstance(r, BooleanParserException) for r in results[1:3])
+    assert 'not int' in str(results[1])
+
+
+@pytest.mark.parametrize('workers', [None, 2])
+def test_parse_many_lazy(workers):
+    results = Parser.parse_many(iter(batch), workers=workers, chunksize=2, lazy=True)
+    assert not isinstance(results, list)
+    results = list(results)
+    assert len(results) == len(batch)
+    assert isinstance(results[3], BooleanParserException)
+    assert repr(results[4]) == 'and_(a>5, b<3)'
+    assert isinstance(results[5], BooleanParserException)
+
+
+def test_parse_does_not_mutate_parser():
+    parser = Parser('a > 5')
+    assert repr(parser.parse('b < 3')) == 'b<3'
+    assert parser.original_input == 'a > 5'
+    assert repr(parser.conditions) == 'a>5'
+
+
+def test_grammar_is_immutable():
+    grammar = Parser.get_grammar()
+    with pytest.raises(AttributeError):
+        grammar.engine = 'fast'
+    assert condition.parseAction == []
+
+
+def test_independent_grammars():
+    grammar = Grammar([condition], actions=[Condition], engine='fast')
+    assert repr(Parser('a > 5 and stuff').parse()) == 'and_(a>5, stuff)'
+    assert repr(Parser('a > 5 and b < 3', grammar=grammar).parse()) == 'and_(a>5, b<3)'
+    with pytest.raises(BooleanParserException):
+        Parser('stuff', grammar=grammar).parse()
+
+
+@pytest.mark.parametrize('engine', ['pyparsing', 'fast'])
+def test_threaded_parse(engine):
+    values = [f'a{i} > {i} and (b{i} < 3 or not c == {i})' for i in range(200)]
+    expected = [repr(Parser(value).parse()) for value in values]
+    parser = Parser(engine=engine)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(parser.parse, values))
+    assert [repr(r) for r in results] == expected
+
+
+def test_subclass_inherits_built_grammar():
+    class Base(Parser):
+        pass
+
+    Base.build_parser(clauses=[words], actions=[Word])
+
+    class Sub(Base):
+        pass
+
+    assert Sub.get_grammar() is Base.get_grammar()
+    assert isinstance(Sub('x > 1').parse(), Word)
+
+
+def test_subclass_with_defaults_builds_own_grammar():
+    class Base(Parser):
+        pass
+
+    Base.build_parser(clauses=[words], actions=[Word])
+
+    class Sub(Base):
+        _default_clauses = [condition]
+        _default_actions = [Condition]
+
+    assert repr(Sub('x > 1').parse()) == 'x>1'
+
+
+def test_class_grammar_attributes():
+    class Fresh(Parser):
+        _default_clauses = [condition, words]
+        _default_actions = [Condition, Word]
+
+    assert len(Fresh._clauses) == 2
+    assert Fresh._clause_actions == [[Condition], [Word]]
+    assert isinstance(Fresh._clause, pp.MatchFirst)
+    assert repr(Fresh._parser.parseString('x > 1')[0]) == 'x>1'
+
+
+def test_set_parse_actions_does_not_change_grammar():
+    class Hijack(Parser):
+        pass
+
+    Hijack.build_parser(clauses=[condition], actions=[Condition])
+    grammar = Hijack.get_grammar()
+    Hijack.set_parse_actions(clauses=[condition], actions=[lambda t: 'HIJACK'])
+    assert repr(grammar.parse('x > 1', engine='pyparsing')) == 'x>1'
+    assert repr(Hijack('x > 1').parse()) == 'x>1'
+    Hijack.build_parser()
+    assert Hijack('x > 1').parse() == 'HIJACK'
+
+
+def test_rebuild_keeps_settings():
+    class Rebuilt(Parser):
+        pass
+
+    Rebuilt.build_parser(engine='fast', packrat=500)
+    Rebuilt.build_parser()
+    assert Rebuilt.get_grammar().packrat == 500
+    assert Rebuilt.get_grammar().engine == 'fast'
+    Rebuilt.build_parser(packrat=False)
+    assert Rebuilt.get_grammar().packrat is None
+
+
+@pytest.mark.parametrize('limits, value, error',
+                         [(Limits(max_length=10), 'x > 1 and y < 2', 'length 15'),
+                          (Limits(max_depth=2), '(((x > 1)))', 'depth 3'),
+                          (Limits(max_depth=2), 'not not not x', 'depth 3'),
+                          (Limits(max_depth=3), 'not (not (x))', 'depth 4'),
+                          (Limits(max_terms=2), 'a or b and c', '3 terms')],
+                         ids=['length', 'parens', 'nots', 'mixed', 'terms'])
+@pytest.mark.parametrize('engine', ['pyparsing', 'fast'])
+def test_limits_exceeded(limits, value, error, engine):
+    grammar = Grammar([condition, between_cond, words], actions=[Condition, Condition, Word],
+                      limits=limits)
+    with pytest.raises(ParseLimitExceeded, match=error):
+        grammar.parse(value, engine=engine)
+
+
+@pytest.mark.parametrize('value',
+                         ['x between 1 and 2 and y', 'a and "b and c"', '(x) and not y',
+                          '(not a) or not (b)'])
+def test_limits_within(value):
+    limits = Limits(max_length=30, max_depth=2, max_terms=2)
+    grammar = Grammar([condition, between_cond, words], actions=[Condition, Condition, Word],
+                      limits=limits)
+    assert repr(grammar.parse(value)) == repr(Parser(value).parse())
+
+
+def test_limits_timeout():
+    class Limited(Parser):
+        pass
+
+    # pyparsing takes tens of seconds on deeply nested parentheses without packrat
+    Limited.build_parser(limits=Limits(timeout=0.1))
+    with pytest.raises(ParseLimitExceeded, match='time budget'):
+        Limited('(' * 8 + 'x > 1' + ')' * 8).parse()
+
+    # the fast engine and quick parses are unaffected
+    assert repr(Limited('(' * 8 + 'x > 1' + ')' * 8, engine='fast').parse()) == 'x>1'
+    assert repr(Limited('x > 1 and y < 2').parse()) == 'and_(x>1, y<2)'
+
+    # limits are kept on rebuild
+    Limited.build_parser(packrat=True)
+    assert Limited.get_grammar().limits.timeout == 0.1
+    Limited.build_parser(limits=Limits())
+    assert Limited.get_grammar().limits == Limits()
+
+
+def test_too_deep_for_pyparsing():
+    with pytest.raises(ParseLimitExceeded, match='nested too deeply'):
+        Parser('not ' * 3000 + 'x').parse()
+
+
+def test_limits_in_parse_many():
+    class Limited(Parser):
+        pass
+
+    Limited.build_parser(limits=Limits(max_terms=2))
+    results = Limited.parse_many(['x > 1', 'a or b or c'])
+    assert repr(results[0]) == 'x>1'
+    assert isinstance(results[1], ParseLimitExceeded)
+    assert isinstance(results[1], BooleanParserException)
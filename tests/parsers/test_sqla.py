@@ -12,10 +12,17 @@
 
 
 from __future__ import print_function, division, absolute_import
+import datetime
+import pickle
+
 import pytest
+from boolean_parser.mixins.sqla import FieldRegistry
 from boolean_parser.parsers import SQLAParser
+from boolean_parser.parsers.base import BooleanParserException
+from tests import models
 from tests.models import ModelA, ModelB
 from sqlalchemy.sql.expression import BinaryExpression, BooleanClauseList
+from sqlalchemy import select
 from sqlalchemy.orm import aliased
 
 
@@ -140,3 +147,167 @@ def test_query_with_filter(session, val, exp):
     f = _make_filter(val)
     res = session.query(ModelA).filter(f).all()
     assert len(res) == exp
+
+
+def test_filter_deep():
+    depth = 3000
+    value = ''.join(f'modela.x > {i} and (modela.y < {i} or ' for i in range(depth))
+    expr = SQLAParser(engine='fast').parse(value + 'modela.x == 1' + ')' * depth)
+    f = expr.filter([ModelA, ModelB])
+    assert isinstance(f, BooleanClauseList)
+    for __ in range(2 * depth):
+        f = f.clauses[-1]
+    assert str(f.compile(compile_kwargs={'literal_binds': True})) == 'modela.x = 1'
+
+
+@pytest.mark.parametrize('val, exp',
+                         [('modela.x > :xmin', 'modela.x > :xmin'),
+                          ('modela.x between :lo and :hi', 'modela.x BETWEEN :lo AND :hi'),
+                          ('modela.name == :name', 'lower(modela.name) = lower(:name)'),
+                          ('modela.name = :name',
+                           "lower(modela.name) LIKE '%' || lower(:name) || '%'"),
+                          ('modela.x & :mask', '(modela.x & :mask) > :param_1'),
+                          ('modela.x > :lim and modelb.z < :lim',
+                           'modela.x > :lim AND modelb.z < :lim')],
+                         ids=['gt', 'between', 'eqeqstr', 'eqstr', 'bitwise', 'shared'])
+def test_placeholder_filter(val, exp):
+    f = _make_filter(val)
+    assert str(f.compile()) == exp
+
+
+def test_placeholder_query(session):
+    expr = SQLAParser('modela.x > :xmin and modela.dates < :before').parse()
+    assert expr.placeholders == ['xmin', 'before']
+    query = session.query(ModelA).filter(expr.filter(ModelA))
+    for xmin in (-1, 5, 20):
+        res = query.params(xmin=xmin, before=datetime.date(2020, 1, 1)).all()
+        assert len(res) == session.query(ModelA).filter(ModelA.x > xmin).count()
+
+
+def test_field_registry():
+    ModelA2 = aliased(ModelA, name="modela2")
+    registry = FieldRegistry([ModelA, ModelB, ModelA2])
+    assert registry.lookup('x', base='modela').model is ModelA
+    assert registry.lookup('x', base='modela2').model is ModelA2
+    assert registry.lookup('z').field is ModelB.z
+    assert registry.lookup('z').python_type is float
+    assert registry.lookup('w') is None
+    # a base matches any table name containing it, as without a registry
+    assert registry.lookup('x', base='model').model is ModelA
+    assert registry.lookup('pk', base='modelb').model is ModelB
+
+
+@pytest.mark.parametrize('val',
+                         ['modela.x > 5 and modela2.x < 3', 'x > 1 or z < 2.5',
+                          'modela.name = Some_string and not modela.dates < 2020-01-01'])
+def test_filter_with_registry(val):
+    registry = FieldRegistry([ModelA, ModelB, aliased(ModelA, name="modela2")])
+    expected = str(_make_filter(val).compile(compile_kwargs={'literal_binds': True}))
+    f = SQLAParser(val).parse().filter(registry)
+    assert str(f.compile(compile_kwargs={'literal_binds': True})) == expected
+
+
+def test_filter_with_registry_module(session):
+    registry = FieldRegistry(models)
+    expr = SQLAParser('modela.x > 5').parse()
+    assert session.query(ModelA).filter(expr.filter(registry)).count() == \
+        session.query(ModelA).filter(expr.filter(models)).count()
+    with pytest.raises(BooleanParserException, match='does not have field w'):
+        SQLAParser('modela.w > 5').parse().filter(registry)
+
+
+def test_filter_checks_models_once(monkeypatch):
+    calls = []
+    check = FieldRegistry.__init__
+
+    def counted(self, models, prefill=True):
+        calls.append(models)
+        check(self, models, prefill=prefill)
+
+    monkeypatch.setattr(FieldRegistry, '__init__', counted)
+    expr = SQLAParser('modela.x > 5 and (modela.y < 2 or modela.x < 1)').parse()
+    expr.filter([ModelA, ModelB])
+    assert len(calls) == 1
+    registry = FieldRegistry([ModelA])
+    expr.filter(registry)
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize('val', ['modela.x > 5', 'modela.x > 5 and not modelb.z < 2'],
+                         ids=['condition', 'boolean'])
+def test_filter_memoized(val):
+    expr = SQLAParser(val).parse()
+    f = expr.filter([ModelA, ModelB])
+    # a new list of the same models is the same model set
+    assert expr.filter([ModelA, ModelB]) is f
+    assert expr.filter([ModelB, ModelA]) is not f
+    registry = FieldRegistry([ModelA, ModelB])
+    assert expr.filter(registry) is expr.filter(registry)
+    expr.clear_filters()
+    assert expr.filter([ModelA, ModelB]) is not f
+
+
+def test_filter_memoized_modified():
+    expr = SQLAParser('modela.x > 5 and modela.y < 2').parse()
+    f = expr.filter(ModelA)
+    expr.conditions = expr.conditions[:1]
+    assert str(expr.filter(ModelA).compile(compile_kwargs={'literal_binds': True})) == \
+        'modela.x > 5'
+    cond = SQLAParser('modela.x > 5').parse()
+    f = cond.filter(ModelA)
+    cond.value = '6'
+    assert cond.filter(ModelA) is not f
+    assert str(cond.filter(ModelA).compile(compile_kwargs={'literal_binds': True})) == \
+        'modela.x > 6'
+
+
+def test_filter_memoized_class_defaults(monkeypatch):
+    from boolean_parser.mixins.sqla import SQLAMixin
+    from boolean_parser.parsers.sqla import SQLACondition, SQLBoolBase
+    value = 'modela.name = jane and (modela.x = 1 or modela.x = 2)'
+    expr = SQLAParser(value).parse().freeze()
+    f = expr.filter(ModelA)
+    assert expr.filter(ModelA) is f
+    # changed class defaults rebuild the clause, as for a new parse
+    monkeypatch.setattr(SQLACondition, 'string_match', 'exact')
+    monkeypatch.setattr(SQLBoolBase, 'optimize', True)
+    fresh = SQLAParser(value).parse().filter(ModelA)
+    assert str(expr.filter(ModelA)) == str(fresh) == \
+        'modela.name LIKE :modela.name_1 AND modela.x IN (__[POSTCOMPILE_x_1])'
+    cond = SQLAParser('modela.x in (1, 2, 3)').parse()
+    f = cond.filter(ModelA)
+    monkeypatch.setattr(SQLAMixin, 'in_list_threshold', 2)
+    assert cond.filter(ModelA) is not f
+    assert cond.filter(ModelA) is cond.filter(ModelA)
+
+
+def test_filter_memoized_bounded(monkeypatch):
+    expr = SQLAParser('modela.x > 5').parse().freeze()
+    monkeypatch.setattr(type(expr), 'filter_cache_size', 2)
+    ModelA2, ModelA3 = aliased(ModelA, name='modela2'), aliased(ModelA, name='modela3')
+    f = expr.filter(ModelA)
+    expr.filter(ModelA2)
+    assert expr.filter(ModelA) is f
+    expr.filter(ModelA3)
+    assert len(expr._filters) == 2
+    assert expr.filter(ModelA2) is not expr.filter(ModelA)
+    monkeypatch.setattr(type(expr), 'filter_cache_size', 0)
+    assert expr.filter(ModelA) is not expr.filter(ModelA)
+
+
+def test_filter_memoized_pickle():
+    expr = SQLAParser('modela.x > 5 and modela.y < 2').parse()
+    expr.filter(ModelA)
+    result = pickle.loads(pickle.dumps(expr))
+    assert result == expr
+    assert getattr(result, '_filters', None) is None
+
+
+def test_filter_cache_key():
+    expr = SQLAParser('modela.x > 5 and modela.name = jane').parse()
+    stmt = select(ModelA).where(expr.filter(ModelA))
+    assert select(ModelA).where(expr.filter(ModelA)).compare(stmt)
+    # rebuilt clauses have the same statement cache key, with the same bound values
+    other = SQLAParser('modela.x > 5 and modela.name = jane').parse()
+    key = select(ModelA).where(other.filter(ModelA))._generate_cache_key()
+    assert key == stmt._generate_cache_key()
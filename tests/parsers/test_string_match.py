@@ -0,0 +1,176 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: test_string_match.py
+# Project: parsers
+# Author: Brian Cherinka
+# Created: Sunday, 18th October 2026 2:41:55 am
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Sunday, 18th October 2026 2:41:55 am
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+
+import pytest
+from sqlalchemy import BigInteger, Column, Index, String, create_engine, func, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import declarative_base
+
+from boolean_parser.parsers import SQLAParser
+from boolean_parser.parsers.sqla import SQLACondition
+
+
+Base = declarative_base()
+
+
+class People(Base):
+    ''' A stand-in table with a plain, a functional lower() and a case-insensitive index '''
+    __tablename__ = 'people'
+    pk = Column(BigInteger, primary_key=True)
+    name = Column(String)
+    lname = Column(String)
+    cname = Column(String(collation='NOCASE'))
+
+
+Index('ix_name', People.name)
+Index('ix_lname', func.lower(People.lname))
+Index('ix_cname', People.cname)
+
+
+@pytest.fixture(scope='module')
+def conn():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    with engine.connect() as conn:
+        # like PostgreSQL, so LIKE prefix matches can use plain indexes
+        conn.execute(text('PRAGMA case_sensitive_like=ON'))
+        conn.execute(People.__table__.insert(), [
+            {'pk': 1, 'name': 'Jane', 'lname': 'Jane', 'cname': 'Jane'},
+            {'pk': 2, 'name': 'jane', 'lname': 'jane', 'cname': 'jane'},
+            {'pk': 3, 'name': 'Janet', 'lname': 'Janet', 'cname': 'Janet'},
+            {'pk': 4, 'name': 'Mary Jane', 'lname': 'Mary Jane', 'cname': 'Mary Jane'}])
+        yield conn
+
+
+def _sql(value, string_match, dialect=None):
+    f = SQLAParser(value).parse().filter(People, string_match=string_match)
+    compiled = f.compile(dialect=dialect, compile_kwargs={'literal_binds': True})
+    return str(compiled)
+
+
+def _plan(conn, value, string_match):
+    f = SQLAParser(value).parse().filter(People, string_match=string_match)
+    stmt = select(People.pk).where(f)
+    sql = str(stmt.compile(conn.engine, compile_kwargs={'literal_binds': True}))
+    return ' '.join(row[-1] for row in conn.execute(text('EXPLAIN QUERY PLAN ' + sql)))
+
+
+@pytest.mark.parametrize('string_match, exp',
+                         [('ilike', ["lower(people.name) = lower('Ja')",
+                                     "lower(lower(people.name)) LIKE lower('%Ja%')"]),
+                          ('exact', ["people.name = 'Ja'", "people.name LIKE '%Ja%'"]),
+                          ('lower', ["lower(people.name) = 'ja'",
+                                     "lower(people.name) LIKE '%ja%'"]),
+                          ('prefix', ["people.name = 'Ja'", "people.name LIKE 'Ja%'"]),
+                          ('collate', ["people.name = 'Ja'", "people.name LIKE '%Ja%'"]),
+                          ('collate:NOCASE', ['(people.name COLLATE "NOCASE") = \'Ja\'',
+                                              '(people.name COLLATE "NOCASE") LIKE \'%Ja%\''])])
+def test_sql(string_match, exp):
+    assert _sql('people.name == Ja', string_match) == exp[0]
+    assert _sql('people.name = Ja', string_match) == exp[1]
+
+
+@pytest.mark.parametrize('value, string_match, exp',
+                         [('people.name between a and c', 'lower',
+                           "lower(people.name) BETWEEN 'a' AND 'c'"),
+                          ('people.name != Ja', 'exact', "people.name != 'Ja'"),
+                          ('people.name = *ne', 'prefix', "people.name LIKE '%ne'"),
+                          ('people.name = J*', 'lower', "lower(people.name) LIKE 'j%'"),
+                          ('people.name = null', 'exact', 'people.name IS NULL')],
+                         ids=['between', 'ne', 'wildcard', 'lowerwildcard', 'null'])
+def test_sql_operators(value, string_match, exp):
+    assert _sql(value, string_match) == exp
+
+
+@pytest.mark.parametrize('value, string_match, exp',
+                         [('people.name == :name', 'lower', 'lower(people.name) = lower(:name)'),
+                          ('people.name = :name', 'prefix', "people.name LIKE :name || '%'"),
+                          ('people.name = :name', 'exact',
+                           "people.name LIKE '%' || :name || '%'")],
+                         ids=['lower', 'prefix', 'exact'])
+def test_placeholders(value, string_match, exp):
+    f = SQLAParser(value).parse().filter(People, string_match=string_match)
+    assert str(f.compile()) == exp
+
+
+def test_postgresql():
+    dialect = postgresql.dialect()
+    assert _sql('people.name = Ja', 'prefix', dialect) == "people.name LIKE 'Ja%%'"
+    assert _sql('people.name == Ja', 'lower', dialect) == "lower(people.name) = 'ja'"
+    assert _sql('people.name = Ja', 'ilike', dialect) == \
+        "lower(people.name) ILIKE '%%Ja%%'"
+
+
+@pytest.mark.parametrize('value, string_match, index',
+                         [('people.name == Jane', 'exact', 'ix_name'),
+                          ('people.name < Jane', 'exact', 'ix_name'),
+                          ('people.name = Ja', 'prefix', 'ix_name'),
+                          ('people.lname == Jane', 'lower', 'ix_lname'),
+                          ('people.lname between a and k', 'lower', 'ix_lname'),
+                          ('people.lname == Jane', 'ilike', 'ix_lname'),
+                          ('people.cname == Jane', 'collate', 'ix_cname'),
+                          ('people.cname == Jane', 'collate:NOCASE', 'ix_cname'),
+                          ('people.name == Jane', 'ilike', None),
+                          ('people.name = Ja', 'ilike', None),
+                          ('people.name = Ja', 'exact', None),
+                          ('people.lname = Ja', 'lower', None)])
+def test_explain(conn, value, string_match, index):
+    plan = _plan(conn, value, string_match)
+    if index:
+        assert f'USING INDEX {index}' in plan
+    else:
+        assert plan.startswith('SCAN')
+
+
+@pytest.mark.parametrize('value, string_match, exp',
+                         [('people.name == jane', 'ilike', [1, 2]),
+                          ('people.name == jane', 'exact', [2]),
+                          ('people.lname == JANE', 'lower', [1, 2]),
+                          ('people.cname == JANE', 'collate', [1, 2]),
+                          ('people.name = Jane', 'exact', [1, 3, 4]),
+                          ('people.name = Jane', 'prefix', [1, 3]),
+                          ('people.lname = jane', 'lower', [1, 2, 3, 4])])
+def test_query(conn, value, string_match, exp):
+    f = SQLAParser(value).parse().filter(People, string_match=string_match)
+    assert [row.pk for row in conn.execute(select(People.pk).where(f).order_by(People.pk))] == exp
+
+
+def test_class_default(monkeypatch):
+    expr = SQLAParser('people.name == Ja and people.pk > 1').parse()
+    ilike = expr.filter(People)
+    assert "lower(people.name) = lower('Ja')" in str(ilike.compile(
+        compile_kwargs={'literal_binds': True}))
+    monkeypatch.setattr(SQLACondition, 'string_match', 'exact')
+    assert str(expr.conditions[0].filter(People).compile(
+        compile_kwargs={'literal_binds': True})) == "people.name = 'Ja'"
+    # remembered filters are rebuilt with the new default
+    exact = expr.filter(People)
+    assert exact is not ilike
+    assert "people.name = 'Ja'" in str(exact.compile(compile_kwargs={'literal_binds': True}))
+    assert expr.filter(People) is exact
+
+
+def test_remembered_per_strategy():
+    expr = SQLAParser('people.name == Ja').parse()
+    f = expr.filter(People, string_match='lower')
+    assert expr.filter(People, string_match='lower') is f
+    assert expr.filter(People, string_match='exact') is not f
+
+
+@pytest.mark.parametrize('string_match', ['upper', 'exact:NOCASE', 'collate:'],
+                         ids=['unknown', 'collation', 'empty'])
+def test_invalid(string_match):
+    with pytest.raises(AssertionError, match='string_match must be one of'):
+        SQLAParser('people.name == Ja').parse().filter(People, string_match=string_match)
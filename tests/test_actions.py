@@ -0,0 +1,146 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: test_actions.py
+# Project: tests
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 4:31:18 pm
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 4:31:18 pm
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+
+import pickle
+
+import pyparsing as pp
+import pytest
+from boolean_parser.actions.clause import Condition, Word
+from boolean_parser.clauses import condition, words
+from boolean_parser.parsers import Parser
+
+
+class KeepParser(Parser):
+    ''' a parser that keeps the raw pyparsed results '''
+
+
+KeepParser.build_parser(clauses=[condition, words], actions=[Condition, Word],
+                        keep_parse_results=True)
+
+
+@pytest.mark.parametrize('engine', ['pyparsing', 'fast'])
+def test_compact_nodes(engine):
+    expr = Parser('a > 5 and (b < 3 or stuff)', engine=engine).parse()
+    nodes = [expr, expr.conditions[0], expr.conditions[1], expr.conditions[1].conditions[1]]
+    for node in nodes:
+        assert not hasattr(node, '__dict__')
+    assert expr.conditions[0].parsed_clause is None
+
+
+@pytest.mark.parametrize('value, data',
+                         [('a.b > 5', {'parameter': 'a.b', 'operator': '>', 'value': '5'}),
+                          ('x & ~256', {'parameter': 'x', 'operator': '&', 'value': '~256'}),
+                          ('x between 1 and 2',
+                           {'parameter': 'x', 'operator': 'between', 'value1': '1',
+                            'value2': '2'}),
+                          ('stuff', {'parameter': 'stuff'})])
+def test_data_rebuilt(value, data):
+    expr = Parser(value).parse()
+    assert expr.data == data
+    assert list(expr.data) == list(data)
+
+
+def test_value2_default():
+    expr = Parser('x > 1').parse()
+    assert expr.value2 is None
+    assert Parser('x between 1 and 2').parse().value2 == '2'
+
+
+def test_keep_parse_results():
+    expr = KeepParser('a > 5 and stuff').parse()
+    assert KeepParser.get_grammar().fast_engine is None
+    assert isinstance(expr.conditions[0].parsed_clause, pp.ParseResults)
+    assert isinstance(expr.conditions[1].parsed_clause, pp.ParseResults)
+
+    # the setting is kept when the grammar is rebuilt
+    KeepParser.build_parser(engine='fast')
+    assert KeepParser.get_grammar().keep_parse_results is True
+
+
+@pytest.mark.parametrize('frozen', [False, True])
+def test_pickle(frozen):
+    expr = Parser('a > 5 and not (b between 1 and 3 or stuff)').parse()
+    if frozen:
+        expr.freeze()
+    copy = pickle.loads(pickle.dumps(expr))
+    assert repr(copy) == repr(expr)
+    assert copy.conditions[0].data == expr.conditions[0].data
+    if frozen:
+        with pytest.raises(AttributeError):
+            copy.conditions[0].value = '6'
+
+
+def test_params_ordered():
+    expr = Parser('c > 1 and (a < 2 or not c == 3) and b between 1 and 2 or a > 4').parse()
+    assert expr.params == ['c', 'a', 'b']
+    assert expr.params is not expr.params
+    leaves = [repr(leaf) for leaf in expr.iter_leaves()]
+    assert leaves == ['c>1', 'a<2', 'c==3', 'bbetween1and2', 'a>4']
+
+
+def test_params_memoized():
+    expr = Parser('a > 1 and (b < 2 or c == 3)').parse()
+    assert expr.leaves is expr.leaves
+    assert expr.conditions[1].params == ['b', 'c']
+
+    # replacing the conditions resets the remembered values
+    expr.conditions = expr.conditions[:1]
+    assert expr.params == ['a']
+
+
+def test_params_deep():
+    depth = 5000
+    value = '(' * depth + 'a > 1 and b < 2' + ')' * depth + ' or c == 3'
+    expr = Parser(engine='fast').parse(value)
+    assert expr.params == ['a', 'b', 'c']
+    assert len(expr.leaves) == 3
+
+
+def deep_expression(depth):
+    value = ''.join(f'x{i} > {i} and (y{i} < {i} or ' for i in range(depth))
+    return Parser(engine='fast').parse(value + 'z == 1' + ')' * depth)
+
+
+def test_deep_walks():
+    depth = 10000
+    expr = deep_expression(depth)
+    text = repr(expr)
+    assert text.startswith('and_(x0>0, or_(y0<0, and_(x1>1, ')
+    assert text.endswith('y9999<9999, z==1' + '))' * depth)
+    assert len(expr.params) == 2 * depth + 1
+    expr.freeze()
+    assert expr.leaves[-1]._frozen
+    assert repr(expr.normalize()) == text
+
+
+def test_wide_walks():
+    size = 100000
+    expr = Parser(engine='fast').parse(' or '.join(f'x{i} > {i}' for i in range(size)))
+    assert len(expr.conditions) == size
+    assert repr(expr).startswith('or_(x0>0, x1>1, ')
+    assert len(expr.params) == size
+    assert expr.freeze()._frozen
+
+
+@pytest.mark.parametrize('value, exp',
+                         [('x > 5', []),
+                          ('x > :xmin', ['xmin']),
+                          ('x between :lo and 5', ['lo']),
+                          ('x > :lim and not (y < :lim or z between :lo and :hi)',
+                           ['lim', 'lo', 'hi'])],
+                         ids=['none', 'one', 'between', 'nested'])
+def test_placeholders(value, exp):
+    expr = Parser(value).parse()
+    assert list(expr.placeholders) == exp
@@ -0,0 +1,253 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: test_cache.py
+# Project: tests
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 9:40:12 am
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 9:40:12 am
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+
+import multiprocessing
+import sqlite3
+import threading
+
+import pytest
+from boolean_parser.actions.clause import Condition
+from boolean_parser.cache import DiskCache, ParseCache
+from boolean_parser.clauses import condition
+from boolean_parser.parsers import Limits, Parser, SQLAParser
+from boolean_parser.parsers.base import ParseLimitExceeded
+
+
+@pytest.fixture()
+def cached():
+    ''' enable the parse cache on the base Parser for a single test '''
+    Parser.enable_cache(maxsize=2)
+    yield Parser
+    Parser.disable_cache()
+
+
+def test_lru_eviction():
+    cache = ParseCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    assert 'b' not in cache
+    assert 'a' in cache and 'c' in cache
+    info = cache.info()
+    assert (info.hits, info.misses, info.evictions, info.currsize) == (1, 0, 1, 2)
+
+
+def test_clear_resets_stats():
+    cache = ParseCache(maxsize=2)
+    cache.set('a', 1)
+    assert cache.get('b') is None
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.info().misses == 0
+
+
+def test_concurrent_access():
+    cache = ParseCache(maxsize=50)
+
+    def work(offset):
+        for i in range(500):
+            cache.set((offset, i % 100), i)
+            cache.get((offset, i % 100))
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    info = cache.info()
+    assert info.currsize == 50
+    assert info.hits == 8 * 500
+
+
+def test_parser_cache_hit(cached):
+    first = Parser('a > 5 and b < 3').parse()
+    second = Parser('a > 5 and b < 3').parse()
+    assert first is second
+    info = Parser.cache_info()
+    assert info.misses == 1
+    assert info.hits >= 1
+
+
+def test_cached_expression_is_frozen(cached):
+    expr = Parser('a > 5 and b < 3').parse()
+    assert isinstance(expr.conditions, tuple)
+    with pytest.raises(AttributeError):
+        expr.conditions[0].value = '6'
+    with pytest.raises(TypeError):
+        expr.conditions[0].data['value'] = '6'
+
+
+def test_cache_is_per_class(cached):
+    Parser('a > 5').parse()
+    assert SQLAParser.cache_info() is None
+    assert Parser.cache_info().currsize == 1
+
+
+def test_parser_cache_clear(cached):
+    Parser('a > 5').parse()
+    Parser.clear_cache()
+    assert Parser.cache_info().currsize == 0
+
+
+def test_rebuilt_grammar_misses(cached):
+    Parser('a > 5').parse()
+    Parser.build_parser()
+    Parser('a > 5').parse()
+    assert Parser.cache_info().misses == 2
+
+
+def test_uncached_expression_is_mutable():
+    expr = Parser('a > 5 and b < 3').parse()
+    assert isinstance(expr.conditions, tuple)
+    expr.conditions[0].value = '6'
+
+
+@pytest.fixture()
+def disk(tmp_path):
+    return DiskCache(str(tmp_path / 'cache.db'))
+
+
+@pytest.fixture()
+def disk_parser(tmp_path):
+    ''' a parser class with a disk cache enabled, for a single test '''
+    class DiskParser(Parser):
+        pass
+
+    DiskParser.enable_disk_cache(str(tmp_path / 'cache.db'))
+    return DiskParser
+
+
+def test_disk_get_set(disk):
+    assert disk.get('p', 'g1', 'a > 5') is None
+    disk.set('p', 'g1', 'a > 5', b'data')
+    assert disk.get('p', 'g1', 'a > 5') == b'data'
+    assert disk.get('p', 'g2', 'a > 5') is None
+    info = disk.info()
+    assert (info.hits, info.misses, info.currsize, info.nbytes) == (1, 2, 1, 9)
+
+
+def test_disk_persists(disk):
+    disk.set('p', 'g1', 'a > 5', b'data')
+    assert DiskCache(disk.path).get('p', 'g1', 'a > 5') == b'data'
+
+
+def test_disk_eviction(tmp_path):
+    disk = DiskCache(str(tmp_path / 'cache.db'), max_bytes=100)
+    for i in range(10):
+        disk.set('p', 'g1', f'a > {i}', b'x' * 15)
+    info = disk.info()
+    assert info.nbytes <= 100
+    assert info.evictions == 10 - info.currsize
+    assert disk.get('p', 'g1', 'a > 9') is not None
+    assert disk.get('p', 'g1', 'a > 0') is None
+
+
+def test_disk_new_grammar_invalidates(disk):
+    disk.set('p', 'g1', 'a > 5', b'data')
+    disk.set('q', 'g1', 'a > 5', b'data')
+    # a new process storing an expression for a new grammar of the same parser
+    DiskCache(disk.path).set('p', 'g2', 'a > 6', b'data')
+    assert disk.get('p', 'g1', 'a > 5') is None
+    assert disk.get('q', 'g1', 'a > 5') == b'data'
+
+
+def test_disk_schema_version(disk):
+    disk.set('p', 'g1', 'a > 5', b'data')
+    conn = sqlite3.connect(disk.path)
+    conn.execute('PRAGMA user_version=99')
+    conn.close()
+    assert DiskCache(disk.path).info().currsize == 0
+
+
+def test_disk_clear(disk):
+    disk.set('p', 'g1', 'a > 5', b'data')
+    disk.clear()
+    assert disk.info() == (0, 0, 0, disk.max_bytes, 0, 0)
+
+
+def test_disk_concurrent_access(disk):
+    def work(offset):
+        for i in range(50):
+            disk.set('p', 'g1', f'{offset} {i % 10}', b'data')
+            assert disk.get('p', 'g1', f'{offset} {i % 10}') == b'data'
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert disk.info().currsize == 80
+
+
+def test_parser_disk_cache(disk_parser):
+    first = disk_parser('a > 5 and b < 3').parse()
+    path = disk_parser.__dict__['_disk_cache'].path
+    disk_parser.disable_disk_cache()
+    assert disk_parser.disk_cache_info() is None
+    disk_parser.enable_disk_cache(path)
+    second = disk_parser('a > 5 and b < 3').parse()
+    assert second == first and second is not first
+    assert disk_parser.disk_cache_info().misses == 0
+    assert Parser.disk_cache_info() is None
+
+
+def test_parser_disk_cache_sqla(tmp_path):
+    SQLAParser.enable_disk_cache(str(tmp_path / 'cache.db'))
+    try:
+        SQLAParser('modela.x > 5 and modela.y < 3').parse()
+        SQLAParser.clear_cache()
+        expr = SQLAParser('modela.x > 5 and modela.y < 3').parse()
+        assert SQLAParser.disk_cache_info().hits >= 1
+    finally:
+        SQLAParser.disable_disk_cache()
+    assert type(expr).__name__ == 'SQLAAnd'
+    assert type(expr.conditions[0]).__name__ == 'SQLACondition'
+
+
+def test_parser_disk_cache_new_grammar(disk_parser):
+    disk_parser('a > 5').parse()
+    disk_parser.build_parser(clauses=[condition], actions=[Condition])
+    disk_parser('a > 5').parse()
+    info = disk_parser.disk_cache_info()
+    assert info.misses == 2
+    assert info.currsize == 1
+
+
+def test_parser_disk_cache_limits(disk_parser):
+    disk_parser('a > 5 and b < 3').parse()
+    disk_parser.build_parser(limits=Limits(max_terms=1))
+    with pytest.raises(ParseLimitExceeded):
+        disk_parser('a > 5 and b < 3').parse()
+
+
+def _parse_in_process(parser_class, value):
+    parser_class(value).parse()
+
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(),
+                    reason='requires forked processes')
+def test_parser_disk_cache_processes(disk_parser):
+    # the class disk cache is inherited by forked processes, which open their own connection
+    disk_parser('a > 1').parse()
+    process = multiprocessing.get_context('fork').Process(
+        target=_parse_in_process, args=(disk_parser, 'b > 2 or c < 3'))
+    process.start()
+    process.join()
+    assert process.exitcode == 0
+    assert repr(disk_parser('b > 2 or c < 3').parse()) == 'or_(b>2, c<3)'
+    info = disk_parser.disk_cache_info()
+    assert info.currsize == 2
+    assert info.misses == 1
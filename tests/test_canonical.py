@@ -0,0 +1,175 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: test_canonical.py
+# Project: tests
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 7:31:18 pm
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 7:31:18 pm
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+
+import pickle
+import time
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from boolean_parser.canonical import canonical, digest, fingerprint
+from boolean_parser.parsers import Parser, SQLAParser
+
+
+@pytest.mark.parametrize('value, other',
+                         [('x > 1 and y < 2', 'y<2 and x>1'),
+                          ('x > 1 and y < 2', '  x >1   AND   y< 2 '),
+                          ('a or b or c', 'c OR a or b'),
+                          ('not (a and b)', 'NOT (b and a)'),
+                          ('(a or b) and c', 'c and (b or a)'),
+                          ('x between 1 and 2', 'x BETWEEN 1 AND 2'),
+                          ('x & ~256', 'x & -257')],
+                         ids=['order', 'whitespace', 'or', 'not', 'nested', 'between', 'bitwise'])
+def test_equal(value, other):
+    a = Parser(value).parse()
+    b = Parser(other).parse()
+    assert canonical(a) == canonical(b)
+    assert fingerprint(a) == fingerprint(b)
+    assert a == b
+    assert hash(a) == hash(b)
+
+
+@pytest.mark.parametrize('value, other',
+                         [('x > 1 and y < 2', 'x > 1 or y < 2'),
+                          ('x > 1', 'x >= 1'),
+                          ('x = 1', 'x == 1'),
+                          ('x between 1 and 2', 'x between 2 and 1'),
+                          ('a and (b and c)', '(a and b) and c'),
+                          ('not a and b', 'not (a and b)')],
+                         ids=['op', 'operator', 'like', 'between', 'nesting', 'not'])
+def test_not_equal(value, other):
+    a = Parser(value).parse()
+    b = Parser(other).parse()
+    assert a != b
+    assert fingerprint(a) != fingerprint(b)
+
+
+@pytest.mark.parametrize('value, expected',
+                         [('y < 2 and x > 1', 'x > 1 and y < 2'),
+                          ('c or (b and a)', '(a and b) or c'),
+                          ('not (b or a) and c', 'c and not (a or b)'),
+                          ('name == "Jane Doe"', 'name == "Jane Doe"'),
+                          ('modela.x between 1 and 2', 'modela.x between 1 and 2'),
+                          ('x > ":xmin"', 'x > :xmin')],
+                         ids=['order', 'nested', 'not', 'quoted', 'base', 'placeholder'])
+def test_canonical(value, expected):
+    assert Parser(value).parse().canonical() == expected
+
+
+@pytest.mark.parametrize('value, other', [('x > 1', ' x>1 '), ('alpha', ' alpha '),
+                                          ('x between 1 and 2', 'x  BETWEEN 1  AND 2')])
+def test_leaves(value, other):
+    a = Parser(value).parse()
+    b = Parser(other).parse()
+    assert a == b
+    assert {a: 1}[b] == 1
+
+
+def test_fingerprint_is_stable():
+    # the fingerprint does not depend on the process hash seed
+    expr = Parser('x > 1 and y < 2').parse()
+    assert expr.fingerprint() == \
+        '178aa199bcacef4cde953fa0c4a72d2901406ae306845875f41e65f84b4f5222'
+
+
+def test_across_parsers():
+    expr = Parser('modela.x > 5 and modela.y < 2').parse()
+    sqla = SQLAParser('modela.y < 2 and modela.x > 5').parse()
+    assert expr == sqla
+    assert expr != 'modela.x > 5 and modela.y < 2'
+
+
+def test_engines():
+    value = 'x > 1 and (y < 2 or z between 1 and 5) and not w'
+    assert Parser(value, engine='fast').parse() == Parser(value, engine='pyparsing').parse()
+
+
+def test_remembered():
+    expr = Parser('x > 1 and (y < 2 or z > 3)').parse()
+    assert expr.conditions[1]._digest is None
+    value = expr.digest()
+    assert expr._digest == value == digest(expr)
+    assert expr.conditions[1]._digest is not None
+    assert expr.conditions[0]._digest is not None
+
+    # reset when the conditions are replaced, or a condition is modified
+    expr.conditions = expr.conditions[:1]
+    assert expr._digest is None
+    assert expr.canonical() == 'x > 1'
+    expr.conditions[0].value = '2'
+    assert expr.conditions[0]._digest is None
+    assert expr.conditions[0] == Parser('x > 2').parse()
+
+
+def test_pickle():
+    expr = Parser('y < 2 and x > 1').parse()
+    expr.canonical()
+    assert pickle.loads(pickle.dumps(expr)) == expr
+
+
+def test_deep():
+    depth = 5000
+    value = '(' * depth + 'x > 1' + ')' * depth
+    expr = Parser(engine='fast').parse(' and '.join([value] * 2))
+    text = expr.canonical()
+    assert text == 'x > 1 and x > 1'
+
+    expr = Parser('x > 1').parse()
+    bnot = type(Parser('not a').parse())
+    for __ in range(depth):
+        expr = bnot([['not', expr]])
+    assert expr.canonical() == 'not ' * depth + 'x > 1'
+
+
+def test_deep_hash():
+    depth = 10000
+    value = ''.join(f'x{i} > {i} and (' for i in range(depth)) + 'z == 1' + ')' * depth
+    a = Parser(engine='fast').parse(value)
+    b = Parser(engine='fast').parse(value)
+    start = time.perf_counter()
+    assert hash(a) == hash(b)
+    assert a == b
+    assert time.perf_counter() - start < 1
+    # only the digests are remembered on the nested clauses
+    assert len(a.conditions[1].digest()) == 16
+
+
+def test_normalized():
+    a = Parser('a and (c and b) and a').parse()
+    b = Parser('(b and a) and c').parse()
+    assert a != b
+    assert a.normalize() == b.normalize()
+
+
+numbers = st.sampled_from(['0', '1', '1.5', '-1'])
+conditions = st.one_of(
+    st.builds('{} {} {}'.format, st.sampled_from('xy'), st.sampled_from(['>', '<=', '==']),
+              numbers),
+    st.builds('{} between {} and {}'.format, st.sampled_from('xy'), numbers, numbers),
+    st.sampled_from(['alpha', 'beta']))
+expressions = st.recursive(
+    conditions,
+    lambda children: st.one_of(
+        st.builds('not ({})'.format, children),
+        st.builds('({}) {} ({})'.format, children, st.sampled_from(['and', 'OR']), children)),
+    max_leaves=8)
+
+
+@settings(max_examples=200, deadline=None)
+@given(expressions)
+def test_canonical_round_trip(value):
+    text = Parser(engine='fast').parse(value).canonical()
+    assert Parser(engine='fast').parse(text).canonical() == text
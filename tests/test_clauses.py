@@ -13,7 +13,8 @@
 
 from __future__ import print_function, division, absolute_import
 import pytest
-from boolean_parser.clauses import words, condition, between_cond, fxn, fxn_cond, fxn_expr
+from boolean_parser.clauses import (words, condition, between_cond, in_cond, fxn, fxn_cond,
+                                    fxn_expr)
 
 expdata = {'fxn1': {'name': 'test',
                     'args': ['1', '2', '3', 'hello'],
@@ -61,6 +62,14 @@ def test_condition(value, exp):
     assert rc['operator'] == exp['operator']
 
 
+@pytest.mark.parametrize('value, exp', [('a > :amin', ':amin'), ('a > ":amin"', ':amin')],
+                         ids=['bare', 'quoted'])
+def test_condition_placeholder(value, exp):
+    ''' test parsing of a condition with a named placeholder '''
+    res = condition.parseString(value).asDict()
+    assert res['condition']['value'] == exp
+
+
 def test_condition_has_default_action():
     ''' test that blank clauses have default actions '''
     assert condition.parseAction == []
@@ -79,6 +88,20 @@ def test_between_condition(value, exp):
     assert bc['operator'] == exp['operator']
 
 
+@pytest.mark.parametrize('value, operator, values',
+                         [('a in (1, 2, 3)', 'in', ['1', '2', '3']),
+                          ('a NOT  IN(x,"y z", :p,~2)', 'not in', ['x', 'y z', ':p', '~2']),
+                          ('a in ( 1 )', 'in', ['1'])],
+                         ids=['in', 'not_in', 'single'])
+def test_in_condition(value, operator, values):
+    res = in_cond.parseString(value).asDict()
+    assert 'in_condition' in res
+    ic = res['in_condition']
+    assert ic['parameter'] == 'a'
+    assert ic['operator'] == operator
+    assert ic['values'] == values
+
+
 @pytest.mark.parametrize('value, exp',
                          [('test(1, 2, 3, hello, a=5, stuff=there, force_check=True)', expdata['fxn1']),
                           ('test(1, 2, 3, hello)', expdata['fxn2']),
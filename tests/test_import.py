@@ -0,0 +1,68 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: test_import.py
+# Project: tests
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 2:51:33 pm
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 2:51:33 pm
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+
+import subprocess
+import sys
+
+#
+# tests for the import-time cost of boolean_parser, each run in a fresh interpreter
+#
+
+
+def run_python(code):
+    proc = subprocess.run([sys.executable, '-W', 'ignore', '-c', code],
+                          capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+    return proc.stdout.strip()
+
+
+def test_no_grammar_built_on_import():
+    code = ('import boolean_parser; from boolean_parser.parsers import Parser, SQLAParser; '
+            'print("_grammar" in vars(Parser), "_grammar" in vars(SQLAParser))')
+    assert run_python(code) == 'False False'
+
+
+def test_grammar_built_on_first_parse():
+    code = ('from boolean_parser.parsers import Parser, SQLAParser; Parser("x > 1"); '
+            'print("_grammar" in vars(Parser), "_grammar" in vars(SQLAParser))')
+    assert run_python(code) == 'True False'
+
+
+def test_base_parse_does_not_import_sqlalchemy():
+    code = ('import sys; from boolean_parser import parse; parse("x > 1", base="base"); '
+            'print(any(m.split(".")[0] == "sqlalchemy" for m in sys.modules))')
+    assert run_python(code) == 'False'
+
+
+def test_sqla_parser_imported_on_access():
+    code = ('import sys; import boolean_parser; before = "sqlalchemy" in sys.modules; '
+            'from boolean_parser import SQLAParser; '
+            'from boolean_parser.parsers import SQLAParser as SP; '
+            'print(before, "sqlalchemy" in sys.modules, SQLAParser is SP)')
+    assert run_python(code) == 'False True True'
+
+
+def test_default_parse_imports_sqlalchemy():
+    code = ('import sys; from boolean_parser import parse; '
+            'print(type(parse("a.x > 1")).__name__, "sqlalchemy" in sys.modules)')
+    assert run_python(code) == 'SQLACondition True'
+
+
+def test_import_time_budget():
+    ''' importing the base parser should stay well below the cost of importing sqlalchemy '''
+    code = ('import time; t0 = time.perf_counter(); import boolean_parser; '
+            't1 = time.perf_counter(); import sqlalchemy.orm; t2 = time.perf_counter(); '
+            'print((t1 - t0) < (t2 - t1))')
+    assert run_python(code) == 'True'
@@ -0,0 +1,97 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: test_intern.py
+# Project: tests
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 5:20:44 pm
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 5:20:44 pm
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+
+import gc
+
+import pytest
+from boolean_parser.intern import InternTable
+from boolean_parser.parsers import Parser, SQLAParser
+
+
+@pytest.fixture()
+def interned():
+    SQLAParser.enable_interning()
+    yield SQLAParser
+    SQLAParser.disable_interning()
+
+
+@pytest.mark.parametrize('engine', ['pyparsing', 'fast'])
+def test_shared_leaves(interned, engine):
+    a = interned('modela.x > 5 and modela.y < 2', engine=engine).parse()
+    b = interned('modela.x > 5 or modela.z == 1', engine=engine).parse()
+    assert a.conditions[0] is b.conditions[0]
+    assert a.conditions[1] is not b.conditions[1]
+    assert a.conditions[0]._frozen
+
+
+def test_shared_subtrees(interned):
+    a = interned('modela.x > 5 and (modela.y < 2 or not modela.z == 1)').parse()
+    b = interned('(modela.y < 2 or not modela.z == 1) or modela.w > 3').parse()
+    assert a.conditions[1] is b.conditions[0]
+    assert interned('modela.x > 5 and (modela.y < 2 or not modela.z == 1)').parse() is a
+
+
+def test_distinct_nodes(interned):
+    a = interned('modela.x > 5 and modela.y < 2').parse()
+    b = interned('modela.x > 5 or modela.y < 2').parse()
+    c = interned('modela.x between 5 and 6').parse()
+    d = interned('modela.x between 5 and 7').parse()
+    assert a is not b
+    assert a.conditions[0] is b.conditions[0]
+    assert c is not d
+
+
+def test_remembered_digest(interned, monkeypatch):
+    a = interned('modela.x > 5 and (modela.y < 2 or not modela.z == 1)').parse()
+    assert a._digest is not None
+    assert a.conditions[1].conditions[1]._digest is not None
+
+    # interned nodes hash and compare without building any digest or canonical form
+    b = interned('(modela.y < 2 or not modela.z == 1) or modela.w > 3').parse()
+    import boolean_parser.canonical
+    monkeypatch.delattr(boolean_parser.canonical, 'digest')
+    monkeypatch.delattr(boolean_parser.canonical, 'canonical')
+    assert hash(a) == hash(a) and a == a
+    assert a.conditions[1] == b.conditions[0]
+    assert a != b
+
+
+def test_not_interned_by_default():
+    assert Parser.intern_info() is None
+    a = Parser('x > 5 and y < 2').parse()
+    b = Parser('x > 5 and y < 2').parse()
+    assert a.conditions[0] is not b.conditions[0]
+
+
+def test_weak_references():
+    table = InternTable()
+    expr = table.intern(Parser('x > 5 and y < 2').parse())
+    assert len(table) == 3
+    del expr
+    gc.collect()
+    assert len(table) == 0
+
+
+def test_info(interned):
+    parser = interned()
+    expr = parser.parse('modela.x > 5 and modela.y < 2')
+    assert parser.parse('modela.x > 5') is expr.conditions[0]
+    info = interned.intern_info()
+    assert (info.hits, info.misses) == (1, 3)
+
+
+def test_parse_many(interned):
+    results = interned.parse_many(['modela.x > 5 and modela.y < 2', 'modela.x > 5'], workers=2)
+    assert results[0].conditions[0] is results[1]
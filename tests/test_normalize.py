@@ -0,0 +1,146 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: test_normalize.py
+# Project: tests
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 6:44:05 pm
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 6:44:05 pm
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+
+import itertools
+import operator
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from boolean_parser.actions.boolean import BaseBool
+from boolean_parser.normalize import normalize
+from boolean_parser.parsers import Parser
+from boolean_parser.schema import Schema
+
+
+ops = {'>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le,
+       '==': operator.eq, '=': operator.eq, '!=': operator.ne}
+points = [-1, 0, 0.5, 1, 1.5, 2, 2.5, 3, 4]
+envs = [dict(zip('xy', values)) for values in itertools.product(points, repeat=2)]
+
+
+def evaluate(expr, env):
+    if isinstance(expr, BaseBool):
+        results = [evaluate(c, env) for c in expr.conditions]
+        if expr.logicop == 'not':
+            return not results[0]
+        return all(results) if expr.logicop == 'and' else any(results)
+    value = env[expr.name]
+    if expr.operator == 'between':
+        return float(expr.value) <= value <= float(expr.value2)
+    return ops[expr.operator](value, float(expr.value))
+
+
+def walk(expr):
+    stack = [expr]
+    while stack:
+        node = stack.pop()
+        yield node
+        if isinstance(node, BaseBool):
+            stack.extend(node.conditions)
+
+
+numbers = st.sampled_from(['0', '1', '1.5', '2', '3', '-1'])
+conditions = st.one_of(
+    st.builds('{} {} {}'.format, st.sampled_from('xy'), st.sampled_from(sorted(ops)), numbers),
+    st.builds('{} between {} and {}'.format, st.sampled_from('xy'), numbers, numbers))
+expressions = st.recursive(
+    conditions,
+    lambda children: st.one_of(
+        st.builds('not ({})'.format, children),
+        st.builds('({}) {} ({})'.format, children, st.sampled_from(['and', 'or']), children)),
+    max_leaves=8)
+
+
+@settings(max_examples=300, deadline=None)
+@given(expressions)
+def test_normalize_preserves_semantics(value):
+    expr = Parser(engine='fast').parse(value)
+    norm = normalize(expr)
+    for env in envs:
+        assert evaluate(norm, env) == evaluate(expr, env), (value, repr(norm), env)
+
+
+@settings(max_examples=300, deadline=None)
+@given(expressions)
+def test_normalize_is_normal(value):
+    norm = normalize(Parser(engine='fast').parse(value))
+    assert repr(normalize(norm)) == repr(norm)
+    for node in walk(norm):
+        if not isinstance(node, BaseBool):
+            continue
+        for child in node.conditions:
+            assert not (isinstance(child, BaseBool) and child.logicop == node.logicop)
+        if node.logicop == 'not':
+            assert len(node.conditions) == 1
+        else:
+            assert len(node.conditions) > 1
+            assert len(set(map(repr, node.conditions))) == len(node.conditions)
+
+
+@pytest.mark.parametrize('value, exp',
+                         [('(a > 1 and (b < 2 and a > 1))', 'and_(a>1, b<2)'),
+                          ('a > 1 and a > 3', 'a>3'),
+                          ('a >= 3 and a > 3', 'a>3'),
+                          ('a < 3 or a <= 3', 'a<=3'),
+                          ('a < 1 or (a < 3 or b == 2)', 'or_(a<3, b==2)'),
+                          ('not (not a > 1)', 'a>1'),
+                          ('a > 1 and a > b', 'and_(a>1, a>b)'),
+                          ('a > 1 or a > 1 and b < 2', 'or_(a>1, and_(a>1, b<2))'),
+                          ('stuff and (stuff and things)', 'and_(stuff, things)'),
+                          ('a > 9007199254740992 and a > 9007199254740993',
+                           'a>9007199254740993'),
+                          ('a < 0.10000000000000000001 or a < 0.1', 'a<0.10000000000000000001')])
+def test_normalize(value, exp):
+    expr = Parser(value).parse()
+    assert repr(expr.normalize()) == exp
+
+
+@pytest.mark.parametrize('pytype, exp',
+                         [(str, 'and_(name>5, name>10)'),
+                          (int, 'name>10'),
+                          (float, 'name>10')])
+def test_normalize_schema(pytype, exp):
+    from boolean_parser.parsers import SQLAParser
+
+    class TypedParser(SQLAParser):
+        pass
+
+    TypedParser.build_parser(schema=Schema({'modela.name': pytype}))
+    expr = TypedParser('modela.name > 5 and modela.name > 10').parse()
+    assert repr(expr.normalize()) == exp
+
+
+def test_input_unchanged():
+    expr = Parser('a > 1 and (b < 2 and a > 3)').parse().freeze()
+    norm = normalize(expr)
+    assert repr(expr) == 'and_(a>1, and_(b<2, a>3))'
+    assert norm.conditions[1] is expr.conditions[1].conditions[0]
+
+
+def test_sqla_classes_kept():
+    from boolean_parser.parsers import SQLAParser
+    norm = SQLAParser('modela.x > 1 and (modela.y < 2 and modela.x > 3)').parse().normalize()
+    assert type(norm).__name__ == 'SQLAAnd'
+    assert len(norm.conditions) == 2
+
+
+def test_normalize_deep():
+    depth = 5000
+    value = ''.join(f'x > {i} and (' for i in range(depth)) + 'y < 1' + ')' * depth
+    norm = Parser(engine='fast').parse(value).normalize()
+    assert len(norm.conditions) == 2
+    assert norm.conditions[0].value == str(depth - 1)
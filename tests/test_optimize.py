@@ -0,0 +1,148 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: test_optimize.py
+# Project: tests
+# Author: Brian Cherinka
+# Created: Sunday, 18th October 2026 3:58:02 am
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Sunday, 18th October 2026 3:58:02 am
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import aliased
+
+from boolean_parser.optimize import optimize
+from boolean_parser.parsers import SQLAParser
+from boolean_parser.parsers.sqla import SQLBoolBase
+from tests.models import ModelA, ModelB
+
+
+def _sql(clause):
+    return str(clause.compile(compile_kwargs={'literal_binds': True}))
+
+
+def _optimized(value, models=(ModelA, ModelB), **kwargs):
+    return _sql(SQLAParser(value).parse().filter(list(models), optimize=True, **kwargs))
+
+
+@pytest.mark.parametrize('value, exp',
+                         [('modela.x == 1 or modela.x == 2 or modela.x == 3',
+                           'modela.x IN (1, 2, 3)'),
+                          ('modela.x == 1 or modela.y == 2 or modela.x = 3',
+                           'modela.x IN (1, 3) OR modela.y = 2'),
+                          ('modela.x == 1 or modela.x == 1', 'modela.x IN (1)'),
+                          ('modela.x == 1 or modelb.z == 1', 'modela.x = 1 OR modelb.z = 1.0'),
+                          ('modela.x == 1 and modela.x == 2', 'modela.x = 1 AND modela.x = 2'),
+                          ('modela.dates == 2020-01-01 or modela.dates == 2020-01-02',
+                           "modela.dates IN ('2020-01-01', '2020-01-02')"),
+                          ('not (modela.x == 1 or modela.x == 2)', '(modela.x NOT IN (1, 2))')],
+                         ids=['in', 'mixed', 'duplicate', 'fields', 'and', 'dates', 'not'])
+def test_in(value, exp):
+    assert _optimized(value) == exp
+
+
+@pytest.mark.parametrize('value, exp',
+                         [('modela.x >= 1 and modela.x <= 5', 'modela.x BETWEEN 1 AND 5'),
+                          ('modela.x > 1 and modela.x <= 5 and modela.x > 2',
+                           'modela.x > 2 AND modela.x <= 5'),
+                          ('modela.x between 1 and 9 and modela.x < 5 and modela.x >= 3',
+                           'modela.x >= 3 AND modela.x < 5'),
+                          ('modela.x between 1 and 5 or modela.x between 3 and 8',
+                           'modela.x BETWEEN 1 AND 8'),
+                          ('modela.x < 3 or modela.x < 5', 'modela.x < 5'),
+                          ('modela.x < 3 or modela.x > 5', 'modela.x < 3 OR modela.x > 5'),
+                          ('modela.x < 3 or modela.x >= 3', 'modela.x < 3 OR modela.x >= 3'),
+                          ('modela.x between 1 and 5 or modela.x == 3 or modela.x == 7 or '
+                           'modela.x == 9', 'modela.x IN (7, 9) OR modela.x BETWEEN 1 AND 5'),
+                          ('modela.x > 1 and modela.y < 2', 'modela.x > 1 AND modela.y < 2')],
+                         ids=['between', 'tightest', 'intersect', 'union', 'loosest',
+                              'disjoint', 'touching', 'contained', 'fields'])
+def test_ranges(value, exp):
+    assert _optimized(value) == exp
+
+
+def test_ranges_kept():
+    # placeholders and case-insensitive strings are not merged
+    f = SQLAParser('modela.x > :a and modela.x > 1').parse().filter(ModelA, optimize=True)
+    assert str(f.compile()) == 'modela.x > :a AND modela.x > :modela.x_1'
+    assert _optimized('modela.name > a and modela.name < c') == \
+        "lower(modela.name) > lower('a') AND lower(modela.name) < lower('c')"
+    assert _optimized('modela.name == a or modela.name == b') == \
+        "lower(modela.name) = lower('a') OR lower(modela.name) = lower('b')"
+
+
+def test_string_match():
+    assert _optimized('modela.name == a or modela.name == b', string_match='exact') == \
+        "modela.name IN ('a', 'b')"
+    assert _optimized('modela.name == A or modela.name == b', string_match='lower') == \
+        "lower(modela.name) IN ('a', 'b')"
+
+
+def test_nested():
+    value = ('(modela.x == 1 or modela.x == 2) and (modela.y == 1 or '
+             '(modela.y == 2 or modela.y == 3))')
+    assert _optimized(value) == 'modela.x IN (1, 2) AND (modela.y = 1 OR modela.y IN (2, 3))'
+
+
+def test_alias():
+    alias = aliased(ModelA, name='other')
+    assert _optimized('modela.x == 1 or other.x == 2 or other.x == 3',
+                      models=(ModelA, alias)) == 'modela.x = 1 OR other.x IN (2, 3)'
+
+
+def test_any():
+    f = SQLAParser('modela.x == 1 or modela.x == 2').parse().filter(ModelA, optimize='any')
+    compiled = f.compile(dialect=postgresql.dialect())
+    assert str(compiled) == 'modela.x = ANY (%(param_1)s::INTEGER[])'
+    assert compiled.params == {'param_1': [1, 2]}
+
+
+def test_optimize_function():
+    f = SQLAParser('modela.x == 1 or modela.x == 2 or modela.x > 5').parse().filter(ModelA)
+    assert _sql(f) == 'modela.x = 1 OR modela.x = 2 OR modela.x > 5'
+    assert _sql(optimize(f)) == 'modela.x IN (1, 2) OR modela.x > 5'
+    # clauses other than boolean clauses are returned as they are
+    cond = SQLAParser('modela.x == 1').parse().filter(ModelA)
+    assert optimize(cond) is cond
+
+
+def test_class_default(monkeypatch):
+    expr = SQLAParser('modela.x == 1 or modela.x == 2').parse()
+    assert _sql(expr.filter(ModelA)) == 'modela.x = 1 OR modela.x = 2'
+    assert _sql(expr.filter(ModelA, optimize=True)) == 'modela.x IN (1, 2)'
+    assert expr.filter(ModelA, optimize=True) is expr.filter(ModelA, optimize=True)
+    monkeypatch.setattr(SQLBoolBase, 'optimize', True)
+    assert _sql(SQLAParser('modela.x == 1 or modela.x == 2').parse().filter(ModelA)) == \
+        'modela.x IN (1, 2)'
+
+
+def test_invalid():
+    with pytest.raises(AssertionError, match='optimize must be'):
+        SQLAParser('modela.x == 1 or modela.x == 2').parse().filter(ModelA, optimize='all')
+
+
+@pytest.fixture()
+def batch(model_a_factory):
+    model_a_factory.create_batch(20)
+
+
+@pytest.mark.parametrize('value',
+                         ['modela.x == 1 or modela.x == 2 or modela.x == 7 or modela.y == 3',
+                          'modela.x between 1 and 5 or modela.x between 3 and 8 or '
+                          'modela.x == 12 or modela.x == 4',
+                          'modela.x > 2 and modela.x <= 15 and modela.x >= 4 and modela.x < 18',
+                          'not (modela.x < 3 or modela.x < 10) and (modela.y == 1 or '
+                          'modela.y == 5 or modela.y > 10)'],
+                         ids=['in', 'union', 'intersect', 'nested'])
+def test_query(session, batch, value):
+    expr = SQLAParser(value).parse()
+    plain = session.query(ModelA.pk).filter(expr.filter(ModelA)).order_by(ModelA.pk).all()
+    optimized = session.query(ModelA.pk).filter(
+        expr.filter(ModelA, optimize=True)).order_by(ModelA.pk).all()
+    assert optimized == plain
@@ -0,0 +1,159 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: test_schema.py
+# Project: tests
+# Author: Brian Cherinka
+# Created: Sunday, 18th October 2026 12:24:51 am
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Sunday, 18th October 2026 12:24:51 am
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+import datetime
+import decimal
+
+import pytest
+from sqlalchemy.orm import aliased
+
+from boolean_parser.parsers import Parser, SQLAParser
+from boolean_parser.parsers.base import BooleanParserException
+from boolean_parser.schema import Schema, cast_type
+from tests.models import ModelA, ModelB
+
+
+schema = Schema.from_models([ModelA, ModelB])
+
+
+@pytest.fixture()
+def typed():
+    class TypedParser(SQLAParser):
+        pass
+
+    TypedParser.build_parser(schema=schema)
+    return TypedParser
+
+
+def test_from_models():
+    assert schema['modela.x'] is int
+    assert schema['modela.dates'] is datetime.date
+    assert schema['modela.name'] is str
+    assert schema['modelb.z'] is float
+    assert schema['z'] is float
+    # a bare name shared by models has the type of the first model
+    assert schema['pk'] is int
+    assert Schema.from_models(aliased(ModelA, name='modela2'))['modela2.x'] is int
+
+
+def test_types():
+    assert cast_type(decimal.Decimal) is float
+    assert cast_type(list) is str
+    assert Schema({'x': decimal.Decimal})['x'] is float
+    with pytest.raises(AssertionError, match='the type of x must be one of'):
+        Schema({'x': list})
+
+
+@pytest.mark.parametrize('value, expected, expected2',
+                         [('modela.x > 5', 5, None),
+                          ('modelb.z <= 1.5', 1.5, None),
+                          ('modela.bools == yes', True, None),
+                          ('modela.dates between 2020-01-01 and 2020-02-01',
+                           datetime.date(2020, 1, 1), datetime.date(2020, 2, 1)),
+                          ('modela.datetimes == 2020-01-01T12:00',
+                           datetime.datetime(2020, 1, 1, 12), None),
+                          ('modela.name = Jane', 'Jane', None),
+                          ('modela.nulls == null', 'null', None),
+                          ('modela.x > :xmin', ':xmin', None),
+                          ('x & ~256', -257, None)],
+                         ids=['int', 'float', 'bool', 'date', 'datetime', 'str', 'null',
+                              'placeholder', 'bitwise'])
+def test_typed_values(typed, value, expected, expected2):
+    expr = typed(value).parse()
+    assert expr.typed_value == expected
+    assert type(expr.typed_value) is type(expected)
+    assert expr.typed_value2 == expected2
+    # the string values are unchanged
+    assert expr == SQLAParser(value).parse()
+
+
+def test_untyped():
+    expr = SQLAParser('modela.x > 5').parse()
+    assert expr.value_type is None
+    assert expr.typed_value == '5'
+    # parameters not in a schema keep their string values
+    expr = Parser(grammar=Parser.get_grammar()).parse('w > 5')
+    assert expr.typed_value == '5'
+
+
+@pytest.mark.parametrize('value', ['modela.x > five', 'modela.dates < yesterday',
+                                   'modelb.z between 1 and two', 'modela.bools == maybe'])
+def test_invalid_values(typed, value):
+    with pytest.raises(BooleanParserException, match='expects a'):
+        typed(value)
+
+
+def test_strict():
+    class StrictParser(Parser):
+        pass
+
+    StrictParser.build_parser(schema=Schema({'x': int}, strict=True))
+    assert StrictParser('x > 1 and x < 5').parse().conditions[0].typed_value == 1
+    with pytest.raises(BooleanParserException, match='unknown parameter y'):
+        StrictParser('x > 1 and y < 5')
+
+
+def test_filter_uses_typed_values(typed, monkeypatch):
+    value = ('modela.x > 5 and modela.dates between 2020-01-01 and 2020-02-01 and '
+             'modela.name == "Jane" and modelb.z < 1.5')
+    expected = str(SQLAParser(value).parse().filter([ModelA, ModelB])
+                   .compile(compile_kwargs={'literal_binds': True}))
+    expr = typed(value).parse()
+
+    def cast(*args, **kwargs):
+        raise AssertionError('typed values must not be cast again')
+
+    monkeypatch.setattr(typed._default_actions[0], '_cast_value', cast)
+    result = expr.filter([ModelA, ModelB])
+    assert str(result.compile(compile_kwargs={'literal_binds': True})) == expected
+
+
+def test_filter_type_mismatch():
+    # a value typed for another model is cast again for the field it is filtered on
+    class MismatchParser(SQLAParser):
+        pass
+
+    MismatchParser.build_parser(schema=Schema({'x': float}))
+    expr = MismatchParser('x > 5').parse()
+    assert expr.typed_value == 5.0
+    result = expr.filter(ModelA).compile(compile_kwargs={'literal_binds': True})
+    assert str(result) == 'modela.x > 5'
+
+
+def test_query(typed, session):
+    expr = typed('modela.x > 5 and modela.bools == true').parse()
+    results = session.query(ModelA).filter(expr.filter(ModelA)).all()
+    assert all(item.x > 5 for item in results)
+
+
+def test_grammar(typed):
+    grammar = typed.get_grammar()
+    assert grammar.schema == schema
+    assert grammar.version != SQLAParser.get_grammar().version
+    # the schema is kept when rebuilding, and removed with an empty schema
+    typed.build_parser(engine='fast')
+    assert typed.get_grammar().schema == schema
+    typed.build_parser(schema=Schema())
+    assert typed.get_grammar().schema is None
+    assert typed.get_grammar().version == SQLAParser.get_grammar().version
+
+
+def test_disk_cache(typed, tmp_path):
+    typed.enable_disk_cache(str(tmp_path / 'cache.db'))
+    parser = typed()
+    first = parser.parse('modela.x > 5')
+    second = parser.parse('modela.x > 5')
+    assert typed.disk_cache_info().hits == 1
+    assert first is not second
+    assert second.typed_value == 5
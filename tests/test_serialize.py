@@ -0,0 +1,134 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: test_serialize.py
+# Project: tests
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 10:31:40 pm
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 10:31:40 pm
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+
+import json
+
+import pytest
+
+from boolean_parser.actions.clause import BaseAction
+from boolean_parser.parsers import Parser, SQLAParser
+from boolean_parser.parsers.base import BooleanParserException
+from boolean_parser.serialize import dumps, loads
+from tests.models import ModelA, ModelB
+
+
+class Function(BaseAction):
+    ''' A leaf with data values that are not strings '''
+
+    def _extract_data(self, data):
+        self.args = data['args']
+
+
+@pytest.fixture(params=[False, True], ids=['json', 'binary'])
+def binary(request):
+    return request.param
+
+
+@pytest.mark.parametrize('value',
+                         ['x > 1', 'alpha and not beta', 'x > 1 and (y < 2 or z between 1 and 3)',
+                          'not (a or b) and name == "Jane Doe"', 'x & ~256 or modela.y <= 5'])
+def test_roundtrip(binary, value):
+    expr = Parser(value).parse()
+    data = dumps(expr, binary=binary)
+    assert isinstance(data, bytes if binary else str)
+    result = loads(data)
+    assert result == expr
+    assert repr(result) == repr(expr)
+    assert type(result) is type(expr)
+
+
+def test_sqla(binary):
+    expr = SQLAParser('modela.x > 5 and (modela.y < 2 or not modelb.z == 1)').parse()
+    result = loads(dumps(expr, binary=binary))
+    assert type(result).__name__ == 'SQLAAnd'
+    assert type(result.conditions[0]).__name__ == 'SQLACondition'
+    models = [ModelA, ModelB]
+    assert str(result.filter(models)) == str(expr.filter(models))
+
+
+def test_bitwise(binary):
+    result = loads(dumps(Parser('x & ~256').parse(), binary=binary))
+    assert result.value == '-257'
+    assert result.data['value'] == '~256'
+
+
+def test_format():
+    data = json.loads(dumps(Parser('x > 1 and y < 2').parse()))
+    assert data == {'version': 1,
+                    'classes': ['boolean_parser.actions.clause:Condition',
+                                'boolean_parser.actions.boolean:BoolAnd'],
+                    'nodes': [[0, {'parameter': 'x', 'operator': '>', 'value': '1'}],
+                              [0, {'parameter': 'y', 'operator': '<', 'value': '2'}],
+                              [1, [0, 1]]]}
+
+
+def test_compact():
+    expr = Parser(' or '.join(f'x > {i % 10}' for i in range(100))).parse()
+    assert len(dumps(expr, binary=True)) < len(dumps(expr)) / 3
+
+
+def test_shared_subtrees(binary):
+    SQLAParser.enable_interning()
+    try:
+        expr = SQLAParser('(modela.x > 5 and modela.y < 2) or not (modela.x > 5 and '
+                          'modela.y < 2)').parse()
+    finally:
+        SQLAParser.disable_interning()
+    result = loads(dumps(expr, binary=binary))
+    assert result.conditions[0] is result.conditions[1].conditions[0]
+
+
+def test_deep(binary):
+    depth = 10000
+    value = ''.join(f'x > {i} and (y < {i} or ' for i in range(depth))
+    expr = Parser(engine='fast').parse(value + 'x == 1' + ')' * depth)
+    result = loads(dumps(expr, binary=binary))
+    for __ in range(2 * depth):
+        result = result.conditions[-1]
+    assert repr(result) == 'x==1'
+
+
+def test_non_string_data(binary):
+    expr = Function({'parameter': 'cone', 'args': [1.5, {'unit': 'deg'}]})
+    result = loads(dumps(expr, binary=binary))
+    assert type(result) is Function
+    assert result.args == [1.5, {'unit': 'deg'}]
+
+
+def test_unsupported_node():
+    with pytest.raises(BooleanParserException, match='cannot serialize a str node'):
+        dumps('x > 1')
+
+
+@pytest.mark.parametrize('data, error',
+                         [('not json', 'not a serialized expression'),
+                          ('{"version": 2, "classes": [], "nodes": []}',
+                           'unsupported serialization version 2'),
+                          ('{"version": 1, "classes": ["os:system"], "nodes": [[0, {}]]}',
+                           'unknown node class os:system'),
+                          ('{"version": 1, "classes": [], "nodes": [[0, {}]]}',
+                           'not a valid serialized expression'),
+                          (b'BPX\x02', 'not a serialized expression')],
+                         ids=['json', 'version', 'class', 'index', 'binary'])
+def test_invalid(data, error):
+    with pytest.raises(BooleanParserException, match=error):
+        loads(data)
+
+
+def test_binary_version():
+    data = bytearray(dumps(Parser('x > 1').parse(), binary=True))
+    data[3] = 2
+    with pytest.raises(BooleanParserException, match='unsupported serialization version 2'):
+        loads(bytes(data))
@@ -0,0 +1,178 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: test_typeahead.py
+# Project: tests
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 8:51:09 pm
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 8:51:09 pm
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from boolean_parser.parsers import Parser, SQLAParser
+from boolean_parser.parsers.base import BooleanParserException
+from boolean_parser.typeahead import Typeahead
+
+
+@pytest.fixture()
+def typeahead():
+    return Typeahead()
+
+
+@pytest.mark.parametrize('value, expr, expected',
+                         [('', None, {'parameter', 'not', '('}),
+                          ('x', 'x', {'operator', 'between', 'in', 'not', 'and', 'or'}),
+                          ('x >', None, {'value'}),
+                          ('x > 1', 'x>1', {'and', 'or'}),
+                          ('x > 1 and', 'x>1', {'parameter', 'not', '('}),
+                          ('x > 1 and not', 'x>1', {'parameter', 'not', '('}),
+                          ('x > 1 and (y < 2 or', 'and_(x>1, y<2)', {'parameter', 'not', '('}),
+                          ('(x > 1', 'x>1', {'and', 'or', ')'}),
+                          ('x between 1', None, {'and'}),
+                          ('x between 1 and', None, {'value'}),
+                          ('not (a or b', 'not_(or_(a, b))',
+                           {'operator', 'between', 'in', 'not', 'and', 'or', ')'}),
+                          ('modela.x', None, {'operator', 'between', 'in', 'not'}),
+                          ('x in', None, {'('}),
+                          ('x not', None, {'in'}),
+                          ('x not in (1,', None, {'value'}),
+                          ('x > 1 or y in ("a b"', 'x>1', {',', ')'})],
+                         ids=['empty', 'word', 'operator', 'condition', 'and', 'not', 'or',
+                              'lpar', 'between', 'between_and', 'not_lpar', 'dotted', 'in',
+                              'not_in', 'in_comma', 'in_value'])
+def test_incomplete(typeahead, value, expr, expected):
+    result = typeahead.update(value)
+    assert repr(result.expression) == (expr or 'None')
+    assert result.expected == expected
+    assert result.prefix == ''
+    assert result.error is None
+    assert not result.complete or value in ('x', 'x > 1')
+
+
+@pytest.mark.parametrize('value, prefix, expected',
+                         [('x > 1 an', 'an', {'and', 'or'}),
+                          ('x betw', 'betw', {'operator', 'between', 'in', 'not', 'and', 'or'}),
+                          ('x !', '!', {'operator', 'between', 'in', 'not', 'and', 'or'}),
+                          ('x == "Jane D', '"Jane D', {'value'}),
+                          ('x > :', ':', {'value'})],
+                         ids=['and', 'between', 'operator', 'quoted', 'placeholder'])
+def test_prefix(typeahead, value, prefix, expected):
+    result = typeahead.update(value)
+    assert result.prefix == prefix
+    assert result.expected == expected
+    assert result.error is None
+    assert not result.complete
+
+
+@pytest.mark.parametrize('value, error',
+                         [('x > 1 y', "expected and or or, not 'y' at col 6"),
+                          ('x > 1)', 'unbalanced parentheses at col 5'),
+                          ('nothing', "ambiguous not in 'nothing' at col 0"),
+                          ('x > 1 and $', "unexpected character '$' at col 10"),
+                          ('modela.x and', "expected an operator, not 'and' at col 9"),
+                          ('x in (1 2)', "expected , or ), not '2' at col 8"),
+                          ('x not 1', "expected in, not '1' at col 6"),
+                          ('a.b.c > 1', 'parameter a.b.c cannot have more than one . at col 8'),
+                          ('a.b.c in (1, 2) and x > 1',
+                           'parameter a.b.c cannot have more than one . at col 14')],
+                         ids=['word', 'rpar', 'not', 'character', 'dotted', 'in_list', 'not_in',
+                              'dots', 'dots_in_list'])
+def test_error(typeahead, value, error):
+    result = typeahead.update(value)
+    assert result.error == error
+    assert not result.complete
+
+
+@pytest.mark.parametrize('value',
+                         ['x > 1', 'alpha and not beta', 'x > 1 and (y < 2 or z between 1 and 3)',
+                          'not (a or b) and name == "Jane Doe"', 'x & ~256 or modela.y <= 5',
+                          'x > :xmin and y between :lo and :hi',
+                          'x in (1, "a b", :p) and not (y NOT IN (~2) or z)'])
+def test_complete(typeahead, value):
+    result = typeahead.update(value)
+    assert result.complete
+    assert result.error is None
+    assert repr(result.expression) == repr(Parser(value).parse())
+
+
+def test_shared_clauses(typeahead):
+    first = typeahead.update('x > 1 and y < 2').expression
+    second = typeahead.update('x > 1 and y < 2 or z').expression
+    assert second.conditions[0].conditions[0] is first.conditions[0]
+
+
+def test_edits(typeahead):
+    typeahead.update('x > 1 and y < 2')
+    result = typeahead.update('x > 10 and y < 2')
+    assert repr(result.expression) == 'and_(x>10, y<2)'
+    result = typeahead.update('x > 10')
+    assert repr(result.expression) == 'x>10'
+    result = typeahead.update('z')
+    assert repr(result.expression) == 'z'
+    typeahead.reset()
+    assert typeahead.update('a or').expected == {'parameter', 'not', '('}
+
+
+def test_sqla():
+    typeahead = SQLAParser.typeahead()
+    result = typeahead.update('modela.x > 5 and modela.y <')
+    assert result.expression.fullname == 'modela.x'
+    assert type(result.expression).__name__ == 'SQLACondition'
+    assert result.expected == {'value'}
+
+
+def test_unsupported():
+    class CustomParser(Parser):
+        pass
+
+    CustomParser.build_parser(keep_parse_results=True)
+    with pytest.raises(BooleanParserException, match='fast engine'):
+        CustomParser.typeahead()
+
+
+def test_invalid_input(typeahead):
+    with pytest.raises(BooleanParserException, match='must be a string'):
+        typeahead.update(5)
+
+
+numbers = st.sampled_from(['0', '15', '1.5', '-1', '"a b"'])
+conditions = st.one_of(
+    st.builds('{} {} {}'.format, st.sampled_from(['x', 'y', 'modela.z']),
+              st.sampled_from(['>', '<=', '==', '!=']), numbers),
+    st.builds('{} between {} and {}'.format, st.sampled_from('xy'), numbers, numbers),
+    st.builds('{} {} ({}, {})'.format, st.sampled_from('xy'), st.sampled_from(['in', 'not in']),
+              numbers, numbers),
+    st.sampled_from(['alpha', 'beta']))
+expressions = st.recursive(
+    conditions,
+    lambda children: st.one_of(
+        st.builds('not ({})'.format, children),
+        st.builds('({}) {} ({})'.format, children, st.sampled_from(['and', 'OR']), children)),
+    max_leaves=6)
+
+
+@settings(max_examples=100, deadline=None)
+@given(expressions, st.data())
+def test_keystrokes(value, data):
+    # every prefix of a valid expression is valid, and incremental updates, including
+    # deleting characters, agree with parsing each input from scratch
+    typeahead = Typeahead()
+    for size in range(1, len(value) + 1):
+        if size > 1 and data.draw(st.booleans()):
+            backspace = typeahead.update(value[:size - 2])
+            assert backspace == Typeahead().update(value[:size - 2])
+        result = typeahead.update(value[:size])
+        fresh = Typeahead().update(value[:size])
+        assert result.error is None, (value[:size], result)
+        assert (repr(result.expression), result.expected, result.prefix, result.complete) == \
+            (repr(fresh.expression), fresh.expected, fresh.prefix, fresh.complete)
+    assert result.complete
+    assert repr(result.expression) == repr(Parser(engine='fast').parse(value))
@@ -0,0 +1,117 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Filename: test_warmup.py
+# Project: tests
+# Author: Brian Cherinka
+# Created: Saturday, 17th October 2026 11:41:15 pm
+# License: BSD 3-clause "New" or "Revised" License
+# Copyright (c) 2026 Brian Cherinka
+# Last Modified: Saturday, 17th October 2026 11:41:15 pm
+# Modified By: Brian Cherinka
+
+
+from __future__ import print_function, division, absolute_import
+
+import pytest
+
+from boolean_parser.parsers import Parser, SQLAParser
+from boolean_parser.parsers.base import BooleanParserException
+from boolean_parser.warmup import Warmup, main, read_corpus
+from tests.models import ModelA, ModelB
+
+
+corpus = ['# popular filters', 'modela.x > 5', '', 'modela.x > 5 and modela.y < 2',
+          '  modela.x > 5  ', 'modela.x >']
+
+
+@pytest.fixture()
+def cached():
+    class CachedParser(SQLAParser):
+        pass
+
+    CachedParser.enable_cache()
+    return CachedParser
+
+
+@pytest.fixture()
+def corpus_file(tmp_path):
+    path = tmp_path / 'corpus.txt'
+    path.write_text('\n'.join(corpus))
+    return str(path)
+
+
+def test_read_corpus(corpus_file):
+    expected = ['modela.x > 5', 'modela.x > 5 and modela.y < 2', 'modela.x >']
+    assert read_corpus(corpus) == expected
+    assert read_corpus(corpus_file) == expected
+
+
+def test_run(cached):
+    reports = []
+    warmup = Warmup(cached, models=[ModelA, ModelB], progress=reports.append, every=1)
+    report = warmup.run(corpus)
+    assert report[:5] == (3, 3, 2, 2, 1)
+    assert report.done
+    assert [r.processed for r in reports] == [1, 2, 3]
+    assert warmup.errors[0][0] == 'modela.x >'
+    assert isinstance(warmup.errors[0][1], BooleanParserException)
+    assert cached.cache_info().currsize == 2
+
+
+def test_cached_after_warmup(cached):
+    Warmup(cached).run(corpus)
+    expr = cached('modela.x > 5 and modela.y < 2').parse()
+    assert cached('modela.x > 5 and modela.y < 2').parse() is expr
+    assert cached.cache_info().misses == 3
+
+
+def test_background(cached):
+    warmup = cached.warm_up(corpus)
+    report = warmup.join(timeout=30)
+    assert report.done
+    assert report.parsed == 2
+
+
+def test_foreground(cached):
+    warmup = cached.warm_up(corpus, background=False)
+    assert warmup.report.done
+
+
+def test_requires_cache():
+    with pytest.raises(BooleanParserException, match='enable a parse cache on Parser'):
+        Warmup(Parser)
+
+
+def test_main(corpus_file, tmp_path, capsys):
+    cache = str(tmp_path / 'cache.db')
+    try:
+        status = main([corpus_file, '--cache', cache, '--parser',
+                       'boolean_parser.parsers.sqla:SQLAParser', '--models',
+                       'tests.models:ModelA'])
+        # a new process using the same disk cache finds the expressions already parsed
+        SQLAParser.enable_disk_cache(cache)
+        SQLAParser('modela.x > 5').parse()
+        assert SQLAParser.disk_cache_info().misses == 0
+    finally:
+        SQLAParser.disable_disk_cache()
+    assert status == 1
+    err = capsys.readouterr().err
+    assert 'warmed up 3/3 expressions' in err
+    assert "failed: 'modela.x >'" in err
+    assert '2 parsed, 2 filters checked, 1 failed, 2 cached' in err
+
+
+def test_main_checks_models(tmp_path, capsys):
+    path = tmp_path / 'corpus.txt'
+    path.write_text('modela.x > 5\nmodelb.z < 2\n')
+    try:
+        status = main([str(path), '--cache', str(tmp_path / 'cache.db'), '--parser',
+                       'boolean_parser.parsers.sqla:SQLAParser', '--models',
+                       'tests.models:ModelA'])
+    finally:
+        SQLAParser.disable_disk_cache()
+    assert status == 1
+    err = capsys.readouterr().err
+    assert "failed: 'modelb.z < 2'" in err
+    assert '2 parsed, 1 filters checked, 1 failed, 2 cached' in err